@@ -0,0 +1,55 @@
+"""Static 500-request concurrency vs the AIMD controller against a throttling stub.
+
+The stub answers 429 above --capacity in-flight requests and slows down as load
+grows, which is how a single origin behaves under the old settings.
+
+    python benchmarks/bench_concurrency.py --companies 1000 --capacity 32
+"""
+
+import argparse
+
+from harness import print_table, run_crawl
+from stub_server import StubServer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=1000)
+    parser.add_argument('--capacity', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--latency-per-request', type=float, default=0.005)
+    parser.add_argument('--rate-429', type=float, default=0.01)
+    args = parser.parse_args()
+
+    configs = {
+        'static-500': {
+            'ADAPTIVE_CONCURRENCY_ENABLED': False,
+            'CONCURRENT_REQUESTS_PER_DOMAIN': 500,
+            'CONCURRENT_REQUESTS_PER_IP': 500,
+        },
+        'adaptive': {'ADAPTIVE_CONCURRENCY_ENABLED': True},
+    }
+
+    rows = []
+    for name, overrides in configs.items():
+        with StubServer(companies=args.companies, capacity=args.capacity, latency=args.latency,
+                        latency_per_request=args.latency_per_request, rate_429=args.rate_429) as server:
+            result = run_crawl(overrides, start_url=f'{server.url}/companies')
+            counters = dict(server.state.counters)
+        stats = result['stats']
+        windows = [v for k, v in stats.items() if k.startswith('adaptive_concurrency/window/')]
+        rows.append({
+            'config': name,
+            'seconds': f'{result["elapsed"]:.1f}',
+            'responses': stats.get('downloader/response_count', 0),
+            '429s': stats.get('downloader/response_status_count/429', 0),
+            'timeouts': stats.get('downloader/exception_type_count/twisted.internet.error.TimeoutError', 0),
+            'items': stats.get('item_scraped_count', 0),
+            'final_window': windows[0] if windows else '-',
+            'stub_throttled': counters['throttled'],
+        })
+    print_table(rows, ['config', 'seconds', 'responses', '429s', 'timeouts', 'items', 'final_window', 'stub_throttled'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Excel export time: single-pass writer vs the previous write-then-reformat approach.
+
+Feeds N synthetic companies through ExcelExportPipeline, then times the final
+export two ways:
+
+- legacy: pandas ``to_excel``, then ``load_workbook`` plus a per-cell formatting
+  and width pass and a second save (the export before the single-pass writer)
+- current: ExcelExportPipeline writes the formatted sheet in one pass
+
+    python benchmarks/bench_export.py --rows 50000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from harness import REPO_ROOT, print_table
+from stub_server import make_companies
+
+sys.path.insert(0, REPO_ROOT)
+from yc_scraper.items import Founder  # noqa: E402
+from yc_scraper.pipelines import ExcelExportPipeline  # noqa: E402
+
+
+def make_items(rows):
+    items = []
+    for company in make_companies(rows):
+        items.append({
+            'company_name': company['name'],
+            'company_website': company['website'],
+            'founders': [Founder(name, f'https://www.linkedin.com/in/{slug}', f'https://twitter.com/{handle}')
+                         for name, slug, handle in company['founders']],
+            'batch': company['batch'],
+            'company_slug': company['slug'],
+        })
+    return items
+
+
+def legacy_export(pipeline, filename):
+    """The previous export: pandas write, then reload and format every cell"""
+    import pandas as pd
+    from openpyxl import load_workbook
+    from openpyxl.styles import Font, Alignment, PatternFill
+    from openpyxl.utils import get_column_letter
+
+    df = pd.DataFrame(pipeline.items).rename(columns=dict(pipeline.COLUMNS))
+    df.to_excel(filename, index=False, engine='openpyxl')
+
+    wb = load_workbook(filename)
+    ws = wb.active
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    link_font = Font(color="0000FF", underline="single")
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), start=2):
+        original_urls = pipeline.original_urls[row_idx - 2]
+        for col_idx, cell in enumerate(row, start=1):
+            if cell.value:
+                column_name = str(ws.cell(row=1, column=col_idx).value).strip()
+                if column_name == 'Company Website' and 'http' in original_urls['company_website']:
+                    cell.hyperlink = original_urls['company_website'].split(',')[0].strip()
+                    cell.font = link_font
+                elif column_name == 'Founders LinkedIn' and 'http' in original_urls['founders_linkedin']:
+                    cell.hyperlink = original_urls['founders_linkedin'].split(',')[0].strip()
+                    cell.font = link_font
+                elif column_name == 'Founders Twitter' and 'http' in original_urls['founders_twitter']:
+                    cell.hyperlink = original_urls['founders_twitter'].split(',')[0].strip()
+                    cell.font = link_font
+    for column in ws.columns:
+        max_length = max(len(str(cell.value)) if cell.value else 0 for cell in column)
+        ws.column_dimensions[get_column_letter(column[0].column)].width = min(max_length + 2, 50)
+    ws.row_dimensions[1].height = 20
+    ws.freeze_panes = 'A2'
+    wb.save(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--runs', type=int, default=1)
+    args = parser.parse_args()
+
+    spider = SimpleNamespace(logger=logging.getLogger('bench_export'))
+    items = make_items(args.rows)
+    workdir = tempfile.mkdtemp(prefix='bench_export_')
+
+    rows = []
+    for name in ('legacy', 'current'):
+        timings = []
+        for run in range(args.runs):
+            filename = os.path.join(workdir, f'{name}-{run}.xlsx')
+            pipeline = ExcelExportPipeline(output_file=filename)
+            pipeline.write_every = float('inf')  # Time only the final export
+            started = time.perf_counter()
+            for item in items:
+                pipeline.process_item(item, spider)
+            processed = time.perf_counter()
+            if name == 'legacy':
+                legacy_export(pipeline, filename)
+            else:
+                pipeline.close_spider(spider)
+            finished = time.perf_counter()
+            timings.append((processed - started, finished - processed, os.path.getsize(filename)))
+        item_s, export_s, size = min(timings, key=lambda t: t[1])
+        rows.append({'export': name, 'process_item_s': f'{item_s:.2f}', 'export_s': f'{export_s:.2f}',
+                     'total_s': f'{item_s + export_s:.2f}', 'size_kb': size // 1024})
+    print(f'{args.rows} rows, best of {args.runs} (files in {workdir})')
+    print_table(rows, ['export', 'process_item_s', 'export_s', 'total_s', 'size_kb'])
+
+
+if __name__ == '__main__':
+    main()
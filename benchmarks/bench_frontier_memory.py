@@ -0,0 +1,142 @@
+"""Scheduler memory with 100k queued company requests: in-memory vs JOBDIR queues.
+
+Each variant runs in its own spawned process (harness.run_in_child). It opens
+Scrapy's scheduler with the project settings and enqueues N detail requests the
+way the spider builds them, passed through the project's spider middlewares as in
+a crawl (depth, Referer header):
+
+- memory/item-meta: the previous requests, carrying a pre-built YcCompanyItem in meta
+- memory: the current requests (batch hint + card name only), in-memory queue
+- jobdir/pickle: current requests in Scrapy's PickleLifoDiskQueue
+- jobdir/compact: current requests in yc_scraper.squeues.CompactLifoDiskQueue
+
+Then it drains the scheduler and checks every request comes back intact, Referer included.
+
+    python benchmarks/bench_frontier_memory.py --requests 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from harness import REPO_ROOT, peak_rss_mb, print_table, run_in_child
+
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'yc_scraper.settings')
+import scrapy  # noqa: E402
+from scrapy.core.scheduler import Scheduler  # noqa: E402
+from scrapy.core.spidermw import SpiderMiddlewareManager  # noqa: E402
+from scrapy.http import HtmlResponse  # noqa: E402
+from scrapy.utils.project import get_project_settings  # noqa: E402
+from scrapy.utils.test import get_crawler  # noqa: E402
+
+from yc_scraper.items import YcCompanyItem  # noqa: E402
+from yc_scraper.spiders.yc_companies_spider import YcCompaniesSpider  # noqa: E402
+
+VARIANTS = {
+    'memory/item-meta': (None, True),
+    'memory': (None, False),
+    'jobdir/pickle': ('scrapy.squeues.PickleLifoDiskQueue', False),
+    'jobdir/compact': ('yc_scraper.squeues.CompactLifoDiskQueue', False),
+}
+
+
+LISTING_URL = 'https://www.ycombinator.com/companies'
+
+
+def _requests(spider, count, item_meta):
+    for i in range(count):
+        name = f'Company {i}'
+        meta = {'batch_from_card': 'SUMMER 2025' if i % 3 else None}
+        if item_meta:
+            meta['item'] = YcCompanyItem(company_name=name)
+        else:
+            meta['card_name'] = name
+        yield scrapy.Request(f'https://www.ycombinator.com/companies/company-{i}', callback=spider.parse_company_detail,
+                             meta=meta, priority=i % 2)
+
+
+def _through_spider_middlewares(crawler, spider, requests):
+    """What the scheduler gets in a crawl: the requests after every spider middleware's process_spider_output"""
+    manager = SpiderMiddlewareManager.from_crawler(crawler)
+    listing = HtmlResponse(LISTING_URL, body=b'', request=scrapy.Request(LISTING_URL, meta={'depth': 0}))
+    result = requests
+    for middleware in reversed(manager.middlewares):  # Output runs from the highest order down
+        if hasattr(middleware, 'spider_opened'):
+            middleware.spider_opened(spider)
+        if hasattr(middleware, 'process_spider_output'):
+            result = middleware.process_spider_output(listing, result, spider)
+    return result
+
+
+def _jobdir_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+
+def fill_scheduler(variant, count):
+    disk_queue, item_meta = VARIANTS[variant]
+    with tempfile.TemporaryDirectory() as tmp:
+        # No crawl runs here, so whichever reactor the imports installed is fine
+        overrides = {'LOG_LEVEL': 'WARNING', 'TWISTED_REACTOR': None}
+        if disk_queue:
+            overrides.update({'JOBDIR': tmp, 'SCHEDULER_DISK_QUEUE': disk_queue})
+        settings = get_project_settings()
+        settings.setdict(overrides, priority='cmdline')
+        crawler = get_crawler(YcCompaniesSpider, settings.copy_to_dict())
+        spider = YcCompaniesSpider.from_crawler(crawler)
+        crawler.spider = spider
+        scheduler = Scheduler.from_crawler(crawler)
+        scheduler.open(spider)
+        before = peak_rss_mb()
+        for request in _through_spider_middlewares(crawler, spider, _requests(spider, count, item_meta)):
+            scheduler.enqueue_request(request)
+        queued_mb = peak_rss_mb() - before if before else None
+        on_disk = _jobdir_bytes(tmp) if disk_queue else 0
+        stats = crawler.stats.get_stats()
+        drained, intact = 0, 0
+        while (request := scheduler.next_request()) is not None:
+            drained += 1
+            name = request.meta['item']['company_name'] if item_meta else request.meta.get('card_name')
+            intact += (name == f"Company {request.url.rsplit('-', 1)[1]}" and request.callback == spider.parse_company_detail
+                       and request.headers.get('Referer') == LISTING_URL.encode() and request.meta.get('depth') == 1)
+        scheduler.close('finished')
+    return {
+        'queued_mb': queued_mb,
+        'disk_bytes': on_disk,
+        'memory_pushes': stats.get('scheduler/enqueued/memory', 0),
+        'disk_pushes': stats.get('scheduler/enqueued/disk', 0),
+        'compact_records': stats.get('scheduler/disk_records/compact', 0),
+        'drained': drained,
+        'intact': intact,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = []
+    for variant in VARIANTS:
+        run = run_in_child(fill_scheduler, variant, args.requests)
+        result = run['result']
+        rows.append({
+            'queue': variant,
+            'queued_rss_mb': f'{result["queued_mb"]:.0f}' if result['queued_mb'] is not None else 'n/a',
+            'peak_rss_mb': f'{run["peak_rss_mb"]:.0f}' if run['peak_rss_mb'] else 'n/a',
+            'disk_mb': f'{result["disk_bytes"] / (1024 * 1024):.1f}',
+            'bytes/request': round(result['disk_bytes'] / args.requests) if result['disk_bytes'] else '-',
+            'memory/disk pushes': f'{result["memory_pushes"]}/{result["disk_pushes"]}',
+            'compact': result['compact_records'],
+            'drained': result['drained'],
+            'intact': result['intact'],
+            'seconds': f'{run["elapsed"]:.1f}',
+        })
+    print(f'{args.requests} queued company requests')
+    print_table(rows, ['queue', 'queued_rss_mb', 'peak_rss_mb', 'disk_mb', 'bytes/request', 'memory/disk pushes',
+                       'compact', 'drained', 'intact', 'seconds'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""HTTP/1.1 vs HTTP/2 detail fetching against a local TLS stub.
+
+The stub (Twisted, self-signed certificate, ALPN h2 + http/1.1, gzip) serves the
+same pages as stub_server.py. Each crawl uses the given per-domain concurrency:
+HTTP/1.1 opens a TLS connection per concurrent request, HTTP/2 multiplexes them
+over HTTP2_CONNECTIONS_PER_HOST connections (yc_scraper/http2.py). With
+--padding, off-target detail pages are big enough for early aborts to matter;
+both protocols should stop the same number of them.
+
+    python benchmarks/bench_http2.py --companies 2000 --concurrency 500 --rtt 0.1
+
+Needs `pip install h2 priority` (Twisted's HTTP/2 server uses priority).
+"""
+
+import argparse
+import multiprocessing
+import sys
+
+from harness import REPO_ROOT, print_table, run_crawl
+from stub_server import make_companies, render_detail, render_listing
+
+
+def _self_signed_certificate():
+    """(pyOpenSSL key, certificate) for CN=localhost"""
+    import datetime
+
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+    from OpenSSL import crypto
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number()).not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName('localhost')]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    return crypto.PKey.from_cryptography_key(key), crypto.X509.from_cryptography(certificate)
+
+
+def _serve(port_queue, companies, latency, rtt, padding=0):
+    """Child process: TLS stub on localhost until terminated.
+
+    ``rtt`` emulates a remote host: every response waits one round trip, and the
+    first one on a connection two more for the TCP and TLS handshakes.
+    """
+    import weakref
+
+    from twisted.internet import reactor, ssl
+    from twisted.protocols.policies import WrappingFactory
+    from twisted.web import resource, server
+    from twisted.web.server import GzipEncoderFactory
+
+    pages = make_companies(companies)
+    by_slug = {c['slug']: c for c in pages}
+    listing = render_listing(pages).encode('utf-8')
+    connections = weakref.WeakSet()
+
+    class StubResource(resource.Resource):
+        isLeaf = True
+
+        def render_GET(self, request):
+            path = request.path.decode('utf-8').rstrip('/')
+            if path == '/companies':
+                body = listing
+            elif path.startswith('/companies/') and path.split('/companies/')[1].lower() in by_slug:
+                body = render_detail(by_slug[path.split('/companies/')[1].lower()], padding).encode('utf-8')
+            else:
+                request.setResponseCode(404)
+                return b'Not Found'
+            request.setHeader(b'Content-Type', b'text/html; charset=utf-8')
+            delay = latency + rtt
+            connection = getattr(request.channel, '_conn', request.channel)  # H2Stream -> H2Connection
+            if connection not in connections:
+                connections.add(connection)
+                delay += 2 * rtt
+            if not delay:
+                return body
+
+            def finish():
+                if not request.finished and not request._disconnected:
+                    request.write(body)
+                    request.finish()
+
+            reactor.callLater(delay, finish)
+            return server.NOT_DONE_YET
+
+    key, certificate = _self_signed_certificate()
+    options = ssl.CertificateOptions(privateKey=key, certificate=certificate, acceptableProtocols=[b'h2', b'http/1.1'])
+    site = server.Site(resource.EncodingResourceWrapper(StubResource(), [GzipEncoderFactory()]))
+    site.noisy = False
+    # ALPN is set once on the context above; behind WrappingFactory Twisted no longer re-applies it
+    # to the shared context per connection, which recent pyOpenSSL refuses
+    port = reactor.listenSSL(0, WrappingFactory(site), options, backlog=1024, interface='127.0.0.1')
+    port_queue.put(port.getHost().port)
+    reactor.run()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=500, help='CONCURRENT_REQUESTS_PER_DOMAIN')
+    parser.add_argument('--latency', type=float, default=0.05, help='server latency per request (seconds)')
+    parser.add_argument('--rtt', type=float, default=0.0, help='emulated network round trip (seconds)')
+    parser.add_argument('--connections', type=int, default=2, help='HTTP2_CONNECTIONS_PER_HOST')
+    parser.add_argument('--padding', type=int, default=0, help='filler paragraphs per detail page (early abort)')
+    args = parser.parse_args()
+
+    try:
+        import h2  # noqa: F401
+        import priority  # noqa: F401
+    except ImportError:
+        sys.exit('bench_http2 needs `pip install h2 priority`')
+
+    common = {
+        'ADAPTIVE_CONCURRENCY_ENABLED': False,
+        'CONCURRENT_REQUESTS': args.concurrency,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': args.concurrency,
+        'CONCURRENT_REQUESTS_PER_IP': args.concurrency,
+        'HTTP2_HOSTS': ['localhost'],
+        'HTTP2_CONNECTIONS_PER_HOST': args.connections,
+    }
+    configs = {
+        'http/1.1': {**common, 'HTTP2_ENABLED': False},
+        'http/2': {**common, 'HTTP2_ENABLED': True},
+    }
+
+    rows = []
+    for name, overrides in configs.items():
+        port_queue = multiprocessing.Queue()
+        stub = multiprocessing.Process(target=_serve, args=(port_queue, args.companies, args.latency, args.rtt, args.padding), daemon=True)
+        stub.start()
+        try:
+            port = port_queue.get(timeout=60)
+            result = run_crawl(overrides, start_url=f'https://localhost:{port}/companies')
+        finally:
+            stub.terminate()
+            stub.join()
+        stats = result['stats']
+        responses = stats.get('downloader/response_count', 0)
+        rows.append({
+            'protocol': name,
+            'seconds': f'{result["elapsed"]:.1f}',
+            'responses': responses,
+            'pages/s': f'{responses / result["elapsed"]:.0f}',
+            'timeouts': stats.get('downloader/exception_type_count/twisted.internet.error.TimeoutError', 0),
+            'errors': stats.get('downloader/exception_count', 0),
+            'connections': sum(v for k, v in stats.items() if k.startswith('downloader/connections_opened/')),
+            'req/conn': stats.get('downloader/requests_per_connection', '-'),
+            'items': stats.get('item_scraped_count', 0),
+            'gzip_responses': stats.get('httpcompression/response_count', 0),
+            'early_aborts': stats.get('early_abort/pages', 0),
+        })
+    print(f'{args.companies} companies, {args.concurrency} concurrent per domain, '
+          f'{args.latency}s server latency, {args.rtt}s RTT')
+    print_table(rows, ['protocol', 'seconds', 'responses', 'pages/s', 'timeouts', 'errors', 'connections',
+                       'req/conn', 'items', 'gzip_responses', 'early_aborts'])
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, REPO_ROOT)
+    main()
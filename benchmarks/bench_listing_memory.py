@@ -0,0 +1,96 @@
+"""Peak RSS of handling one fully scrolled listing page: previous vs current path.
+
+Each variant runs in its own spawned process (harness.run_in_child) on the same
+synthetic listing (stub_server.render_listing, with variant links):
+
+- legacy: the middleware scans page.content() with re.findall and encodes it;
+  parse() decodes response.text and builds two findall lists
+- current: page.content() is encoded once and dropped; parse() streams
+  extraction.iter_company_hrefs over response.body
+
+Both also run the card CSS selection parse() does, and must find the same companies.
+
+    python benchmarks/bench_listing_memory.py --companies 20000
+"""
+
+import argparse
+import re
+import sys
+
+from harness import REPO_ROOT, print_table, run_in_child
+from stub_server import make_companies, render_listing
+
+sys.path.insert(0, REPO_ROOT)
+from scrapy.http import HtmlResponse  # noqa: E402
+
+from yc_scraper.dedup import canonical_company_key  # noqa: E402
+from yc_scraper.extraction import iter_company_hrefs  # noqa: E402
+
+URL = 'https://www.ycombinator.com/companies'
+EXCLUDED_EXTENSIONS = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json']
+
+
+def rendered_listing(companies):
+    """What page.content() returns after scrolling - one str"""
+    return render_listing(make_companies(companies), duplicate_links=True)
+
+
+def _legacy_render(companies):
+    html = rendered_listing(companies)
+    # The middleware's diagnostic scan, alive until the coroutine returned
+    all_links = re.findall(r'/companies/[^"\'<>?\s]+', html)
+    company_links = [link for link in all_links if not any(link.lower().endswith(ext) for ext in EXCLUDED_EXTENSIONS)]
+    print(f'legacy middleware scan: {len(company_links)} links')
+    return html
+
+
+def legacy_listing(companies):
+    html = _legacy_render(companies)
+    response = HtmlResponse(URL, body=html.encode('utf-8'), encoding='utf-8')
+    del html
+    cards = response.css('a[href*="/companies/"]')
+    html_text = response.text
+    company_urls = re.findall(r'["\']([^"\']*\/companies\/[^"\'\?\s&<>]+)', html_text)
+    company_urls2 = re.findall(r'href=["\']?([^"\'\s<>]*\/companies\/[^"\'\?\s&<>]+)', html_text, re.IGNORECASE)
+    company_urls.extend(company_urls2)
+    keys = {canonical_company_key(response.urljoin(url)) for url in company_urls if 'companies?' not in url}
+    return len(cards), sorted(key for key in keys if key)
+
+
+def current_listing(companies):
+    body = rendered_listing(companies).encode('utf-8')
+    response = HtmlResponse(URL, body=body, encoding='utf-8')
+    del body
+    cards = response.css('a[href*="/companies/"]')
+    keys = {canonical_company_key(response.urljoin(url)) for url in iter_company_hrefs(response.body, response.encoding)}
+    return len(cards), sorted(key for key in keys if key)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=20000)
+    args = parser.parse_args()
+
+    size_mb = len(rendered_listing(args.companies).encode('utf-8')) / (1024 * 1024)
+    rows = []
+    found = {}
+    for name, func in (('legacy', legacy_listing), ('current', current_listing)):
+        run = run_in_child(func, args.companies)
+        cards, keys = run['result']
+        found[name] = keys
+        rows.append({
+            'path': name,
+            'companies': len(keys),
+            'cards': cards,
+            'seconds': f'{run["elapsed"]:.2f}',
+            'peak_rss_mb': f'{run["peak_rss_mb"]:.0f}' if run['peak_rss_mb'] else 'n/a',
+            'listing_peak_mb': f'{run["peak_rss_mb"] - run["baseline_rss_mb"]:.0f}' if run['peak_rss_mb'] else 'n/a',
+        })
+    print(f'{args.companies} companies, {size_mb:.1f} MB listing')
+    print_table(rows, ['path', 'companies', 'cards', 'seconds', 'peak_rss_mb', 'listing_peak_mb'])
+    if found['legacy'] != found['current']:
+        print('WARNING: the two paths found different companies')
+
+
+if __name__ == '__main__':
+    main()
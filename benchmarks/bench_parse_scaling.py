@@ -0,0 +1,82 @@
+"""Detail-page parsing throughput against process-pool worker count.
+
+Parses synthetic detail pages (from the stub server's templates) inline and
+through DetailParserPool-style process pools, and reports items/sec. With
+--crawl it also runs full crawls against the stub with DETAIL_PARSE_WORKERS set.
+
+    python benchmarks/bench_parse_scaling.py --pages 2000 --workers 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from harness import REPO_ROOT, print_table, run_crawl
+from stub_server import StubServer, make_companies, render_detail
+
+sys.path.insert(0, REPO_ROOT)
+from yc_scraper.extraction import extract_from_body  # noqa: E402
+
+
+def _parse_page(args):
+    return extract_from_body(*args)
+
+
+def make_pages(count, padding):
+    return [
+        (f'https://www.ycombinator.com/companies/{company["slug"]}',
+         render_detail(company, padding).encode('utf-8'), 'utf-8', None)
+        for company in make_companies(count)
+    ]
+
+
+def parse_inline(pages):
+    started = time.perf_counter()
+    ok = sum(1 for page in pages if _parse_page(page)['status'] == 'ok')
+    return time.perf_counter() - started, ok
+
+
+def parse_pooled(pages, workers):
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        list(executor.map(_parse_page, pages[:workers]))  # Warm up: spawn workers, import scrapy
+        started = time.perf_counter()
+        ok = sum(1 for result in executor.map(_parse_page, pages, chunksize=8) if result['status'] == 'ok')
+        return time.perf_counter() - started, ok
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=2000)
+    parser.add_argument('--padding', type=int, default=40, help='filler paragraphs per page (page weight)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--crawl', action='store_true', help='also run full crawls against the stub server')
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.padding)
+    print(f'{len(pages)} pages, {sum(len(p[1]) for p in pages) / len(pages) / 1024:.0f} KiB each, {os.cpu_count()} CPUs')
+
+    rows = []
+    seconds, ok = parse_inline(pages)
+    rows.append({'workers': 'inline', 'seconds': f'{seconds:.2f}', 'pages/sec': f'{len(pages) / seconds:.0f}', 'items': ok})
+    for workers in sorted(set(args.workers)):
+        seconds, ok = parse_pooled(pages, workers)
+        rows.append({'workers': workers, 'seconds': f'{seconds:.2f}', 'pages/sec': f'{len(pages) / seconds:.0f}', 'items': ok})
+    print_table(rows, ['workers', 'seconds', 'pages/sec', 'items'])
+
+    if args.crawl:
+        print('\nFull crawls against the stub server:')
+        rows = []
+        for workers in [0] + sorted(set(args.workers)):
+            with StubServer(companies=args.pages, padding=args.padding) as server:
+                result = run_crawl({'DETAIL_PARSE_WORKERS': workers}, start_url=f'{server.url}/companies')
+            items = result['stats'].get('item_scraped_count', 0)
+            rows.append({'DETAIL_PARSE_WORKERS': workers, 'seconds': f'{result["elapsed"]:.2f}',
+                         'items/sec': f'{items / result["elapsed"]:.0f}', 'items': items})
+        print_table(rows, ['DETAIL_PARSE_WORKERS', 'seconds', 'items/sec', 'items'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Spider startup cost: import-time breakdown and time-to-first-request.
+
+Runs ``python -X importtime`` over the project modules and reports the heaviest
+cumulative imports, then times ``scrapy list`` and a crawl against the local
+stub from interpreter start until the first request reaches the downloader.
+
+    python benchmarks/bench_startup.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from harness import REPO_ROOT, print_table
+from stub_server import StubServer
+
+PROJECT_MODULES = 'yc_scraper.settings, yc_scraper.items, yc_scraper.pipelines, yc_scraper.middlewares, yc_scraper.spiders.yc_companies_spider'
+
+# Child script: measure from interpreter start to the first request_reached_downloader signal
+FIRST_REQUEST_SCRIPT = r'''
+import time
+started = time.perf_counter()
+import os, sys
+sys.path.insert(0, {repo!r})
+os.environ['SCRAPY_SETTINGS_MODULE'] = 'yc_scraper.settings'
+from scrapy import signals
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+
+settings = get_project_settings()
+settings.setdict({{'LOG_LEVEL': 'ERROR', 'ITEM_PIPELINES': {{}}}}, priority='cmdline')
+process = CrawlerProcess(settings)
+crawler = process.create_crawler('yc_companies')
+
+def first_request(request, spider):
+    print(f'FIRST_REQUEST {{time.perf_counter() - started:.4f}}', flush=True)
+    crawler.engine.close_spider(spider, 'benchmark')
+    crawler.signals.disconnect(first_request, signal=signals.request_reached_downloader)
+
+crawler.signals.connect(first_request, signal=signals.request_reached_downloader)
+process.crawl(crawler, start_url={start_url!r})
+process.start()
+'''
+
+
+def import_breakdown():
+    """Return (total_seconds, [(module, cumulative_seconds), ...]) for the project modules"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {PROJECT_MODULES}'],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        rows.append((module[1:].rstrip(), int(cumulative) / 1e6))  # Keep the nesting indentation
+    # Top-level imports are the ones with no indentation
+    top_level = [(name, cum) for name, cum in rows if not name.startswith(' ')]
+    return sum(cum for _, cum in top_level), rows
+
+
+def time_command(args, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(args, cwd=REPO_ROOT, capture_output=True, check=True)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def time_to_first_request(start_url, runs):
+    script = FIRST_REQUEST_SCRIPT.format(repo=REPO_ROOT, start_url=start_url)
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', script], cwd=REPO_ROOT, capture_output=True, text=True)
+        for line in result.stdout.splitlines():
+            if line.startswith('FIRST_REQUEST'):
+                timings.append(float(line.split()[1]))
+    return min(timings) if timings else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    total, rows = import_breakdown()
+    heaviest = sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]
+    print(f'Project import time (python -X importtime): {total:.3f}s')
+    print_table([{'module': name.strip(), 'cumulative_s': f'{cum:.3f}'} for name, cum in heaviest],
+                ['module', 'cumulative_s'])
+    print()
+
+    heavy = ('pandas', 'openpyxl', 'playwright')
+    loaded = sorted({name.strip().split('.')[0] for name, _ in rows if name.strip().split('.')[0] in heavy})
+    print(f'Heavy optional dependencies loaded at import: {", ".join(loaded) or "none"}')
+
+    scrapy_bin = os.path.join(os.path.dirname(sys.executable), 'scrapy')
+    list_cmd = [scrapy_bin, 'list'] if os.path.exists(scrapy_bin) else [sys.executable, '-m', 'scrapy', 'list']
+    with StubServer(companies=50) as server:
+        rows = [
+            {'measure': 'scrapy list (best of %d)' % args.runs, 'seconds': f'{time_command(list_cmd, args.runs):.3f}'},
+            {'measure': 'time to first request (best of %d)' % args.runs,
+             'seconds': f'{time_to_first_request(server.url + "/companies", args.runs):.3f}'},
+        ]
+    print_table(rows, ['measure', 'seconds'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Helpers shared by the benchmark scripts.
+
+Each crawl runs in a child process because the Twisted reactor cannot be
+restarted, and returns the final crawl stats plus wall-clock time and peak RSS.
+run_in_child measures the peak RSS of any function in a freshly spawned process.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB - None where `resource` is missing (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KB on Linux
+
+
+def _crawl_worker(settings_overrides, spider_kwargs, queue):
+    sys.path.insert(0, REPO_ROOT)
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'yc_scraper.settings')
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.setdict({'LOG_LEVEL': 'WARNING', 'ITEM_PIPELINES': {}}, priority='cmdline')
+    settings.setdict(settings_overrides, priority='cmdline')
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler('yc_companies')
+    started = time.perf_counter()
+    process.crawl(crawler, **spider_kwargs)
+    process.start()
+    elapsed = time.perf_counter() - started
+    stats = {key: value for key, value in crawler.stats.get_stats().items()
+             if isinstance(value, (int, float, str))}
+    queue.put({'elapsed': elapsed, 'stats': stats, 'peak_rss_mb': peak_rss_mb()})
+
+
+def run_crawl(settings_overrides=None, **spider_kwargs):
+    """Run ``yc_companies`` once in a fresh process and return {'elapsed', 'stats', 'peak_rss_mb'}"""
+    queue = multiprocessing.Queue()
+    proc = multiprocessing.Process(target=_crawl_worker, args=(settings_overrides or {}, spider_kwargs, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def _child_worker(func, args, queue):
+    sys.path.insert(0, REPO_ROOT)
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    result = func(*args)
+    queue.put({'result': result, 'elapsed': time.perf_counter() - started,
+               'peak_rss_mb': peak_rss_mb(), 'baseline_rss_mb': baseline})
+
+
+def run_in_child(func, *args):
+    """Run func(*args) in a spawned process - nothing inherited from this one inflates the peak.
+
+    Returns {'result', 'elapsed', 'peak_rss_mb', 'baseline_rss_mb'}; the baseline is
+    the peak after imports, before func runs. func must be importable (module level).
+    """
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    proc = context.Process(target=_child_worker, args=(func, args, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as a fixed-width table"""
+    widths = {col: max(len(col), *(len(str(row.get(col, ''))) for row in rows)) for col in columns}
+    print('  '.join(col.ljust(widths[col]) for col in columns))
+    for row in rows:
+        print('  '.join(str(row.get(col, '')).ljust(widths[col]) for col in columns))
@@ -0,0 +1,140 @@
+"""Long-run soak of PlaywrightMiddleware against the stub's infinite-scroll listing.
+
+Each variant runs in its own spawned process (harness.run_in_child) with a
+StubServer and one PlaywrightMiddleware. Every iteration renders the listing
+(/companies?scroll=1, cards loaded from /api/companies as it scrolls) and then
+a batch of detail pages on the pooled pages - many more renders than one crawl
+does, so what a long session leaves behind shows up in Chromium's memory:
+
+- governor: PLAYWRIGHT_MEMORY_GOVERNOR on, with the limits given on the command line
+- no-governor: the previous behaviour - pages are reused forever, one context
+
+Per iteration it prints Chromium's RSS (needs psutil) and the playwright/memory/*
+counters: pages and contexts recycled, listing scrolls stopped, render waits.
+Low limits make the governor act within a short soak:
+
+    python benchmarks/soak_browser_memory.py --iterations 30 --browser-limit-mb 600 --page-limit-mb 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from harness import REPO_ROOT, print_table, run_in_child
+from stub_server import StubServer
+
+sys.path.insert(0, REPO_ROOT)
+os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'yc_scraper.settings')
+import scrapy  # noqa: E402
+from scrapy.utils.project import get_project_settings  # noqa: E402
+from scrapy.utils.test import get_crawler  # noqa: E402
+
+from yc_scraper.browser_memory import BrowserMemoryGovernor  # noqa: E402
+from yc_scraper.middlewares import PlaywrightMiddleware  # noqa: E402
+
+MEMORY_STATS = ('pages_recycled/renders', 'pages_recycled/heap', 'contexts_recycled', 'scroll_stopped',
+                'render_waits', 'gc_forced')
+
+
+class SoakSpider(scrapy.Spider):
+    name = 'soak'
+
+
+async def _iteration(middleware, spider, url, details, scroll_seconds):
+    listing = scrapy.Request(f'{url}/companies?scroll=1', meta={'max_scroll_seconds': scroll_seconds})
+    response = await middleware._async_render(listing, spider)
+    cards = listing.meta.get('listing_cards') or []
+    slugs = [card[0] for card in cards][:details] or [f'company-{i}' for i in range(1, details + 1)]
+    renders = [middleware._async_render_detail(
+        scrapy.Request(f'{url}/companies/{slug}', meta={'render': 'playwright'}), spider) for slug in slugs]
+    rendered = sum(result is not None for result in await asyncio.gather(*renders))
+    return response is not None, len(cards), rendered
+
+
+def soak(governor, options):
+    """One variant: returns (rows, memory stats) or an error message"""
+    overrides = {
+        'LOG_LEVEL': 'WARNING',
+        'TWISTED_REACTOR': None,  # No crawl runs here - renders are driven on the Playwright loop directly
+        'PLAYWRIGHT_BROWSER_SERVER': False,
+        'PLAYWRIGHT_MEMORY_GOVERNOR': governor,
+        'PLAYWRIGHT_MEMORY_PAGE_LIMIT_MB': options['page_limit_mb'],
+        'PLAYWRIGHT_MEMORY_BROWSER_LIMIT_MB': options['browser_limit_mb'],
+        'PLAYWRIGHT_MEMORY_BUDGET_MB': options['budget_mb'],
+        'PLAYWRIGHT_MEMORY_PAGE_MAX_RENDERS': options['page_max_renders'],
+        'DETAIL_RENDER_CONCURRENCY': options['concurrency'],
+    }
+    settings = get_project_settings()
+    settings.setdict(overrides, priority='cmdline')
+    crawler = get_crawler(SoakSpider, settings.copy_to_dict())
+    spider = SoakSpider.from_crawler(crawler)
+    middleware = PlaywrightMiddleware(crawler.settings, crawler.stats)
+    # Chromium RSS for the table - the governor's own sampler, also without the governor
+    meter = BrowserMemoryGovernor(sample_interval=0)
+    loop = middleware._get_event_loop()
+
+    def run(coro):
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    rows = []
+    with StubServer(companies=options['companies']) as server:
+        if not run(middleware._ensure_browser(spider)):
+            return 'Chromium did not start - run `playwright install chromium` first'
+        for iteration in range(1, options['iterations'] + 1):
+            listed, cards, rendered = run(_iteration(middleware, spider, server.url, options['details'],
+                                                     options['scroll_seconds']))
+            rss = meter.sample_browser(force=True)
+            stats = crawler.stats.get_stats()
+            row = {
+                'iteration': iteration,
+                'listing': 'ok' if listed else 'failed',
+                'cards': cards,
+                'details': rendered,
+                'browser_rss_mb': f'{rss:.0f}' if rss is not None else 'n/a',
+            }
+            row.update({key: stats.get(f'playwright/memory/{key}', 0) for key in MEMORY_STATS})
+            rows.append(row)
+            print(f'[{"governor" if governor else "no-governor"}] iteration {iteration}: '
+                  f'{cards} cards, {rendered} details, browser {row["browser_rss_mb"]} MB')
+    middleware.spider_closed(spider)
+    memory = {key: value for key, value in crawler.stats.get_stats().items() if key.startswith('playwright/memory/')}
+    return rows, memory
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--companies', type=int, default=5000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--details', type=int, default=200, help='detail renders per iteration')
+    parser.add_argument('--concurrency', type=int, default=4, help='DETAIL_RENDER_CONCURRENCY')
+    parser.add_argument('--scroll-seconds', type=float, default=20, help='listing scroll cap per iteration')
+    parser.add_argument('--page-limit-mb', type=float, default=512)
+    parser.add_argument('--browser-limit-mb', type=float, default=2048)
+    parser.add_argument('--budget-mb', type=float, default=3072)
+    parser.add_argument('--page-max-renders', type=int, default=50)
+    parser.add_argument('--variant', choices=('governor', 'no-governor', 'both'), default='both')
+    args = parser.parse_args()
+
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        print('psutil is not installed - browser RSS shows n/a and only the per-page limits apply (pip install psutil)')
+
+    options = vars(args)
+    variants = ('governor', 'no-governor') if args.variant == 'both' else (args.variant,)
+    columns = ['iteration', 'listing', 'cards', 'details', 'browser_rss_mb', *MEMORY_STATS]
+    for variant in variants:
+        run = run_in_child(soak, variant == 'governor', options)
+        if isinstance(run['result'], str):
+            print(f'{variant}: {run["result"]}')
+            return
+        rows, memory = run['result']
+        print(f'\n{variant}: {args.iterations} iterations in {run["elapsed"]:.0f}s')
+        print_table(rows, columns)
+        for key, value in sorted(memory.items()):
+            print(f'  {key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
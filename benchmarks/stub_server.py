@@ -0,0 +1,377 @@
+"""Local stub of the YC companies directory for benchmarks and manual runs.
+
+Serves a static listing page at /companies, one detail page per company at
+/companies/<slug>, and a sitemap index at /sitemap.xml pointing at gzipped
+company sitemaps (-a discovery=sitemap). /companies?scroll=1 is an infinite-scroll
+version of the listing that loads cards from /api/companies as the page scrolls,
+like the React directory. Latency and 429 responses can be injected so throttling and
+retry behaviour can be exercised without touching ycombinator.com:
+
+    python benchmarks/stub_server.py --companies 2000 --latency 0.2 --capacity 32
+
+Then point the spider at it:
+
+    scrapy crawl yc_companies -a start_url=http://127.0.0.1:8000/companies
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+# Mix of target and non-target batches so the batch filter has work to do
+BATCHES = [
+    'Winter 2026', 'Fall 2025', 'Summer 2025', 'Spring 2025', 'Winter 2025',
+    'Fall 2024', 'Summer 2024', 'Winter 2024', 'Summer 2021', 'Winter 2019',
+]
+
+
+FIRST_NAMES = ['Maria', 'James', 'Priya', 'Chen', 'Olivia', 'Diego', 'Amara', 'Lukas']
+LAST_NAMES = ['Garcia', 'Okafor', 'Lindqvist', 'Nakamura', 'Patel', 'Rossi', 'Dubois', 'Kowalski']
+
+
+def make_companies(count):
+    """Deterministic fake companies: slug, name, batch and founders"""
+    companies = []
+    for i in range(count):
+        slug = f'company-{i}'
+        founders = []
+        for j in range(1 + i % 3):
+            first = FIRST_NAMES[(i + j) % len(FIRST_NAMES)]
+            last = LAST_NAMES[(i * 3 + j) % len(LAST_NAMES)]
+            founders.append((f'{first} {last}', f'{first.lower()}-{last.lower()}-{i}a{j}b7c9d1', f'{first.lower()}{i}{j}'))
+        companies.append({
+            'slug': slug,
+            'name': f'Company {i}',
+            'batch': BATCHES[i % len(BATCHES)],
+            'website': f'https://company{i}.example.com',
+            'founders': founders,
+        })
+    return companies
+
+
+def render_listing(companies, duplicate_links=False):
+    """Listing page with one card per company, like the rendered React list.
+
+    ``duplicate_links`` adds variant links to each company (trailing slash, query
+    string, fragment, upper-case slug) to exercise URL canonicalization.
+    """
+    cards = []
+    for company in companies:
+        cards.append(
+            f'<a class="company-card" href="/companies/{company["slug"]}">'
+            f'<span class="name">{company["name"]}</span>'
+            f'<span class="batch">{company["batch"]}</span></a>'
+        )
+        if duplicate_links:
+            slug = company['slug']
+            cards.append(
+                f'<div class="related"><a href="/companies/{slug}/">{company["name"]}</a>'
+                f'<a href="/companies/{slug}?utm_source=related">Jobs</a>'
+                f'<a href="/companies/{slug}#founders">Founders</a>'
+                f'<a href="/companies/{slug.upper()}">{company["name"]}</a></div>'
+            )
+    return (
+        '<!DOCTYPE html><html><head><title>The YC Startup Directory | Y Combinator</title></head>'
+        '<body><div class="companies">' + ''.join(cards) + '</div></body></html>'
+    )
+
+
+SCROLL_PAGE_SIZE = 50  # Cards per /api/companies page of the infinite-scroll listing
+
+INFINITE_LISTING_JS = r'''
+let offset = 0, loading = false, done = false;
+async function more() {
+  if (loading || done) return;
+  loading = true;
+  const data = await (await fetch(`/api/companies?offset=${offset}&limit=%(page)d`)).json();
+  const list = document.querySelector('.companies');
+  for (const c of data.companies) {
+    const a = document.createElement('a');
+    a.className = 'company-card';
+    a.href = `/companies/${c.slug}`;
+    a.innerHTML = '<span class="name"></span> <span class="batch"></span>';
+    a.children[0].textContent = c.name;
+    a.children[1].textContent = c.batch;
+    list.appendChild(a);
+  }
+  offset += data.companies.length;
+  done = !data.more;
+  loading = false;
+  if (!done && document.body.scrollHeight <= innerHeight + 500) more();
+}
+addEventListener('scroll', () => { if (innerHeight + scrollY >= document.body.scrollHeight - 500) more(); });
+more();
+'''
+
+
+def render_infinite_listing():
+    """Listing shell whose cards arrive from /api/companies as it scrolls"""
+    return (
+        '<!DOCTYPE html><html><head><title>The YC Startup Directory | Y Combinator</title>'
+        '<style>.company-card { display: block; height: 80px; }</style></head>'
+        '<body><div class="companies"></div>'
+        f'<script>{INFINITE_LISTING_JS % {"page": SCROLL_PAGE_SIZE}}</script></body></html>'
+    )
+
+
+def render_companies_page(companies, offset, limit):
+    """One /api/companies page of the infinite-scroll listing"""
+    chunk = companies[offset:offset + limit]
+    return json.dumps({
+        'companies': [{'slug': c['slug'], 'name': c['name'], 'batch': c['batch']} for c in chunk],
+        'more': offset + limit < len(companies),
+    })
+
+
+def render_detail(company, padding=0):
+    """Detail page with website, batch pill and founder cards"""
+    founder_blocks = []
+    for name, linkedin_slug, twitter in company['founders']:
+        founder_blocks.append(
+            f'<div class="founder"><h3>{name}</h3>'
+            f'<a href="https://www.linkedin.com/in/{linkedin_slug}/">LinkedIn</a>'
+            f'<a href="https://twitter.com/{twitter}">Twitter</a></div>'
+        )
+    filler = '<p>' + ('lorem ipsum ' * 50) + '</p>'
+    return (
+        f'<!DOCTYPE html><html><head><title>{company["name"]} | Y Combinator</title></head><body>'
+        f'<div data-page=\'{{"company":{{"slug":"{company["slug"]}","batch":"{company["batch"]}"}}}}\'></div>'
+        f'<h1>{company["name"]}</h1>'
+        f'<span class="batch-pill">{company["batch"]}</span>'
+        f'<a href="{company["website"]}">{company["website"]}</a>'
+        f'<section class="founders"><h2>Active Founders</h2>{"".join(founder_blocks)}</section>'
+        + filler * padding +
+        '<a href="https://twitter.com/ycombinator">YC</a></body></html>'
+    )
+
+
+SITEMAP_CHUNK = 1000  # Companies per gzipped sitemap file
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def render_sitemap_index(base_url, companies):
+    """Sitemap index: one plain sitemap of directory pages, then gzipped company sitemaps"""
+    locs = [f'{base_url}/sitemap-pages.xml']
+    locs += [f'{base_url}/sitemap-companies-{n}.xml.gz' for n in range(0, max(len(companies), 1), SITEMAP_CHUNK)]
+    entries = ''.join(f'<sitemap><loc>{loc}</loc></sitemap>' for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NS}">{entries}</sitemapindex>'
+
+
+def render_sitemap(urls):
+    entries = ''.join(f'<url><loc>{url}</loc><changefreq>daily</changefreq></url>' for url in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{SITEMAP_NS}">{entries}</urlset>'
+
+
+def render_js_shell(company, padding=0):
+    """Detail page whose content only appears once its script runs - static parsing finds nothing"""
+    payload = base64.b64encode(render_detail(company, padding).encode('utf-8')).decode('ascii')
+    return (
+        '<!DOCTYPE html><html><head><title>Y Combinator</title></head><body><div id="root"></div>'
+        f'<script>document.documentElement.innerHTML = atob("{payload}");</script></body></html>'
+    )
+
+
+class StubState:
+    """Shared server configuration and counters"""
+
+    def __init__(self, companies=500, latency=0.0, latency_per_request=0.0, rate_429=0.0,
+                 capacity=0, retry_after=1, padding=0, duplicate_links=False, js_shell_every=0, chunk_delay=0.0,
+                 seed=0):
+        self.companies = make_companies(companies)
+        self.by_slug = {c['slug']: c for c in self.companies}
+        self.latency = latency
+        self.latency_per_request = latency_per_request
+        self.rate_429 = rate_429
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self.padding = padding
+        self.duplicate_links = duplicate_links
+        self.js_shell_every = js_shell_every
+        self.chunk_delay = chunk_delay
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.counters = {'requests': 0, 'throttled': 0, 'served': 0, 'detail': 0}
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'YcStub/1.0'
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+    def do_GET(self):
+        state = self.server.state
+        state.count('requests')
+        with state.lock:
+            state.in_flight += 1
+            in_flight = state.in_flight
+        try:
+            # Over capacity or random throttling -> 429 with Retry-After
+            throttled = (state.capacity and in_flight > state.capacity) or (
+                state.rate_429 and state.random.random() < state.rate_429)
+            if throttled:
+                state.count('throttled')
+                self._send(429, b'Too Many Requests', {'Retry-After': str(state.retry_after)})
+                return
+
+            # Latency grows with load so an over-eager client sees slow responses first
+            delay = state.latency + state.latency_per_request * in_flight
+            if delay:
+                time.sleep(delay)
+
+            url = urlsplit(self.path)
+            path = url.path.rstrip('/')
+            content_type = 'text/html; charset=utf-8'
+            if path == '/companies' and parse_qs(url.query).get('scroll'):
+                body = render_infinite_listing()
+            elif path == '/api/companies':
+                query = parse_qs(url.query)
+                offset = int(query.get('offset', ['0'])[0])
+                limit = int(query.get('limit', [str(SCROLL_PAGE_SIZE)])[0])
+                body = render_companies_page(state.companies, offset, limit)
+                content_type = 'application/json'
+            elif path == '/companies':
+                # ?batch=Winter%202026 filters like the real directory
+                batches = parse_qs(url.query).get('batch')
+                companies = [c for c in state.companies if not batches or c['batch'] in batches]
+                body = render_listing(companies, state.duplicate_links)
+            elif path == '/sitemap.xml':
+                body = render_sitemap_index(self._base_url(), state.companies)
+                content_type = 'application/xml'
+            elif path == '/sitemap-pages.xml':
+                # Directory pages that are not companies - discovery must skip them
+                base = self._base_url()
+                body = render_sitemap([f'{base}/companies', f'{base}/companies/industry/fintech',
+                                       f'{base}/companies?batch=Winter%202026'])
+                content_type = 'application/xml'
+            elif path.startswith('/sitemap-companies-') and path.endswith('.xml.gz'):
+                start = int(path[len('/sitemap-companies-'):-len('.xml.gz')])
+                base = self._base_url()
+                chunk = state.companies[start:start + SITEMAP_CHUNK]
+                body = gzip.compress(render_sitemap(f'{base}/companies/{c["slug"]}' for c in chunk).encode('utf-8'))
+                state.count('served')
+                self._send(200, body, {'Content-Type': 'application/x-gzip'})
+                return
+            elif path.startswith('/companies/') and path.split('/companies/')[1].lower() in state.by_slug:
+                company = state.by_slug[path.split('/companies/')[1].lower()]
+                index = int(company['slug'].rsplit('-', 1)[1])
+                if state.js_shell_every and index % state.js_shell_every == 0:
+                    body = render_js_shell(company, state.padding)
+                else:
+                    body = render_detail(company, state.padding)
+                state.count('detail')
+            else:
+                self._send(404, b'Not Found')
+                return
+            state.count('served')
+            self._send(200, body.encode('utf-8'), {'Content-Type': content_type})
+        finally:
+            with state.lock:
+                state.in_flight -= 1
+
+    def _base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not self.server.state.chunk_delay:
+            self.wfile.write(body)
+            return
+        # Trickle the body like a real network link, so clients see it arrive in pieces
+        for start in range(0, len(body), 16384):
+            self.wfile.write(body[start:start + 16384])
+            self.wfile.flush()
+            time.sleep(self.server.state.chunk_delay)
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up mid-response - expected when testing timeouts
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class StubServer:
+    """Run the stub in a background thread: ``with StubServer(...) as server: server.url``"""
+
+    def __init__(self, host='127.0.0.1', port=0, **options):
+        self.httpd = _QuietHTTPServer((host, port), StubHandler)
+        self.httpd.state = StubState(**options)
+        self.thread = None
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--companies', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0, help='base latency per request (seconds)')
+    parser.add_argument('--latency-per-request', type=float, default=0.0,
+                        help='extra latency per in-flight request (seconds)')
+    parser.add_argument('--rate-429', type=float, default=0.0, help='probability of a random 429')
+    parser.add_argument('--capacity', type=int, default=0, help='answer 429 above this many in-flight requests')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--padding', type=int, default=0, help='filler paragraphs per detail page')
+    parser.add_argument('--duplicate-links', action='store_true', help='add variant links to each listing card')
+    parser.add_argument('--chunk-delay', type=float, default=0.0,
+                        help='send bodies in 16 KB chunks, sleeping this long between them (seconds)')
+    parser.add_argument('--js-shell-every', type=int, default=0,
+                        help='serve every Nth detail page as a JS-only shell (hybrid rendering)')
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, companies=args.companies, latency=args.latency,
+                        latency_per_request=args.latency_per_request, rate_429=args.rate_429,
+                        capacity=args.capacity, retry_after=args.retry_after, padding=args.padding,
+                        duplicate_links=args.duplicate_links, js_shell_every=args.js_shell_every,
+                        chunk_delay=args.chunk_delay)
+    print(f'Stub YC directory on {server.url}/companies ({args.companies} companies)')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f'Counters: {server.state.counters}')
+
+
+if __name__ == '__main__':
+    main()
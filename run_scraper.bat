@@ -1,8 +1,9 @@
 @echo off
 echo Running Y Combinator Companies Scraper...
+echo (one crawl process per batch - shards and logs in shards\)
 echo.
 
-scrapy crawl yc_companies
+python -m yc_scraper.launcher
 
 if %ERRORLEVEL% EQU 0 (
     echo.
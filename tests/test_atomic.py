@@ -0,0 +1,28 @@
+import os
+
+from yc_scraper.atomic import SNAPSHOT_DIR, atomic_write
+
+
+def _writer(text):
+    def write(temp_path):
+        with open(temp_path, 'w') as f:
+            f.write(text)
+    return write
+
+
+def test_snapshots_pruned_per_workbook(tmp_path):
+    main = str(tmp_path / 'yc_companies.xlsx')
+    delta = str(tmp_path / 'yc_companies.new.xlsx')
+    for i in range(4):
+        atomic_write(main, _writer(f'main {i}'), keep_snapshots=2)
+    for i in range(4):
+        atomic_write(delta, _writer(f'delta {i}'), keep_snapshots=2)
+    atomic_write(main, _writer('main 4'), keep_snapshots=2)
+
+    names = sorted(os.listdir(tmp_path / SNAPSHOT_DIR))
+    main_snapshots = [name for name in names if not name.startswith('yc_companies.new.')]
+    delta_snapshots = [name for name in names if name.startswith('yc_companies.new.')]
+    assert len(main_snapshots) == 2
+    assert len(delta_snapshots) == 2
+    with open(tmp_path / SNAPSHOT_DIR / main_snapshots[-1]) as f:
+        assert f.read() == 'main 3'
@@ -0,0 +1,257 @@
+"""Compressed archive of fetched pages, replayed by `scrapy reparse`.
+
+With ARCHIVE_FILE set, ArchiveMiddleware appends every fetched listing and
+detail page to one append-only file. Each record is its own gzip member (or
+zstd frame) holding a JSON header line followed by the raw body, and
+``<file>.idx`` gets one JSON line with the record's offset and length, so any
+page can be read back without decompressing the rest - like WARC, minus the
+ceremony.
+
+`scrapy reparse pages.archive` runs the spider with ArchiveReplayMiddleware,
+which answers requests from the archive instead of the network, so improved
+extraction or export code can be applied to an old crawl at disk speed.
+"""
+
+import contextlib
+import gzip
+import json
+import os
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from scrapy import Request, signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
+from scrapy.http import TextResponse
+from scrapy.responsetypes import responsetypes
+
+from yc_scraper.dedup import canonical_company_key
+
+# Request meta worth keeping with the page - what the callbacks read (a 'cards'
+# listing render has an empty body, its companies are in listing_cards; an early-aborted
+# page is truncated, and early_abort_batch tells the callback to skip it)
+ARCHIVED_META = ('batch_from_card', 'card_name', 'listing_batch', 'listing_cards', 'early_abort_batch')
+REPLAYED_FLAGS = ('download_stopped',)  # Response flags the callbacks read
+
+
+def _codec(name):
+    """(compress, decompress) for 'gzip' or 'zstd' - zstd needs the optional zstandard package"""
+    if name == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+    if name == 'gzip':
+        return (lambda data: gzip.compress(data, compresslevel=5)), gzip.decompress
+    raise ValueError(f"Unknown archive compression {name!r} - use 'gzip' or 'zstd'")
+
+
+@contextlib.contextmanager
+def _locked(f):
+    """Exclusive lock on an open file - parallel launcher shards can share one ARCHIVE_FILE"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # Byte 0 stands for the whole file
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ArchiveWriter:
+    """Append records to ``path`` and their offsets to ``path.idx``"""
+
+    def __init__(self, path, compression='gzip'):
+        self.path = path
+        self.compression = compression
+        self.compress, _ = _codec(compression)
+        self.data = open(path, 'ab')
+        self.index = open(path + '.idx', 'a', encoding='utf-8')
+
+    def write(self, header, body):
+        """Returns the compressed size of the record"""
+        blob = self.compress(json.dumps(header).encode('utf-8') + b'\n' + body)
+        with _locked(self.data):
+            # Another process may have appended since our last write - tell() alone would be stale
+            self.data.seek(0, os.SEEK_END)
+            offset = self.data.tell()
+            self.data.write(blob)
+            self.data.flush()
+            # Index line last - a crash in between leaves an unindexed tail, never a bad index entry
+            self.index.write(json.dumps({
+                'url': header['url'],
+                'request_url': header['request_url'],
+                'callback': header['callback'],
+                'offset': offset,
+                'length': len(blob),
+                'compression': self.compression,
+            }) + '\n')
+            self.index.flush()
+        return len(blob)
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+
+class ArchiveReader:
+    """Random access to an archive through its index"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = []
+        with open(path + '.idx', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    self.entries.append(json.loads(line))
+                except ValueError:
+                    pass  # Torn last line from a crash
+        self.by_url = {}
+        for entry in self.entries:  # Later fetches of a URL win
+            self.by_url[entry['request_url']] = entry
+            self.by_url[entry['url']] = entry
+            key = canonical_company_key(entry['url'])
+            if key:
+                self.by_url[f'company:{key}'] = entry
+        self.data = open(path, 'rb')
+        self._decompress = {}
+
+    def lookup(self, url):
+        entry = self.by_url.get(url)
+        if entry is None:
+            key = canonical_company_key(url)
+            entry = self.by_url.get(f'company:{key}') if key else None
+        return entry
+
+    def read(self, entry):
+        """(header dict, body bytes) of one record"""
+        compression = entry.get('compression', 'gzip')
+        if compression not in self._decompress:
+            self._decompress[compression] = _codec(compression)[1]
+        self.data.seek(entry['offset'])
+        payload = self._decompress[compression](self.data.read(entry['length']))
+        header, _, body = payload.partition(b'\n')
+        return json.loads(header), body
+
+    def close(self):
+        self.data.close()
+
+
+class ArchiveMiddleware:
+    """Downloader middleware: archive every successfully fetched page to ARCHIVE_FILE"""
+
+    def __init__(self, writer, stats=None):
+        self.writer = writer
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        path = settings.get('ARCHIVE_FILE')
+        if not path or settings.get('ARCHIVE_REPLAY_FILE'):
+            raise NotConfigured  # Off by default, and a replay must not archive itself
+        try:
+            writer = ArchiveWriter(path, settings.get('ARCHIVE_COMPRESSION', 'gzip'))
+        except ImportError:
+            print('WARNING: ARCHIVE_COMPRESSION = "zstd" needs `pip install zstandard` - using gzip')
+            writer = ArchiveWriter(path, 'gzip')
+        print(f'Archiving fetched pages to {path} ({writer.compression})')
+        middleware = cls(writer, crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_response(self, request, response, spider):
+        if response.status != 200 or 'archived' in response.flags or not isinstance(response, TextResponse):
+            return response
+        header = {
+            'url': response.url,
+            'request_url': request.url,
+            'status': response.status,
+            'headers': {'Content-Type': response.headers.get('Content-Type', b'text/html').decode('latin-1')},
+            'encoding': response.encoding,
+            'callback': getattr(request.callback, '__name__', None) or 'parse',
+            'meta': {key: request.meta[key] for key in ARCHIVED_META if request.meta.get(key)},
+            'flags': [flag for flag in response.flags if flag in REPLAYED_FLAGS],
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        try:
+            stored = self.writer.write(header, response.body)
+        except OSError as e:
+            spider.logger.error(f'Could not archive {response.url}: {e}')
+            return response
+        if self.stats is not None:
+            self.stats.inc_value('archive/records')
+            self.stats.inc_value('archive/raw_bytes', len(response.body))
+            self.stats.inc_value('archive/stored_bytes', stored)
+        return response
+
+    def spider_closed(self, spider):
+        self.writer.close()
+
+
+class ArchiveReplayMiddleware:
+    """Serve the crawl from ARCHIVE_REPLAY_FILE instead of the network.
+
+    Enabled as a downloader middleware (answers requests from the archive) and
+    as a spider middleware (starts from the archived listing pages, so the
+    spider's own parse() rediscovers the companies). `scrapy reparse` sets both.
+    """
+
+    def __init__(self, reader, stats=None):
+        self.reader = reader
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        path = crawler.settings.get('ARCHIVE_REPLAY_FILE')
+        if not path:
+            raise NotConfigured
+        if not os.path.exists(path + '.idx'):
+            raise NotConfigured(f'{path}.idx not found')
+        middleware = cls(ArchiveReader(path), crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def process_start_requests(self, start_requests, spider):
+        if not self.reader.entries:
+            yield from start_requests
+            return
+        listings = [entry for entry in self.reader.entries if entry['callback'] == 'parse']
+        # No listing in the archive (e.g. a distributed worker's) - replay the detail pages directly
+        for entry in listings or self.reader.entries:
+            header, _ = self.reader.read(entry)
+            if header['callback'].startswith('parse_company_detail'):
+                callback = spider.detail_callback  # Pooled or not depends on this run's settings
+            else:
+                callback = getattr(spider, header['callback'], None)
+            yield Request(header['request_url'], callback=callback, meta=dict(header['meta']), dont_filter=True)
+
+    def process_request(self, request, spider):
+        entry = self.reader.lookup(request.url)
+        if entry is None:
+            if self.stats is not None:
+                self.stats.inc_value('archive/replay_missing')
+            raise IgnoreRequest(f'{request.url} is not in the archive')
+        header, body = self.reader.read(entry)
+        response_class = responsetypes.from_args(headers=header['headers'], url=header['url'], body=body)
+        kwargs = {'encoding': header['encoding']} if issubclass(response_class, TextResponse) else {}
+        flags = header.get('flags', [])
+        if 'download_stopped' in flags:
+            # A truncated early-aborted page - the callback skips it, as in the original crawl
+            request.meta['early_abort_batch'] = header['meta'].get('early_abort_batch')
+        if self.stats is not None:
+            self.stats.inc_value('archive/replayed')
+        return response_class(url=header['url'], status=header['status'], headers=header['headers'], body=body,
+                              request=request, flags=['archived', *flags], **kwargs)
+
+    def spider_closed(self, spider):
+        self.reader.close()
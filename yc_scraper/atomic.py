@@ -0,0 +1,111 @@
+"""Crash-safe file writes for the exporters.
+
+``atomic_write`` has the writer produce a temp file in the target's directory,
+fsyncs it and renames it over the target, so readers only ever see the old or
+the new complete file - never a truncated one. Optionally the previous good
+file is kept as a snapshot, and when the target is locked (a workbook open in
+Excel on Windows) the new file goes to a sidecar next to it instead.
+"""
+
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+
+SNAPSHOT_DIR = '.export_snapshots'
+
+
+def sidecar_path(path):
+    """yc_companies.xlsx -> yc_companies.pending.xlsx"""
+    stem, ext = os.path.splitext(path)
+    return f'{stem}.pending{ext}'
+
+
+def _fsync_dir(directory):
+    if os.name == 'nt':
+        return  # Directories can't be opened/fsynced on Windows; NTFS journals the rename
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _snapshot(path, keep):
+    """Keep the current good file as a snapshot and prune to the newest ``keep``"""
+    directory = os.path.join(os.path.dirname(path), SNAPSHOT_DIR)
+    os.makedirs(directory, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    snapshot = os.path.join(directory, f'{stem}.{datetime.now():%Y%m%d-%H%M%S-%f}{ext}')
+    try:
+        os.link(path, snapshot)  # The rename below leaves this inode alone - no copy needed
+    except OSError:
+        shutil.copy2(path, snapshot)
+    # Only this file's snapshots - yc_companies.new.xlsx (delta runs) shares the stem
+    pattern = re.compile(re.escape(stem) + r'\.\d{8}-\d{6}-\d{6}' + re.escape(ext))
+    snapshots = sorted(name for name in os.listdir(directory) if pattern.fullmatch(name))
+    for name in snapshots[:-keep]:
+        os.remove(os.path.join(directory, name))
+
+
+def _create_temp(directory, stem, ext):
+    """Empty temp file next to the target - created like open() would, so the umask applies (mkstemp forces 0600)"""
+    while True:
+        temp_path = os.path.join(directory, f'.{stem}.{uuid.uuid4().hex[:8]}{ext}.tmp')
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return temp_path
+
+
+def atomic_write(path, write, keep_snapshots=0, sidecar=True):
+    """Call ``write(temp_path)``, then atomically move the result to ``path``.
+
+    Returns ``(written_path, seconds, size)``; ``written_path`` is the sidecar if
+    ``path`` was locked. Raises if the writer fails (the temp file is removed and
+    ``path`` is untouched) or if neither target nor sidecar can be replaced.
+    """
+    started = time.perf_counter()
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    # Same directory as the target, so the rename never crosses filesystems
+    temp_path = _create_temp(directory, stem, ext)
+    try:
+        write(temp_path)
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        size = os.path.getsize(temp_path)
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)  # Keep the mode the file had
+
+        if keep_snapshots and os.path.exists(path):
+            try:
+                _snapshot(path, keep_snapshots)
+            except OSError:
+                pass  # A missing snapshot must not cost us the write itself
+
+        written = path
+        try:
+            os.replace(temp_path, path)
+        except PermissionError:
+            if not sidecar:
+                raise
+            written = sidecar_path(path)
+            os.replace(temp_path, written)
+        else:
+            # Target writable again - the sidecar from an earlier locked flush is stale
+            if sidecar and os.path.exists(sidecar_path(path)):
+                try:
+                    os.remove(sidecar_path(path))
+                except OSError:
+                    pass
+        _fsync_dir(directory)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return written, time.perf_counter() - started, size
@@ -0,0 +1,208 @@
+"""Keeps Chromium's memory bounded over long Playwright sessions.
+
+Scrolling the full directory grows the listing page's JS heap and DOM, and every
+render in a long crawl leaves something behind in the browser context.
+BrowserMemoryGovernor (used by PlaywrightMiddleware) samples two numbers:
+
+- per page: JS heap and DOM node count from CDP ``Performance.getMetrics``
+- per browser: resident memory of the Chromium processes (needs psutil; without
+  it only the per-page limits apply)
+
+and acts on them:
+
+- a listing page over PLAYWRIGHT_MEMORY_PAGE_LIMIT_MB is garbage-collected, and
+  if that does not help, the scroll stops there (links already streamed are kept)
+- a pooled detail page over the page limit, or past PLAYWRIGHT_MEMORY_PAGE_MAX_RENDERS
+  renders, is closed instead of reused
+- a browser over PLAYWRIGHT_MEMORY_BROWSER_LIMIT_MB gets a fresh context once the
+  renders in flight finish (not with a shared browser server - its context holds
+  the persistent cache)
+- new renders wait while PLAYWRIGHT_MEMORY_BUDGET_MB has no room for another one
+
+Every sample and action is counted under playwright/memory/* stats.
+"""
+
+import asyncio
+import contextlib
+import os
+import time
+
+try:
+    import psutil
+except ImportError:  # No browser RSS - PlaywrightMiddleware warns at startup
+    psutil = None
+
+MB = 1024 * 1024
+# Chromium process names - the Playwright driver (node) is not part of the browser
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'headless_shell')
+
+
+class BrowserMemoryGovernor:
+    """Samples browser memory and decides when to recycle pages/contexts and how many renders may run"""
+
+    def __init__(self, stats=None, page_limit_mb=512, browser_limit_mb=2048, budget_mb=3072,
+                 page_max_renders=50, render_cost_mb=200, sample_interval=5.0):
+        self.stats = stats
+        self.page_limit_mb = page_limit_mb
+        self.browser_limit_mb = browser_limit_mb
+        self.budget_mb = budget_mb
+        self.page_max_renders = page_max_renders
+        self.render_cost_mb = render_cost_mb  # Memory one more render is assumed to need
+        self.sample_interval = sample_interval
+        self.page_sample_renders = 10  # Pooled pages are sampled every this many renders - each sample is a CDP round trip
+        self.root_pid = os.getpid()  # Chromium runs under this process - or the browser server's pid
+        self.browser_rss_mb = None
+        self._sampled_at = 0.0
+        self._active_at_sample = 0  # Renders the last RSS sample already includes
+        self.active = 0
+        self.recycling = False
+        self._condition = None
+
+    @classmethod
+    def from_settings(cls, settings, stats=None):
+        return cls(
+            stats,
+            page_limit_mb=settings.getfloat('PLAYWRIGHT_MEMORY_PAGE_LIMIT_MB', 512),
+            browser_limit_mb=settings.getfloat('PLAYWRIGHT_MEMORY_BROWSER_LIMIT_MB', 2048),
+            budget_mb=settings.getfloat('PLAYWRIGHT_MEMORY_BUDGET_MB', 3072),
+            page_max_renders=settings.getint('PLAYWRIGHT_MEMORY_PAGE_MAX_RENDERS', 50),
+            render_cost_mb=settings.getfloat('PLAYWRIGHT_MEMORY_RENDER_COST_MB', 200),
+        )
+
+    @property
+    def samples_browser(self):
+        """False without psutil - then no context recycling and no render budget, only the per-page limits"""
+        return psutil is not None
+
+    def count(self, key, amount=1):
+        if self.stats is not None:
+            self.stats.inc_value(f'playwright/memory/{key}', amount)
+
+    def _max(self, key, value):
+        if self.stats is not None:
+            self.stats.max_value(f'playwright/memory/{key}', value)
+
+    # -- sampling --
+
+    async def page_metrics(self, context, page):
+        """{'js_heap_mb', 'nodes'} of one page from CDP Performance.getMetrics - None if CDP is unavailable"""
+        try:
+            session = await context.new_cdp_session(page)
+            try:
+                await session.send('Performance.enable')
+                metrics = await session.send('Performance.getMetrics')
+            finally:
+                await session.detach()
+        except Exception:
+            self.count('cdp_errors')
+            return None
+        values = {metric['name']: metric['value'] for metric in metrics.get('metrics', [])}
+        sample = {'js_heap_mb': values.get('JSHeapUsedSize', 0) / MB, 'nodes': int(values.get('Nodes', 0))}
+        self.count('page_samples')
+        self._max('page_heap_mb_max', round(sample['js_heap_mb'], 1))
+        self._max('page_nodes_max', sample['nodes'])
+        return sample
+
+    async def collect_garbage(self, context, page):
+        try:
+            session = await context.new_cdp_session(page)
+            try:
+                await session.send('HeapProfiler.collectGarbage')
+            finally:
+                await session.detach()
+        except Exception:
+            self.count('cdp_errors')
+            return
+        self.count('gc_forced')
+
+    def sample_browser(self, force=False):
+        """Resident MB of the Chromium processes, re-read at most every sample_interval seconds"""
+        now = time.monotonic()
+        if not force and now - self._sampled_at < self.sample_interval:
+            return self.browser_rss_mb
+        self._sampled_at = now
+        if psutil is None:
+            return None
+        try:
+            processes = psutil.Process(self.root_pid).children(recursive=True)
+            if self.root_pid != os.getpid():
+                processes.append(psutil.Process(self.root_pid))  # The browser server itself
+        except psutil.Error:
+            return None
+        total = 0
+        for process in processes:
+            try:
+                if any(name in process.name().lower() for name in BROWSER_PROCESS_NAMES):
+                    total += process.memory_info().rss
+            except psutil.Error:
+                continue  # Renderer exited between listing and reading it
+        self.browser_rss_mb = total / MB
+        self._active_at_sample = self.active
+        self.count('browser_samples')
+        self._max('browser_rss_mb_max', round(self.browser_rss_mb, 1))
+        return self.browser_rss_mb
+
+    # -- decisions --
+
+    def page_over_limit(self, sample):
+        return sample is not None and sample['js_heap_mb'] > self.page_limit_mb
+
+    def should_recycle_page(self, renders, sample):
+        """A pooled page is closed after too many renders or once its heap is over the limit"""
+        if renders >= self.page_max_renders:
+            self.count('pages_recycled/renders')
+            return True
+        if self.page_over_limit(sample):
+            self.count('pages_recycled/heap')
+            return True
+        return False
+
+    def browser_over_limit(self):
+        rss = self.sample_browser()
+        return rss is not None and rss > self.browser_limit_mb
+
+    def allowed_renders(self):
+        """Concurrent renders the memory budget has room for - at least one, so the crawl always moves.
+        Static caps (DETAIL_RENDER_CONCURRENCY) are the middleware's semaphores; this only ever lowers them."""
+        rss = self.browser_rss_mb
+        if rss is None or not self.budget_mb or not self.render_cost_mb:
+            return self.active + 1
+        room = int((self.budget_mb - rss) // self.render_cost_mb)
+        allowed = max(1, self._active_at_sample + room)
+        if self.stats is not None:
+            self.stats.min_value('playwright/memory/render_slots_min', allowed)
+        return allowed
+
+    # -- render slots --
+
+    @contextlib.asynccontextmanager
+    async def render_slot(self):
+        """Hold one render slot - waits while the budget is full or a context is being recycled"""
+        self._condition = self._condition or asyncio.Condition()
+        self.sample_browser()
+        async with self._condition:
+            if self.recycling or self.active >= self.allowed_renders():
+                self.count('render_waits')
+            await self._condition.wait_for(lambda: not self.recycling and self.active < self.allowed_renders())
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.active -= 1
+                self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def exclusive(self):
+        """No render runs inside this block - for swapping the browser context"""
+        self._condition = self._condition or asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self.recycling)
+            self.recycling = True
+            await self._condition.wait_for(lambda: self.active == 0)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.recycling = False
+                self._condition.notify_all()
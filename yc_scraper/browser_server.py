@@ -0,0 +1,156 @@
+"""Long-lived local Chromium shared by consecutive crawls.
+
+Starting Chromium and downloading the directory's JS bundles dominates short,
+batch-scoped crawls. This helper keeps one headless Chromium running with a
+persistent profile directory (so its HTTP cache survives between crawls) and
+exposes it over the DevTools protocol for PlaywrightMiddleware to connect to:
+
+    python -m yc_scraper.browser_server start
+    scrapy crawl yc_companies -s PLAYWRIGHT_BROWSER_SERVER=True
+    python -m yc_scraper.browser_server stop
+
+Playwright's ``launch_server`` is only available in the Node.js API, so the
+Python side launches Playwright's own Chromium build with a remote-debugging
+port and connects with ``connect_over_cdp``.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+DEFAULT_PORT = 9222
+DEFAULT_PROFILE_DIR = '.browser_profile'
+DEFAULT_STATE_FILE = '.browser_server.json'
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+CHROMIUM_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-images',
+    '--disable-plugins',
+    '--disable-extensions',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+]
+
+
+def read_state(state_file=DEFAULT_STATE_FILE):
+    """Return the running server's state ({pid, endpoint, profile_dir}) or None"""
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_alive(endpoint, timeout=1.0):
+    """True if a DevTools endpoint answers /json/version"""
+    try:
+        with urllib.request.urlopen(f'{endpoint}/json/version', timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def start(port=DEFAULT_PORT, profile_dir=DEFAULT_PROFILE_DIR, state_file=DEFAULT_STATE_FILE, wait=15):
+    state = read_state(state_file)
+    if state and is_alive(state['endpoint']):
+        print(f"Browser server already running at {state['endpoint']} (pid {state['pid']})")
+        return state
+
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+
+    profile_dir = os.path.abspath(profile_dir)
+    os.makedirs(profile_dir, exist_ok=True)
+    endpoint = f'http://127.0.0.1:{port}'
+    args = [
+        executable,
+        '--headless=new',
+        f'--remote-debugging-port={port}',
+        '--remote-debugging-address=127.0.0.1',
+        f'--user-data-dir={profile_dir}',
+        f'--user-agent={USER_AGENT}',
+        '--window-size=1920,1080',
+        *CHROMIUM_ARGS,
+        'about:blank',
+    ]
+    popen_kwargs = {'stdout': subprocess.DEVNULL, 'stderr': subprocess.DEVNULL}
+    if os.name == 'nt':
+        popen_kwargs['creationflags'] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        popen_kwargs['start_new_session'] = True  # Outlive the shell that started it
+    process = subprocess.Popen(args, **popen_kwargs)
+
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        if is_alive(endpoint):
+            break
+        if process.poll() is not None:
+            raise RuntimeError(f'Chromium exited with code {process.returncode}')
+        time.sleep(0.2)
+    else:
+        process.kill()
+        raise RuntimeError(f'Chromium did not open {endpoint} within {wait}s')
+
+    state = {'pid': process.pid, 'endpoint': endpoint, 'profile_dir': profile_dir}
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    print(f'✅ Browser server started at {endpoint} (pid {process.pid}, profile {profile_dir})')
+    return state
+
+
+def stop(state_file=DEFAULT_STATE_FILE):
+    state = read_state(state_file)
+    if not state:
+        print('No browser server running')
+        return False
+    try:
+        os.kill(state['pid'], signal.SIGTERM)
+        print(f"✅ Browser server stopped (pid {state['pid']})")
+    except OSError as e:
+        print(f"Browser server process {state['pid']} not running: {e}")
+    os.remove(state_file)
+    return True
+
+
+def status(state_file=DEFAULT_STATE_FILE):
+    state = read_state(state_file)
+    if state and is_alive(state['endpoint']):
+        print(f"Running at {state['endpoint']} (pid {state['pid']}, profile {state['profile_dir']})")
+        return True
+    print('Not running')
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yc_scraper.browser_server',
+                                     description='Start/stop the shared Chromium used by PlaywrightMiddleware')
+    parser.add_argument('command', choices=['start', 'stop', 'status'])
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--profile-dir', default=DEFAULT_PROFILE_DIR, help='persistent profile (HTTP cache) directory')
+    parser.add_argument('--state-file', default=DEFAULT_STATE_FILE)
+    args = parser.parse_args(argv)
+
+    if args.command == 'start':
+        start(args.port, args.profile_dir, args.state_file)
+    elif args.command == 'stop':
+        stop(args.state_file)
+    else:
+        return 0 if status(args.state_file) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
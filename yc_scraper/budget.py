@@ -0,0 +1,147 @@
+"""Time-budgeted crawls: ``scrapy crawl yc_companies -a time_budget=600``.
+
+The budget (seconds, or TIME_BUDGET) is split into three stages:
+
+- listing render: the Playwright scroll stops TIME_BUDGET_LISTING_SHARE into the budget
+- detail fetching: until the export reserve starts
+- export: the reserve left for in-flight downloads to drain and for
+  ExcelExportPipeline.close_spider to write a complete workbook - at least
+  TIME_BUDGET_EXPORT_RESERVE seconds, more if flushes have been slow
+
+As the fetch deadline approaches, TimeBudgetMiddleware sheds requests by their
+priority band (scheduling.py): cards without a batch and retries first, then
+year-only cards, and at the deadline everything - then it closes the spider with
+reason 'time_budget'. Discovery requests (listings, sitemaps - meta['discovery'])
+are only shed at the deadline, and with BATCH_PRIORITY_ENABLED off there are no
+bands, so nothing is shed before it. The report at the end shows what each stage used.
+"""
+
+import time
+
+from scrapy import signals
+from scrapy.exceptions import IgnoreRequest
+from twisted.internet import task
+
+from yc_scraper.scheduling import CONFIRMED, LIKELY
+
+
+class TimeBudgetMiddleware:
+    """Downloader middleware that keeps a crawl inside its time budget - inert without one"""
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.default_budget = settings.getfloat('TIME_BUDGET', 0)
+        self.listing_share = settings.getfloat('TIME_BUDGET_LISTING_SHARE', 0.25)
+        self.min_reserve = settings.getfloat('TIME_BUDGET_EXPORT_RESERVE', 30)
+        self.shed_at = settings.getfloat('TIME_BUDGET_SHED_AT', 0.2)
+        self.download_timeout = settings.getfloat('DOWNLOAD_TIMEOUT', 180)
+        self.priority_bands = settings.getbool('BATCH_PRIORITY_ENABLED', True)  # Priorities are 0/1 without the policy
+        self.budget = 0
+        self.started = None
+        self.listing_done = None
+        self.fetch_done = None
+        self.closing = False
+        self.checker = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        self.budget = float(getattr(spider, 'time_budget', None) or self.default_budget or 0)
+        if self.budget <= 0:
+            return
+        self.started = time.monotonic()
+        self.stats.set_value('budget/seconds', self.budget)
+        print(f'Time budget: {self.budget:.0f}s - listing render up to {self.budget * self.listing_share:.0f}s, '
+              f'at least {self._reserve():.0f}s kept for export')
+        # Downloads in flight do not pass through process_request - check the deadline on a timer too
+        self.checker = task.LoopingCall(self._check_deadline, spider)
+        self.checker.start(1.0, now=False)
+
+    def _reserve(self):
+        """Seconds kept after fetching: in-flight downloads drain, then the final workbook write"""
+        flush_max = self.stats.get_value('export/flush_seconds_max', 0)
+        reserve = max(self.min_reserve, self.download_timeout + 2 * flush_max)
+        return min(reserve, self.budget / 2)
+
+    def _fetch_remaining(self):
+        """(seconds left for fetching, share of the fetch window left)"""
+        window = self.budget - self._reserve()
+        remaining = window - (time.monotonic() - self.started)
+        return remaining, remaining / window if window > 0 else 0.0
+
+    def process_request(self, request, spider):
+        if not self.started:
+            return None
+        remaining, share = self._fetch_remaining()
+        if not request.meta.get('render') and self._is_listing(request, spider):
+            # PlaywrightMiddleware stops scrolling when the listing share of the budget is used up
+            listing_left = self.budget * self.listing_share - (time.monotonic() - self.started)
+            request.meta['max_scroll_seconds'] = max(0.0, min(listing_left, remaining))
+        if remaining <= 0:
+            self._shed(request, 'deadline')
+        if request.meta.get('discovery') or not self.priority_bands:
+            return None
+        if share < self.shed_at / 2 and request.priority < CONFIRMED:
+            self._shed(request, 'year_or_no_batch')
+        if share < self.shed_at and request.priority < LIKELY:
+            self._shed(request, 'no_batch_or_retry')
+        return None
+
+    def process_response(self, request, response, spider):
+        if self.started and self.listing_done is None and self._is_listing(request, spider):
+            self.listing_done = time.monotonic()
+        return response
+
+    @staticmethod
+    def _is_listing(request, spider):
+        return request.callback is None or getattr(request.callback, '__name__', '') in ('parse', 'parse_sitemap')
+
+    def _shed(self, request, reason):
+        self.stats.inc_value(f'budget/shed/{reason}')
+        raise IgnoreRequest(f'Time budget: shed {request.url} ({reason})')
+
+    def _check_deadline(self, spider):
+        if self.closing:
+            return
+        remaining, _ = self._fetch_remaining()
+        if remaining > 0:
+            return
+        self.closing = True
+        self.fetch_done = time.monotonic()
+        self.stats.set_value('budget/deadline_hit', True)
+        print(f'⏱ Time budget: fetch deadline reached - closing with {self._reserve():.0f}s left for export')
+        spider.logger.info('Time budget: fetch deadline reached, closing spider')
+        self.crawler.engine.close_spider(spider, 'time_budget')
+
+    def spider_closed(self, spider, reason):
+        if not self.started:
+            return
+        if self.checker is not None and self.checker.running:
+            self.checker.stop()
+        # Pipelines close before spider_closed, so the export stage is already over
+        now = time.monotonic()
+        export = self.stats.get_value('export/close_seconds', 0)
+        fetch_done = self.fetch_done or now - export
+        listing_done = self.listing_done or fetch_done
+        stages = {
+            'listing': listing_done - self.started,
+            'detail': fetch_done - listing_done,
+            'export': export,
+        }
+        for stage, seconds in stages.items():
+            self.stats.set_value(f'budget/{stage}_seconds', round(seconds, 2))
+        total = now - self.started
+        self.stats.set_value('budget/used_seconds', round(total, 2))
+        shed = sum(v for k, v in self.stats.get_stats().items() if k.startswith('budget/shed/'))
+        report = (f'Time budget {self.budget:.0f}s: used {total:.1f}s ({total / self.budget:.0%}) - '
+                  + ', '.join(f'{stage} {seconds:.1f}s' for stage, seconds in stages.items())
+                  + f', {shed} requests shed')
+        print(report)
+        spider.logger.info(report)
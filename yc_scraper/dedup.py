@@ -0,0 +1,165 @@
+"""Canonical company keys and the seen-sets used to deduplicate them.
+
+Discovery, scheduling and export all agree on one key - the lowercased slug of
+/companies/<slug> - so 'companies/Acme/', 'http://ycombinator.com/companies/acme?tab=jobs'
+and 'https://www.ycombinator.com/companies/acme#founders' are one company and
+one detail fetch.
+"""
+
+import hashlib
+import math
+import re
+from urllib.parse import unquote, urlsplit
+
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.job import job_dir
+
+COMPANY_PATH = re.compile(r'/companies/([^/?#]+)')
+
+# Asset links that also live under /companies/ (logos, bundles)
+EXCLUDED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json')
+
+YC_HOSTS = ('ycombinator.com', 'www.ycombinator.com')
+
+
+def canonical_company_key(url):
+    """'https://www.ycombinator.com/companies/Acme/?x=1' -> 'acme'; None if url is not a company page"""
+    if not url:
+        return None
+    match = COMPANY_PATH.search(urlsplit(url.strip()).path)
+    if not match:
+        return None
+    slug = unquote(match.group(1)).strip().lower()
+    if slug == 'companies' or len(slug) < 2 or slug.endswith(EXCLUDED_EXTENSIONS):
+        return None
+    return slug
+
+
+def canonical_company_url(url):
+    """The one URL a company is fetched from - https://www.ycombinator.com/companies/<key> for YC links"""
+    key = canonical_company_key(url)
+    if not key:
+        return None
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if not host or host in YC_HOSTS:
+        return f'https://www.ycombinator.com/companies/{key}'
+    return f'{parts.scheme or "https"}://{parts.netloc}/companies/{key}'  # e.g. the local stub server
+
+
+class SeenSet:
+    """Exact seen-set - ``add`` returns True the first time a key is added"""
+
+    def __init__(self):
+        self._keys = set()
+
+    def add(self, key):
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def update(self, keys):
+        self._keys.update(keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class BloomSeenSet:
+    """Fixed-size Bloom filter for very large crawls.
+
+    Memory is set by ``capacity`` and ``error_rate`` up front (about 1.8 MB for a
+    million keys at 0.1%). There are no false negatives, but about ``error_rate``
+    of new keys are reported as seen, so those companies are skipped.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        new = False
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key):
+        for position in self._positions(key):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] & (1 << bit):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
+
+
+def make_seen_set(settings):
+    """SeenSet, or BloomSeenSet when DEDUP_SEEN_SET = 'bloom'"""
+    if settings.get('DEDUP_SEEN_SET', 'exact') == 'bloom':
+        return BloomSeenSet(settings.getint('DEDUP_BLOOM_CAPACITY', 1000000),
+                            settings.getfloat('DEDUP_BLOOM_ERROR_RATE', 0.001))
+    return SeenSet()
+
+
+class CompanyDupeFilter(RFPDupeFilter):
+    """Scheduler dupefilter that treats every URL of a company page as the same request.
+
+    Company detail requests are fingerprinted by canonical company key, everything
+    else as usual. The seen-set comes from make_seen_set, so DEDUP_SEEN_SET = 'bloom'
+    bounds its memory; JOBDIR persistence works as with RFPDupeFilter.
+    """
+
+    def __init__(self, path=None, debug=False, *, fingerprinter=None, seen=None, stats=None):
+        super().__init__(path, debug, fingerprinter=fingerprinter)
+        if seen is not None:
+            seen.update(self.fingerprints)  # Keys loaded from JOBDIR/requests.seen
+            self.fingerprints = seen
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            job_dir(settings),
+            settings.getbool('DUPEFILTER_DEBUG'),
+            fingerprinter=crawler.request_fingerprinter,
+            seen=make_seen_set(settings),
+            stats=crawler.stats,
+        )
+
+    def request_fingerprint(self, request):
+        key = canonical_company_key(request.url)
+        if key:
+            return f'company:{key}'
+        return super().request_fingerprint(request)
+
+    def request_seen(self, request):
+        seen = super().request_seen(request)
+        if seen and self.stats is not None:
+            self.stats.inc_value('dedup/duplicate_requests_avoided')
+        return seen
@@ -0,0 +1,138 @@
+"""Stop downloading detail pages of companies outside the target batches.
+
+A detail page names its batch in the page data near the top of the body
+(``"batch":"Winter 2019"``, HTML-escaped inside the data-page attribute).
+EarlyAbortExtension scans the body as it arrives - Scrapy's headers_received and
+bytes_received signals, decompressing gzip/deflate/br on the fly - and stops the
+download with StopDownload(fail=False) once the marker names a batch the crawl
+does not want. The callback gets the truncated page, flagged 'download_stopped',
+with the batch in meta['early_abort_batch'], and skips it without parsing.
+
+The decision is stricter than the full parser's: extract_batch_year accepts a
+page if a target batch or year appears anywhere in it (a "2025" in a blurb or a
+job post is enough), while the abort only reads the page's own batch field. Pages
+of off-target companies that the loose match used to keep are now dropped; turn
+EARLY_ABORT_ENABLED off to get the old results.
+
+Scrapy sends these signals from its HTTP/1.1 handler only; http2.py sends them
+from its HTTP/2 streams too, so pages from the YC host are stopped either way.
+"""
+
+import re
+import weakref
+import zlib
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured, StopDownload
+
+from yc_scraper.extraction import is_target_batch, normalize_batch
+
+BATCH_MARKER = re.compile(rb'(?:"|&quot;)batch(?:"|&quot;)\s*:\s*(?:"|&quot;)([^"&<]{2,40})(?:"|&quot;)')
+MARKER_OVERLAP = 128  # Bytes kept from the previous chunk - a marker can straddle two chunks
+
+
+def _decoder(content_encoding):
+    """Incremental decompress function for a Content-Encoding, None if it cannot be scanned"""
+    encoding = content_encoding.strip().lower()
+    if encoding in (b'', b'identity'):
+        return lambda data: data
+    if encoding in (b'gzip', b'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+    if encoding == b'deflate':
+        return zlib.decompressobj().decompress
+    if encoding == b'br':
+        try:
+            import brotli
+        except ImportError:
+            return None
+        return brotli.Decompressor().process
+    return None
+
+
+class _Scan:
+    """Body scan state of one download"""
+
+    def __init__(self, decode, expected_size):
+        self.decode = decode
+        self.expected_size = expected_size
+        self.received = 0
+        self.scanned = 0
+        self.tail = b''
+
+
+class EarlyAbortExtension:
+    """Cancel detail downloads whose batch marker names an off-target batch"""
+
+    def __init__(self, stats, scan_bytes=262144):
+        self.stats = stats
+        self.scan_bytes = scan_bytes
+        self.scans = weakref.WeakKeyDictionary()  # request -> _Scan, gone with the request
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('EARLY_ABORT_ENABLED'):
+            raise NotConfigured
+        extension = cls(crawler.stats, crawler.settings.getint('EARLY_ABORT_SCAN_BYTES', 262144))
+        crawler.signals.connect(extension.headers_received, signal=signals.headers_received)
+        crawler.signals.connect(extension.bytes_received, signal=signals.bytes_received)
+        crawler.signals.connect(extension.spider_closed, signal=signals.spider_closed)
+        return extension
+
+    def headers_received(self, headers, body_length, request, spider):
+        callback = getattr(request.callback, '__name__', '')
+        if not callback.startswith('parse_company_detail') or request.meta.get('render'):
+            return
+        decode = _decoder(headers.get(b'Content-Encoding') or b'')
+        if decode is None:
+            self.stats.inc_value('early_abort/unscannable_encoding')
+            return
+        # HTTP/1.1 reports UNKNOWN_LENGTH (a str) for chunked bodies, HTTP/2 -1 without Content-Length
+        expected_size = body_length if isinstance(body_length, int) and body_length > 0 else 0
+        self.scans[request] = _Scan(decode, expected_size)
+
+    def bytes_received(self, data, request, spider):
+        scan = self.scans.get(request)
+        if scan is None:
+            return
+        scan.received += len(data)
+        try:
+            text = scan.decode(data)
+        except Exception:  # zlib.error / brotli.error - leave the page to the normal path
+            del self.scans[request]
+            return
+        window = scan.tail + text
+        match = BATCH_MARKER.search(window)
+        if match is None:
+            scan.scanned += len(text)
+            scan.tail = window[-MARKER_OVERLAP:]
+            if scan.scanned > self.scan_bytes:
+                del self.scans[request]  # No marker near the top - let the page download
+            return
+        del self.scans[request]
+        batch = match.group(1).decode('utf-8', 'replace').strip()
+        if not self._off_target(batch, spider):
+            return
+        self.stats.inc_value('early_abort/pages')
+        self.stats.inc_value('early_abort/bytes_received', scan.received)
+        if scan.expected_size and scan.expected_size > scan.received:
+            self.stats.inc_value('early_abort/bytes_saved', scan.expected_size - scan.received)
+        request.meta['early_abort_batch'] = batch
+        raise StopDownload(fail=False)
+
+    def _off_target(self, batch, spider):
+        """The marker's batch is outside the crawl's batches - unrecognised markers download in full"""
+        canonical = normalize_batch(batch)
+        if not canonical:
+            return False
+        wanted = getattr(spider, 'batches', None)
+        if wanted:
+            return canonical not in wanted
+        return not is_target_batch(canonical)
+
+    def spider_closed(self, spider):
+        # Parse time saved, estimated from the pages that were parsed in full
+        pages = self.stats.get_value('early_abort/pages', 0)
+        parsed = self.stats.get_value('detail/parse_count', 0)
+        if pages and parsed:
+            average = self.stats.get_value('detail/parse_seconds_total', 0) / parsed
+            self.stats.set_value('early_abort/parse_seconds_saved', round(pages * average, 3))
@@ -0,0 +1,471 @@
+"""Pure detail-page extraction shared by the spider and the process pool.
+
+Also the listing's raw link scan, which works on the response bytes.
+
+Nothing here touches the spider, crawler or stats, so the same functions run on
+the reactor thread and inside ProcessPoolExecutor workers (see parallel.py).
+"""
+
+import re
+
+from scrapy.http import HtmlResponse
+
+from yc_scraper.items import Founder
+
+
+# The batches is_target_batch() accepts, newest first
+TARGET_BATCHES = ['Winter 2026', 'Fall 2025', 'Summer 2025', 'Spring 2025', 'Winter 2025', 'Fall 2024', 'Summer 2024']
+
+SEASONS = {'W': 'Winter', 'WINTER': 'Winter', 'S': 'Summer', 'SUMMER': 'Summer',
+           'F': 'Fall', 'FALL': 'Fall', 'SP': 'Spring', 'SPRING': 'Spring'}
+
+
+# Company links anywhere in a listing body - quoted (href attributes, embedded JSON) or an unquoted href=
+COMPANY_HREF = re.compile(
+    rb'["\']([^"\']*/companies/[^"\'?\s&<>]+)|href=["\']?([^"\'\s<>]*/companies/[^"\'?\s&<>]+)', re.IGNORECASE)
+
+
+def iter_company_hrefs(body, encoding='utf-8'):
+    """Company hrefs in a listing body (bytes), one finditer pass - no decoded copy of the page, no lists"""
+    for match in COMPANY_HREF.finditer(body):
+        href = match.group(1) or match.group(2)
+        if b'companies?' not in href:
+            yield href.decode(encoding, 'replace')
+
+
+def normalize_batch(text):
+    """Canonical batch name ('W26', 'WINTER 2026', 'winter-2026' -> 'Winter 2026'), or None"""
+    if not text:
+        return None
+    text = text.upper().replace('-', ' ').replace('_', ' ')
+    match = re.search(r'\b(WINTER|SUMMER|SPRING|FALL)\s*(20\d\d)\b', text)
+    if match:
+        return f'{SEASONS[match.group(1)]} {match.group(2)}'
+    match = re.search(r'\b(SP|W|S|F)(\d\d)\b', text)
+    if match:
+        return f'{SEASONS[match.group(1)]} 20{match.group(2)}'
+    return None
+
+
+def is_valid_name(text, existing_names):
+    """Validate if extracted text is a plausible founder name"""
+    if not text or not isinstance(text, str):
+        return False
+    text = text.strip()
+    if len(text) < 2 or len(text) > 80:
+        return False
+
+    # Exclude common non-name words
+    exclude_words = ['founder', 'founders', 'active founders', 'co-founder', 'co-founders',
+                    'linkedin', 'twitter', 'http', 'https', 'www', 'ycombinator',
+                    'based', 'located', 'company', 'website', 'email', 'contact',
+                    'click', 'here', 'more', 'read', 'view', 'profile',
+                    'tl;dr', 'our ask', 'our story', 'why we', 'problem', 'solution',
+                    'the knowledge', 'we are working']
+    text_lower = text.lower()
+    if any(word in text_lower for word in exclude_words):
+        return False
+    if 'http' in text_lower or text_lower.startswith('www.') or '@' in text:
+        return False
+    if text in existing_names:
+        return False
+
+    words = text.split()
+    word_count = len(words)
+    # Allow single word names if they're at least 4 chars (some people have single names)
+    if word_count < 1 or word_count > 5:
+        return False
+    if word_count == 1 and len(words[0]) < 3:
+        return False
+
+    # Must have at least one capital letter (proper name)
+    has_capital = any(any(c.isupper() for c in word) for word in words)
+    if not has_capital:
+        return False
+
+    # First word should start with capital
+    if words and not words[0][0].isupper():
+        return False
+
+    # Filter out names that are clearly IDs or usernames (all lowercase with numbers)
+    if word_count == 1 and words[0].islower() and any(c.isdigit() for c in words[0]):
+        # Single lowercase word with numbers is likely a username, not a name
+        if len([c for c in words[0] if c.isdigit()]) >= 2:
+            return False
+
+    # Exclude common words that aren't names
+    common_words = ['the', 'and', 'or', 'but', 'for', 'with', 'from', 'about']
+    if all(word.lower() in common_words for word in words):
+        return False
+
+    # Must contain at least one letter
+    if not any(c.isalpha() for c in text):
+        return False
+
+    return True
+
+
+def is_target_batch(batch_text):
+    """Check if the batch matches target batches: Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024"""
+    if not batch_text:
+        return False  # STRICT: If we can't determine, skip it
+
+    batch_text = batch_text.upper().strip()
+
+    # Target batches to scrape - check for any match
+    # Winter 2026
+    if re.search(r'WINTER\s*2026|W26', batch_text):
+        return True
+
+    # Fall 2025, Summer 2025, Spring 2025, Winter 2025
+    if re.search(r'(FALL|SUMMER|SPRING|WINTER)\s*2025', batch_text):
+        return True
+    if re.search(r'(F|S|SP|W)25', batch_text):  # F25, S25, SP25, W25
+        return True
+
+    # Fall 2024, Summer 2024
+    if re.search(r'(FALL|SUMMER)\s*2024', batch_text):
+        return True
+    if re.search(r'(F|S)24', batch_text):  # F24, S24
+        return True
+
+    # Also check for standalone years if they appear with season context elsewhere
+    # But be more lenient - if it's 2024, 2025, or 2026, check surrounding context
+    if re.search(r'\b20(24|25|26)\b', batch_text):
+        # If we see a year, check if there's any season indicator nearby
+        # This is a fallback for cases where batch format is different
+        if any(season in batch_text for season in ['FALL', 'SUMMER', 'SPRING', 'WINTER', 'F', 'S', 'W', 'SP']):
+            year_match = re.search(r'20(24|25|26)', batch_text)
+            if year_match:
+                year = int(year_match.group(0))
+                # Only accept if it's 2024, 2025, or 2026
+                if year in [2024, 2025, 2026]:
+                    return True
+
+    # Everything else is excluded
+    return False
+
+
+def extract_batch_year(response):
+    """Extract the batch/year information from the company page - COMPREHENSIVE"""
+    # Check page text - look for target batch patterns
+    page_text = response.text[:100000]  # Check more text for better detection
+
+    # Target batch patterns - comprehensive matching
+    target_patterns = [
+        r'(Winter|Fall|Summer|Spring)\s+20(24|25|26)',  # Full names: Winter 2026, Fall 2025, etc.
+        r'(W|F|S|SP)(24|25|26)',  # Batch codes: W26, F25, S25, W25, F24, S24
+        r'20(24|25|26)',  # Years: 2024, 2025, 2026
+    ]
+
+    for pattern in target_patterns:
+        matches = re.findall(pattern, page_text, re.IGNORECASE)
+        if matches:
+            # Get the full match, not just groups
+            full_match = re.search(pattern, page_text, re.IGNORECASE)
+            if full_match:
+                batch = full_match.group(0)
+                if is_target_batch(batch):
+                    return batch.upper()
+
+    # Try CSS selectors for batch information
+    batch_selectors = [
+        '[class*="batch"]::text',
+        '[data-batch]::attr(data-batch)',
+        '[class*="Batch"]::text',
+        '[class*="BATCH"]::text',
+        'span::text',  # Sometimes batch is in a span
+        'div::text',   # Sometimes batch is in a div
+    ]
+
+    for selector in batch_selectors:
+        try:
+            batch_elements = response.css(selector).getall()
+            for elem in batch_elements:
+                if elem:
+                    elem_text = elem.strip().upper()
+                    # Check if this text contains a target batch
+                    if is_target_batch(elem_text):
+                        return elem_text
+                    # Also check if it contains batch patterns
+                    for pattern in target_patterns:
+                        match = re.search(pattern, elem_text, re.IGNORECASE)
+                        if match:
+                            batch = match.group(0)
+                            if is_target_batch(batch):
+                                return batch.upper()
+        except:
+            continue
+
+    return ''
+
+
+def extract_company_detail(response, batch_from_card=None, company_name=None, batches=None):
+    """Extract a company detail page into a plain dict.
+
+    ``status`` is 'ok' for target-batch companies, otherwise 'pre_2024', 'no_batch'
+    or 'off_target' and only ``batch`` is filled in. With ``batches`` (canonical
+    names, see normalize_batch) only those exact batches are 'ok'.
+    """
+    result = {'status': 'ok', 'batch': '', 'company_name': company_name or ''}
+
+    # EARLY FILTERING: If we already know it's pre-2024 from listing, skip immediately
+    if batch_from_card == 'PRE_2024':
+        result['status'] = 'pre_2024'
+        return result
+
+    # Extract batch from page quickly and filter
+    batch_text = extract_batch_year(response)
+    result['batch'] = batch_text
+
+    # FILTERING: Only target batches - skip everything else
+    if not batch_text:
+        result['status'] = 'no_batch'  # No batch found - skip it (STRICT)
+        return result
+    if not is_target_batch(batch_text):
+        result['status'] = 'off_target'
+        return result
+    if batches:
+        # Bare years ('2025') don't say which batch - fall back to the listing's batch
+        batch = normalize_batch(batch_text) or normalize_batch(batch_from_card)
+        if batch not in batches:
+            result['status'] = 'off_target'
+            return result
+        result['batch'] = batch
+
+    # Extract company name if not already set
+    if not company_name:
+        company_name = (
+            response.css('h1::text, h2::text, [class*="company-name"]::text, [class*="CompanyName"]::text').get() or
+            response.css('title::text').get()
+        )
+        if company_name:
+            result['company_name'] = company_name.strip().replace(' | Y Combinator', '').strip()
+
+    # Extract company website - look for the actual company website link
+    # Exclude YC, social media, and other common non-company links
+    excluded_domains = [
+        'ycombinator.com', 'linkedin.com', 'twitter.com', 'x.com', 
+        'startupschool.org', 'bookface-static.ycombinator.com',
+        'bookface-images.s3', 'facebook.com', 'instagram.com',
+        'youtube.com', 'google.com', 'maps.googleapis.com'
+    ]
+
+    company_website = ''
+
+    # Try to find website link near company name/section
+    # Look for links that are clearly the company's main website
+    website_selectors = [
+        'a[href^="http"]:not([href*="ycombinator"]):not([href*="linkedin"]):not([href*="twitter"]):not([href*="x.com"]):not([href*="startupschool"]):not([href*="bookface"]):not([href*="facebook"]):not([href*="instagram"]):not([href*="youtube"]):not([href*="maps"])::attr(href)',
+        '[data-website]::attr(data-website)',
+        '.website a::attr(href)',
+        'a.website::attr(href)',
+        'a[href*="http"]:not([href*="ycombinator"]):not([href*="linkedin"]):not([href*="twitter"]):not([href*="x.com"]):not([href*="startupschool"]):not([href*="bookface"])::attr(href)'
+    ]
+
+    for selector in website_selectors:
+        links = response.css(selector).getall()
+        for link in links:
+            if link and link.startswith('http'):
+                # Check if it's not in excluded domains
+                is_excluded = any(domain in link.lower() for domain in excluded_domains)
+                if not is_excluded:
+                    company_website = link
+                    break
+        if company_website:
+            break
+
+    # Extract founder information - PRIMARY METHOD: Extract from LinkedIn URL slugs
+    # One Founder record per person, in page order, so name and links stay together
+    founders = []
+    used_twitter = set()
+
+    # Get all unique LinkedIn links
+    linkedin_urls = response.css('a[href*="linkedin.com/in/"]::attr(href)').getall()
+    linkedin_urls = [url for url in linkedin_urls if url and 'ycombinator.com' not in url]
+
+    # Remove duplicates while preserving order
+    seen_urls = set()
+    unique_linkedin_urls = []
+    for url in linkedin_urls:
+        # Normalize URL (remove query params, trailing slash)
+        normalized = url.split('?')[0].rstrip('/')
+        if normalized not in seen_urls:
+            seen_urls.add(normalized)
+            unique_linkedin_urls.append(normalized)
+
+    # Removed debug logging for speed
+
+    # PRIMARY METHOD: Extract names from LinkedIn URL slugs
+    # LinkedIn URLs like "linkedin.com/in/emre-kaplaner-7b3a3b15b/" contain the name in the slug
+    for linkedin_url in unique_linkedin_urls:
+        # Extract username from LinkedIn URL: linkedin.com/in/username or linkedin.com/in/username-ID
+        match = re.search(r'linkedin\.com/in/([^/?]+)', linkedin_url, re.IGNORECASE)
+        if match:
+            slug = match.group(1)
+            # Remove ID suffix - LinkedIn IDs are often alphanumeric strings at the end
+            # Pattern: name-name-XXXXXXXX where X is alphanumeric (usually 8+ chars)
+
+            slug_parts = slug.split('-')
+            name_parts = []
+
+            # Work forwards and stop when we hit an ID-like part
+            for part in slug_parts:
+                # Check if this part looks like an ID:
+                # - All digits and longer than 6 chars
+                # - Alphanumeric mix with numbers and length >= 8
+                # - Contains mostly numbers (like "30574a1b0")
+                is_id = False
+
+                # More aggressive ID detection
+                if part.isdigit() and len(part) > 6:
+                    is_id = True
+                elif len(part) >= 8:
+                    # Long alphanumeric strings are likely IDs
+                    has_digits = any(c.isdigit() for c in part)
+                    has_letters = any(c.isalpha() for c in part)
+
+                    if has_digits and has_letters:
+                        # Alphanumeric ID pattern (mix of letters and numbers)
+                        digit_count = sum(1 for c in part if c.isdigit())
+                        # If more than 30% digits, likely an ID
+                        if digit_count / len(part) > 0.3:
+                            is_id = True
+                        # Also check if it looks like a hash (9+ chars with digits and letters)
+                        elif len(part) >= 9 and digit_count >= 3:
+                            is_id = True
+                    elif has_digits and len(part) >= 7:
+                        # Mostly numeric
+                        is_id = True
+                elif len(part) >= 6 and part.isalnum() and any(c.isdigit() for c in part):
+                    # Shorter alphanumeric with numbers might be ID
+                    digit_count = sum(1 for c in part if c.isdigit())
+                    if part[0].isdigit() or (digit_count / len(part) > 0.4):
+                        is_id = True
+
+                # Additional check: if part is all lowercase and has numbers, likely an ID
+                if not is_id and part.islower() and any(c.isdigit() for c in part) and len(part) >= 7:
+                    digit_count = sum(1 for c in part if c.isdigit())
+                    if digit_count >= 3:  # At least 3 digits in a lowercase+number mix is suspicious
+                        is_id = True
+
+                if is_id:
+                    # Found an ID, stop collecting (everything before this is the name)
+                    break
+                else:
+                    name_parts.append(part)
+
+            # Filter out very short single-character parts unless it's a middle initial
+            if len(name_parts) > 1:
+                # Remove single char parts unless they're in the middle (likely initials)
+                filtered_parts = []
+                for idx, part in enumerate(name_parts):
+                    if len(part) == 1 and idx > 0 and idx < len(name_parts) - 1:
+                        # Middle initial - keep it
+                        filtered_parts.append(part)
+                    elif len(part) > 1:
+                        filtered_parts.append(part)
+                    elif len(name_parts) <= 2:
+                        # Very short name, keep all parts
+                        filtered_parts.append(part)
+                name_parts = filtered_parts if filtered_parts else name_parts
+
+            # Need at least 2 parts for a full name, but accept single if it looks like a name
+            if len(name_parts) >= 2:
+                name = ' '.join(part.capitalize() for part in name_parts)
+                name = name.strip()  # Clean any extra spaces
+            elif len(name_parts) == 1 and len(name_parts[0]) >= 4:
+                # Single word but long enough - might be a valid single name
+                name = name_parts[0].capitalize()
+            else:
+                name = None
+
+            # Validate and clean the name
+            if name:
+                original_name = name
+                # ONLY remove trailing numbers from the LAST word (e.g., "Jha37" -> "Jha")
+                # Don't touch multi-word names - they're likely correct
+                words = name.split()
+                if len(words) == 1 and any(c.isdigit() for c in words[0]):
+                    # Single word with digits - remove trailing digits
+                    name = re.sub(r'(\w+)\d{2,}$', r'\1', name)
+                name = name.strip()
+
+                if is_valid_name(name, [f.name for f in founders]):
+                    container = _founder_container(response, linkedin_url,
+                                                   './ancestor::div[position()<=4][1] | ./ancestor::section[position()<=3][1]')
+                    founders.append(Founder(name, linkedin_url, _founder_twitter(container, used_twitter)))
+
+    # FALLBACK: LinkedIn links we couldn't get a name from - try a heading in the same card
+    named = set(f.linkedin for f in founders)
+    for linkedin_url in unique_linkedin_urls:
+        if linkedin_url in named:
+            continue
+        container_elem = _founder_container(
+            response, linkedin_url,
+            './ancestor::div[position()<=5][1] | ./ancestor::section[position()<=3][1] | ./ancestor::article[1]')
+        if container_elem is None:
+            continue
+        # Look for heading in this container (skip section titles)
+        headings = container_elem.xpath('.//h1 | .//h2 | .//h3 | .//h4 | .//h5')
+        for heading in headings[:3]:
+            heading_text = heading.xpath('.//text()').get()
+            if heading_text:
+                heading_text = heading_text.strip()
+                # Skip section titles
+                skip_phrases = ['tl;dr', 'our ask', 'our story', 'why we', 'problem:', 'solution:', 
+                               'the knowledge', 'we are working', 'founders', 'active founders']
+                if any(skip in heading_text.lower() for skip in skip_phrases):
+                    continue
+                if is_valid_name(heading_text, [f.name for f in founders]):
+                    founders.append(Founder(heading_text, linkedin_url, _founder_twitter(container_elem, used_twitter)))
+                    break
+
+    # Final cleanup of founder names - REMOVED aggressive cleanup that was truncating valid names
+    # Only remove trailing digits from single words (e.g., "Jha37" -> "Jha")
+    cleaned_founders = []
+    cleaned_names = set()
+    for founder in founders:
+        cleaned = founder.name.strip()
+        # Only remove trailing digits from single-word names with digits
+        words = cleaned.split()
+        if len(words) == 1 and any(c.isdigit() for c in words[0]):
+            # Single word with digits - remove trailing 2+ digits
+            cleaned = re.sub(r'(\w+)\d{2,}$', r'\1', cleaned).strip()
+
+        if cleaned and cleaned not in cleaned_names:
+            cleaned_names.add(cleaned)
+            founder.name = cleaned
+            cleaned_founders.append(founder)
+
+
+    result['company_website'] = company_website.strip() if company_website else ''
+    result['founders'] = cleaned_founders
+    return result
+
+
+def _founder_container(response, linkedin_url, xpath):
+    """The founder card around a LinkedIn link, or None"""
+    for elem in response.css('a[href*="linkedin.com/in/"]'):
+        href = elem.css('::attr(href)').get() or ''
+        if href.split('?')[0].rstrip('/') == linkedin_url:
+            container = elem.xpath(xpath)
+            return container[0] if container else None
+    return None
+
+
+def _founder_twitter(container, used):
+    """First Twitter/X link in a founder card that isn't YC's or another founder's"""
+    if container is None:
+        return ''
+    for twitter in container.css('a[href*="twitter.com/"]::attr(href), a[href*="x.com/"]::attr(href)').getall():
+        if 'ycombinator' not in twitter.lower() and twitter not in used:
+            used.add(twitter)
+            return twitter
+    return ''
+
+
+def extract_from_body(url, body, encoding=None, batch_from_card=None, batches=None):
+    """Process-pool entry point: rebuild the response from raw bytes and extract it"""
+    response = HtmlResponse(url=url, body=body, encoding=encoding or 'utf-8')
+    return extract_company_detail(response, batch_from_card, batches=batches)
@@ -0,0 +1,208 @@
+"""Shared crawl frontier for distributed runs.
+
+One coordinator renders the listing and pushes company URLs into the frontier;
+any number of workers (processes, or machines sharing the backend) lease URLs,
+parse the detail pages and store their items back for a final merge:
+
+    scrapy crawl yc_companies -a role=coordinator
+    scrapy crawl yc_companies -a role=worker          # start N of these
+    python -m yc_scraper.frontier merge --output yc_companies.xlsx
+
+The frontier's primary key is the company key, so it doubles as the shared
+dedup set. Backends are pluggable through FRONTIER_BACKEND; SQLiteFrontier
+(one file - one machine or a shared volume) is the default.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+
+class FrontierBackend:
+    """Interface for frontier backends (queue + dedup set + item store)"""
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get('FRONTIER_URI'), max_attempts=settings.getint('FRONTIER_MAX_ATTEMPTS', 3))
+
+    def push(self, key, url, batch_hint=None, priority=0):
+        """Queue a company - returns False if the key was already seen by any node"""
+        raise NotImplementedError
+
+    def lease(self, worker_id, count, lease_seconds):
+        """Hand out up to ``count`` queued (or lease-expired) entries as dicts: key, url, batch_hint, priority"""
+        raise NotImplementedError
+
+    def ack(self, key):
+        """Entry fully processed"""
+        raise NotImplementedError
+
+    def fail(self, key, reason=''):
+        """Entry failed on a worker - requeue it until FRONTIER_MAX_ATTEMPTS"""
+        raise NotImplementedError
+
+    def add_item(self, key, item):
+        """Store a scraped item (a plain dict) for the merge step"""
+        raise NotImplementedError
+
+    def iter_items(self):
+        raise NotImplementedError
+
+    def mark_discovery_done(self):
+        raise NotImplementedError
+
+    def is_discovery_done(self):
+        raise NotImplementedError
+
+    def counts(self):
+        """Entry counts per state: queued, leased, done, failed"""
+        raise NotImplementedError
+
+    def is_drained(self):
+        """True when discovery has finished and nothing is queued or leased"""
+        counts = self.counts()
+        return self.is_discovery_done() and not counts.get('queued') and not counts.get('leased')
+
+    def close(self):
+        pass
+
+
+class SQLiteFrontier(FrontierBackend):
+    """Frontier in a single SQLite file - WAL mode lets many processes share it"""
+
+    def __init__(self, path='frontier.sqlite3', max_attempts=3):
+        self.path = path or 'frontier.sqlite3'
+        self.max_attempts = max_attempts
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS frontier (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                batch_hint TEXT,
+                priority INTEGER DEFAULT 0,
+                state TEXT DEFAULT 'queued',
+                leased_by TEXT,
+                lease_until REAL DEFAULT 0,
+                attempts INTEGER DEFAULT 0,
+                last_error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, priority);
+            CREATE TABLE IF NOT EXISTS items (key TEXT PRIMARY KEY, data TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+        ''')
+
+    def push(self, key, url, batch_hint=None, priority=0):
+        cursor = self.conn.execute(
+            'INSERT OR IGNORE INTO frontier (key, url, batch_hint, priority) VALUES (?, ?, ?, ?)',
+            (key, url, batch_hint, priority))
+        return cursor.rowcount == 1
+
+    def lease(self, worker_id, count, lease_seconds):
+        now = time.time()
+        # IMMEDIATE takes the write lock up front so two workers never lease the same rows
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute(
+                '''SELECT key, url, batch_hint, priority FROM frontier
+                   WHERE state = 'queued' OR (state = 'leased' AND lease_until < ?)
+                   ORDER BY priority DESC LIMIT ?''', (now, count)).fetchall()
+            self.conn.executemany(
+                "UPDATE frontier SET state = 'leased', leased_by = ?, lease_until = ?, attempts = attempts + 1 WHERE key = ?",
+                [(worker_id, now + lease_seconds, row[0]) for row in rows])
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return [{'key': r[0], 'url': r[1], 'batch_hint': r[2], 'priority': r[3]} for r in rows]
+
+    def ack(self, key):
+        self.conn.execute("UPDATE frontier SET state = 'done', leased_by = NULL WHERE key = ?", (key,))
+
+    def fail(self, key, reason=''):
+        self.conn.execute(
+            '''UPDATE frontier SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+               leased_by = NULL, last_error = ? WHERE key = ?''', (self.max_attempts, reason, key))
+
+    def add_item(self, key, item):
+        self.conn.execute('INSERT OR REPLACE INTO items (key, data) VALUES (?, ?)',
+                          (key, json.dumps(item, ensure_ascii=False)))
+
+    def iter_items(self):
+        for (data,) in self.conn.execute('SELECT data FROM items ORDER BY rowid'):
+            yield json.loads(data)
+
+    def mark_discovery_done(self):
+        self.conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('discovery_done', ?)", (str(time.time()),))
+
+    def is_discovery_done(self):
+        return self.conn.execute("SELECT 1 FROM meta WHERE name = 'discovery_done'").fetchone() is not None
+
+    def counts(self):
+        return dict(self.conn.execute('SELECT state, COUNT(*) FROM frontier GROUP BY state').fetchall())
+
+    def close(self):
+        self.conn.close()
+
+
+def open_frontier(settings):
+    """Instantiate the FRONTIER_BACKEND configured in settings"""
+    from scrapy.utils.misc import load_object
+    return load_object(settings.get('FRONTIER_BACKEND')).from_settings(settings)
+
+
+def merge(frontier, output_file):
+    """Write every item stored by the workers through the normal Excel export"""
+    from yc_scraper.merge import write_excel
+
+    items = list(frontier.iter_items())
+    write_excel(items, output_file)
+    return len(items)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yc_scraper.frontier',
+                                     description='Inspect a distributed crawl frontier and merge its items')
+    parser.add_argument('command', choices=['status', 'merge', 'reset'])
+    parser.add_argument('--output', default=None, help='merge: output file (default EXCEL_OUTPUT_FILE)')
+    parser.add_argument('-s', '--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='override a setting, e.g. -s FRONTIER_URI=/shared/frontier.sqlite3')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'yc_scraper.settings')
+    from scrapy.utils.project import get_project_settings
+    settings = get_project_settings()
+    for override in args.set:
+        name, _, value = override.partition('=')
+        settings.set(name, value, priority='cmdline')
+
+    if args.command == 'reset':
+        path = settings.get('FRONTIER_URI')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        print(f'Removed frontier {path}')
+        return 0
+
+    frontier = open_frontier(settings)
+    try:
+        if args.command == 'status':
+            counts = frontier.counts()
+            print(f"Discovery done: {'yes' if frontier.is_discovery_done() else 'no'}")
+            for state in ('queued', 'leased', 'done', 'failed'):
+                print(f'  {state}: {counts.get(state, 0)}')
+        else:
+            output = args.output or settings.get('EXCEL_OUTPUT_FILE')
+            count = merge(frontier, output)
+            print(f'✅ Merged {count} companies into {output}')
+    finally:
+        frontier.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
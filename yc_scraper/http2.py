@@ -0,0 +1,261 @@
+"""HTTP/2 for the YC host, HTTP/1.1 for everything else.
+
+Detail pages all come from www.ycombinator.com. Over HTTP/1.1 every concurrent
+request needs its own TCP+TLS connection, so a few hundred in flight means a
+few hundred handshakes - and DOWNLOAD_TIMEOUT firing while they queue up. With
+HTTP2_ENABLED, RoutingDownloadHandler sends https requests for HTTP2_HOSTS over
+HTTP2_CONNECTIONS_PER_HOST multiplexed connections (Scrapy's H2DownloadHandler,
+which needs `pip install h2`) and leaves every other request on HTTP/1.1.
+
+Both paths count the connections they open (downloader/connections_opened/*),
+so reuse shows up as downloader/requests_per_connection at the end of a crawl.
+HTTP/2 streams also send the headers_received/bytes_received signals, which
+Scrapy's own HTTP/2 client leaves out, so StopDownload (early_abort.py) works
+over both protocols. That means subclassing private Scrapy HTTP/2 classes, so
+requirements.txt pins the tested Scrapy minor; if those internals are missing
+anyway, the stock H2DownloadHandler is used with a warning.
+Compression needs nothing here - HttpCompressionMiddleware already negotiates
+gzip/deflate, plus br when `brotli` is installed.
+"""
+
+import itertools
+import logging
+from collections import deque
+
+import scrapy
+from scrapy import signals
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+from scrapy.exceptions import StopDownload
+from scrapy.responsetypes import responsetypes
+from scrapy.http import Request
+from scrapy.utils.httpobj import urlparse_cached
+from twisted.internet.defer import Deferred
+from twisted.internet.interfaces import ILoggingContext, IProtocolFactory
+from twisted.python.failure import Failure
+from twisted.web.client import URI
+from zope.interface import implementer_only
+
+logger = logging.getLogger(__name__)
+
+try:
+    from h2.errors import ErrorCodes
+    from scrapy.core.downloader.handlers.http2 import H2DownloadHandler
+    from scrapy.core.http2.agent import H2ConnectionPool
+    from scrapy.core.http2.protocol import H2ClientFactory, H2ClientProtocol
+    from scrapy.core.http2.stream import Stream
+except ImportError:  # h2 is optional
+    H2DownloadHandler = None
+else:
+    class _SignalingStream(Stream):
+        """Stream that sends headers_received and bytes_received like the HTTP/1.1 handler.
+
+        A StopDownload from a handler cancels the stream (RST_STREAM) and delivers what
+        arrived so far, flagged 'download_stopped' - or as the exception's response with fail=True.
+        """
+
+        def __init__(self, *args, crawler, spider, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._crawler = crawler
+            self._spider = spider
+
+        def receive_headers(self, headers):
+            super().receive_headers(headers)
+            if not self.metadata['stream_closed_server']:  # Not cancelled for DOWNLOAD_MAXSIZE
+                self._send_signal(signals.headers_received, headers=self._response['headers'],
+                                  body_length=int(self._response['headers'].get(b'Content-Length', -1)))
+
+        def receive_data(self, data, flow_controlled_length):
+            super().receive_data(data, flow_controlled_length)
+            if not self.metadata['stream_closed_server']:
+                self._send_signal(signals.bytes_received, data=data)
+
+        def _send_signal(self, signal, **kwargs):
+            results = self._crawler.signals.send_catch_log(signal=signal, request=self._request,
+                                                           spider=self._spider, **kwargs)
+            for handler, result in results:
+                if isinstance(result, Failure) and isinstance(result.value, StopDownload):
+                    logger.debug('Download stopped for %(request)s from signal handler %(handler)s',
+                                 {'request': self._request, 'handler': handler.__qualname__})
+                    self._stop_download(result)
+                    return
+
+        def _stop_download(self, failure):
+            body = self._response['body'].getvalue()
+            self.metadata['stream_closed_local'] = True
+            self.metadata['stream_closed_server'] = True
+            self._protocol.conn.reset_stream(self.stream_id, ErrorCodes.CANCEL)
+            self._protocol.pop_stream(self.stream_id)  # Frames still in flight for it are ignored
+            headers = self._response['headers']
+            response = responsetypes.from_args(headers=headers, url=self._request.url, body=body)(
+                url=self._request.url,
+                status=int(headers[':status']),
+                headers=headers,
+                body=body,
+                flags=['download_stopped'],
+                request=self._request,
+                certificate=self._protocol.metadata['certificate'],
+                ip_address=self._protocol.metadata['ip_address'],
+                protocol='h2',
+            )
+            if failure.value.fail:
+                failure.value.response = response
+                self._deferred_response.errback(failure)
+            else:
+                self._deferred_response.callback(response)
+
+    class _H2ClientProtocol(H2ClientProtocol):
+        def __init__(self, uri, settings, conn_lost_deferred, crawler):
+            super().__init__(uri, settings, conn_lost_deferred)
+            self._crawler = crawler
+
+        def _new_stream(self, request, spider):
+            # H2ClientProtocol._new_stream with _SignalingStream
+            stream = _SignalingStream(
+                stream_id=next(self._stream_id_generator),
+                request=request,
+                protocol=self,
+                download_maxsize=getattr(spider, 'download_maxsize', self.metadata['default_download_maxsize']),
+                download_warnsize=getattr(spider, 'download_warnsize', self.metadata['default_download_warnsize']),
+                crawler=self._crawler,
+                spider=spider,
+            )
+            self.streams[stream.stream_id] = stream
+            return stream
+
+    @implementer_only(IProtocolFactory, ILoggingContext)
+    class _H2ClientFactory(H2ClientFactory):
+        """H2ClientFactory without IProtocolNegotiationFactory, building _H2ClientProtocol.
+
+        H2Agent already puts ALPN 'h2' on the TLS context. Advertised by the factory
+        too, Twisted sets it again on a context that has created a connection, which
+        recent pyOpenSSL refuses - and the handshake never starts.
+        """
+
+        def __init__(self, uri, settings, conn_lost_deferred, crawler):
+            super().__init__(uri, settings, conn_lost_deferred)
+            self.crawler = crawler
+
+        def buildProtocol(self, addr):
+            return _H2ClientProtocol(self.uri, self.settings, self.conn_lost_deferred, self.crawler)
+
+    class _H2ConnectionPool(H2ConnectionPool):
+        def __init__(self, reactor, settings, crawler):
+            super().__init__(reactor, settings)
+            self.crawler = crawler
+
+        def _new_connection(self, key, uri, endpoint):
+            # H2ConnectionPool._new_connection with _H2ClientFactory
+            self._pending_requests[key] = deque()
+            conn_lost_deferred = Deferred()
+            conn_lost_deferred.addCallback(self._remove_connection, key)
+            conn_d = endpoint.connect(_H2ClientFactory(uri, self.settings, conn_lost_deferred, self.crawler))
+            conn_d.addCallback(self.put_connection, key)
+            d = Deferred()
+            self._pending_requests[key].append(d)
+            return d
+
+    def _missing_h2_internals(handler):
+        """Private Scrapy HTTP/2 names the classes above use that this Scrapy lacks - [] if all are there"""
+        pool = getattr(handler, '_pool', None)
+        if pool is None:
+            return ['H2DownloadHandler._pool']
+        missing = [f'H2ConnectionPool.{name}' for name in ('_new_connection', '_remove_connection', 'put_connection',
+                                                           '_pending_requests', 'settings')
+                   if not hasattr(pool, name)]
+        missing += [f'H2ClientProtocol.{name}' for name in ('_new_stream', 'pop_stream') if not hasattr(H2ClientProtocol, name)]
+        try:
+            # Offline probes - nothing connects, but __init__ signatures and instance attributes show up
+            uri = URI.fromBytes(b'https://www.ycombinator.com/')
+            factory = H2ClientFactory(uri, pool.settings, Deferred())
+            protocol = H2ClientProtocol(factory.uri, factory.settings, factory.conn_lost_deferred)
+            stream = Stream(stream_id=1, request=Request('https://www.ycombinator.com/'), protocol=protocol,
+                            download_maxsize=0, download_warnsize=0)
+        except Exception as e:
+            return missing + [f'H2 client constructors ({e})']
+        missing += [f'H2ClientProtocol.{name}' for name in ('metadata', 'conn', 'streams', '_stream_id_generator')
+                    if not hasattr(protocol, name)]
+        missing += [f'Stream.{name}' for name in ('metadata', '_response', '_deferred_response', '_protocol', '_request')
+                    if not hasattr(stream, name)]
+        return missing
+
+
+class RoutingDownloadHandler:
+    """Download handler for https (and http): HTTP/2 for HTTP2_HOSTS, HTTP/1.1 otherwise"""
+
+    lazy = False
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.stats = crawler.stats
+        self.http11 = HTTP11DownloadHandler.from_crawler(crawler)
+        self._count_connections(self.http11._pool, '_newConnection', 'http11')
+        self.hosts = {host.lower() for host in settings.getlist('HTTP2_HOSTS')}
+        self.h2 = []
+        if settings.getbool('HTTP2_ENABLED') and self.hosts:
+            if H2DownloadHandler is None:
+                print('WARNING: HTTP2_ENABLED needs `pip install h2` - downloading over HTTP/1.1')
+            else:
+                self._start_h2(crawler)
+        self._next_h2 = itertools.cycle(self.h2)
+        crawler.signals.connect(self.spider_closed, signal=signals.spider_closed)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def _start_h2(self, crawler):
+        from twisted.internet import reactor
+
+        settings = crawler.settings
+        # Each handler has its own pool, and a pool keeps one connection per host
+        for _ in range(max(1, settings.getint('HTTP2_CONNECTIONS_PER_HOST', 2))):
+            self.h2.append(H2DownloadHandler.from_crawler(crawler))
+        missing = _missing_h2_internals(self.h2[0])
+        if missing:
+            # Another Scrapy than requirements.txt pins - its own client, without signals or connection counts
+            message = (f"Scrapy {scrapy.__version__} lacks the HTTP/2 internals yc_scraper.http2 patches "
+                       f"({', '.join(missing)}) - using Scrapy's stock HTTP/2 handler; early abort stays HTTP/1.1-only")
+            print(f'WARNING: {message}')
+            logger.warning(message)
+            if self.stats is not None:
+                self.stats.set_value('downloader/http2_stock_handler', 1)
+        else:
+            for handler in self.h2:
+                handler._pool = _H2ConnectionPool(reactor, settings, crawler)
+                self._count_connections(handler._pool, '_new_connection', 'http2')
+        print(f"HTTP/2 for {', '.join(sorted(self.hosts))} over {len(self.h2)} connections per host")
+
+    def _count_connections(self, pool, method, protocol):
+        """Wrap the pool's new-connection method - it only runs when no idle connection can be reused"""
+        new_connection = getattr(pool, method)
+
+        def counted(*args, **kwargs):
+            if self.stats is not None:
+                self.stats.inc_value(f'downloader/connections_opened/{protocol}')
+            return new_connection(*args, **kwargs)
+
+        setattr(pool, method, counted)
+
+    def download_request(self, request, spider):
+        parsed = urlparse_cached(request)
+        # Scrapy's HTTP/2 client needs TLS (ALPN) - plain http always stays on HTTP/1.1
+        if self.h2 and parsed.scheme == 'https' and (parsed.hostname or '').lower() in self.hosts:
+            protocol, handler = 'http2', next(self._next_h2)
+        else:
+            protocol, handler = 'http11', self.http11
+        if self.stats is not None:
+            self.stats.inc_value(f'downloader/requests/{protocol}')
+        return handler.download_request(request, spider)
+
+    def spider_closed(self, spider):
+        if self.stats is None:
+            return
+        requests = sum(self.stats.get_value(f'downloader/requests/{p}', 0) for p in ('http2', 'http11'))
+        opened = sum(self.stats.get_value(f'downloader/connections_opened/{p}', 0) for p in ('http2', 'http11'))
+        if opened:
+            self.stats.set_value('downloader/requests_per_connection', round(requests / opened, 1))
+
+    def close(self):
+        for handler in self.h2:
+            handler.close()
+        return self.http11.close()
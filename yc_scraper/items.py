@@ -3,14 +3,31 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
+from dataclasses import dataclass
+
 import scrapy
 
 
+@dataclass
+class Founder:
+    """One founder - name and profile links stay together (empty string when missing)"""
+    __slots__ = ('name', 'linkedin', 'twitter')
+    name: str
+    linkedin: str
+    twitter: str
+
+    @classmethod
+    def coerce(cls, value):
+        """Founder from a Founder or the dict it becomes in feeds/JSON (merge, frontier)"""
+        if isinstance(value, cls):
+            return value
+        return cls(value.get('name') or '', value.get('linkedin') or '', value.get('twitter') or '')
+
+
 class YcCompanyItem(scrapy.Item):
     # define the fields for your item here like:
     company_name = scrapy.Field()
     company_website = scrapy.Field()
-    founders_name = scrapy.Field()
-    founders_linkedin = scrapy.Field()
-    founders_twitter = scrapy.Field()
-
+    founders = scrapy.Field()  # list[Founder], in page order
+    batch = scrapy.Field()  # Canonical batch name, e.g. 'Winter 2026'
+    company_slug = scrapy.Field()  # /companies/<slug> - dedup/merge key, not exported
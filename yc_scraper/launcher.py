@@ -0,0 +1,148 @@
+"""Sharded crawl: one yc_companies process per target batch, then a merge.
+
+Each batch is crawled by its own ``scrapy crawl yc_companies -a batches=<batch>``
+process (own reactor, own browser for the listing) writing a JSON-lines shard;
+when all shards are in, merge.py dedupes them by company slug and writes the
+final workbook. Each shard also gets its own copy of LISTING_SNAPSHOT_FILE,
+merged back into the shared one at the end, so shards never overwrite each
+other's listing snapshots:
+
+    python -m yc_scraper.launcher
+    python -m yc_scraper.launcher --batches W26 F25 --jobs 2 --parquet yc_companies.parquet
+    python -m yc_scraper.launcher -- -a start_url=http://127.0.0.1:8000/companies
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from yc_scraper.extraction import TARGET_BATCHES, normalize_batch
+from yc_scraper.merge import dedupe, read_shards, write_excel, write_parquet
+from yc_scraper.snapshots import ListingSnapshots
+
+
+def shard_name(batch):
+    return batch.lower().replace(' ', '-')
+
+
+def crawl_setting(name, extra_args):
+    """A setting as the shard crawls will see it - a `-s NAME=value` in the extra arguments wins"""
+    value = None
+    for i, arg in enumerate(extra_args):
+        if arg in ('-s', '--set') and i + 1 < len(extra_args):
+            option = extra_args[i + 1]
+        elif arg.startswith('--set='):
+            option = arg[len('--set='):]
+        elif arg.startswith('-s'):
+            option = arg[2:]  # -sNAME=value
+        else:
+            continue
+        if option.startswith(f'{name}='):
+            value = option.split('=', 1)[1]
+    if value is not None:
+        return value
+    from scrapy.utils.project import get_project_settings
+    return get_project_settings().get(name)
+
+
+def snapshot_path(batch, shard_dir):
+    return os.path.join(shard_dir, f'{shard_name(batch)}.snapshots.json')
+
+
+def run_shard(batch, shard_dir, extra_args, snapshot_file=None):
+    """Crawl one batch in a child process - returns (batch, returncode, seconds, shard path)"""
+    name = shard_name(batch)
+    shard = os.path.join(shard_dir, f'{name}.jsonl')
+    log = os.path.join(shard_dir, f'{name}.log')
+    cmd = [
+        sys.executable, '-m', 'scrapy', 'crawl', 'yc_companies',
+        '-a', f'batches={batch}',
+        '-O', shard,
+        '-s', 'EXCEL_OUTPUT_FILE=',  # Shards only - the merge writes the workbook
+        '-s', f'FAILURE_QUEUE_FILE={os.path.join(shard_dir, name + ".failed.jsonl")}',
+        *extra_args,
+    ]
+    if snapshot_file:
+        # A private copy - delta runs read the shared snapshot, and saving can't clobber another shard's
+        shard_snapshot = snapshot_path(batch, shard_dir)
+        if os.path.exists(snapshot_file):
+            shutil.copyfile(snapshot_file, shard_snapshot)
+        elif os.path.exists(shard_snapshot):
+            os.remove(shard_snapshot)
+        cmd += ['-s', f'LISTING_SNAPSHOT_FILE={shard_snapshot}']
+    started = time.time()
+    with open(log, 'w', encoding='utf-8') as f:
+        returncode = subprocess.call(cmd, stdout=f, stderr=subprocess.STDOUT)
+    return batch, returncode, time.time() - started, shard
+
+
+def merge_snapshots(snapshot_file, shard_snapshots):
+    """Fold every shard's listing snapshot back into the shared LISTING_SNAPSHOT_FILE"""
+    snapshots = ListingSnapshots(snapshot_file)
+    for path in shard_snapshots:
+        if os.path.exists(path):
+            snapshots.merge(ListingSnapshots(path))
+    if snapshots.filters:
+        snapshots.save()
+        print(f'Listing snapshot: {len(snapshots.filters)} listings in {snapshot_file}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yc_scraper.launcher',
+                                     description='Crawl each YC batch in its own process and merge the results')
+    parser.add_argument('--batches', nargs='+', default=TARGET_BATCHES,
+                        help='batches to crawl, e.g. W26 "Fall 2025" (default: all target batches)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='crawl processes at a time')
+    parser.add_argument('--shard-dir', default='shards')
+    parser.add_argument('--output', default='yc_companies.xlsx')
+    parser.add_argument('--parquet', default=None, help='also write a Parquet file')
+    parser.add_argument('scrapy_args', nargs='*', help='extra arguments for every crawl (after --)')
+    args = parser.parse_args(argv)
+
+    batches = []
+    for batch in args.batches:
+        normalized = normalize_batch(batch)
+        if normalized not in TARGET_BATCHES:
+            parser.error(f'unknown batch {batch!r} - choose from {", ".join(TARGET_BATCHES)}')
+        if normalized not in batches:
+            batches.append(normalized)
+    jobs = max(1, min(args.jobs, len(batches)))
+    os.makedirs(args.shard_dir, exist_ok=True)
+
+    snapshot_file = crawl_setting('LISTING_SNAPSHOT_FILE', args.scrapy_args)
+
+    print(f'Crawling {len(batches)} batches in {jobs} parallel processes (shards in {args.shard_dir}/)...')
+    started = time.time()
+    shards = []
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_shard, batch, args.shard_dir, args.scrapy_args, snapshot_file)
+                   for batch in batches]
+        for future in futures:
+            batch, returncode, seconds, shard = future.result()
+            if returncode == 0:
+                print(f'✅ {batch}: done in {seconds:.0f}s')
+            else:
+                print(f'❌ {batch}: exited with code {returncode} after {seconds:.0f}s - see {shard[:-6]}.log')
+                failed.append(batch)
+            if os.path.exists(shard):
+                shards.append(shard)  # Partial shards from failed crawls are still merged
+
+    if snapshot_file:
+        merge_snapshots(snapshot_file, [snapshot_path(batch, args.shard_dir) for batch in batches])
+
+    items = list(read_shards(shards))
+    unique = dedupe(items)
+    print(f'All shards finished in {time.time() - started:.0f}s: {len(items)} items, {len(unique)} unique companies')
+    write_excel(unique, args.output)
+    if args.parquet:
+        write_parquet(unique, args.parquet)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
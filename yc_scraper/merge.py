@@ -0,0 +1,98 @@
+"""Merge crawl output shards into the final workbook.
+
+Shards are the JSON-lines feeds written by ``scrapy crawl ... -O shard.jsonl``
+(see launcher.py). Companies are deduplicated by slug before the normal Excel
+export runs; ``--parquet`` additionally writes the raw fields with pandas:
+
+    python -m yc_scraper.merge shards/*.jsonl --output yc_companies.xlsx --parquet yc_companies.parquet
+"""
+
+import argparse
+import json
+import logging
+import sys
+from types import SimpleNamespace
+
+from yc_scraper.atomic import atomic_write
+
+FIELDS = ['company_name', 'company_website', 'batch', 'founders']
+
+
+def read_shards(paths):
+    """Yield item dicts from JSON-lines shards - missing or truncated shards are reported, not fatal"""
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                for number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        print(f'WARNING: skipping malformed line {number} in {path}')
+        except OSError as e:
+            print(f'WARNING: could not read shard {path}: {e}')
+
+
+def company_key(item):
+    """Dedup key: the company slug, falling back to the normalized name"""
+    return item.get('company_slug') or (item.get('company_name') or '').strip().lower()
+
+
+def dedupe(items):
+    """One item per company - when shards overlap, keep the record with the most fields filled"""
+    merged = {}
+    for item in items:
+        key = company_key(item)
+        if not key:
+            continue
+        current = merged.get(key)
+        if current is None or sum(1 for f in FIELDS if item.get(f)) > sum(1 for f in FIELDS if current.get(f)):
+            merged[key] = item
+    return list(merged.values())
+
+
+def write_excel(items, output_file):
+    """Run items through ExcelExportPipeline outside a crawl"""
+    from yc_scraper.pipelines import ExcelExportPipeline
+
+    spider = SimpleNamespace(logger=logging.getLogger('merge'))
+    pipeline = ExcelExportPipeline(output_file=output_file)
+    for item in items:
+        pipeline.process_item(item, spider)
+    pipeline.close_spider(spider)
+
+
+def write_parquet(items, output_file):
+    import pandas as pd
+
+    # founders stays a list of {name, linkedin, twitter} structs
+    df = pd.DataFrame(items, columns=['company_slug'] + FIELDS)
+    try:
+        atomic_write(output_file, lambda path: df.to_parquet(path, index=False))
+    except ImportError as e:
+        print(f'WARNING: Parquet export needs pyarrow or fastparquet ({e})')
+        return False
+    print(f'✅ Saved {len(df)} companies to {output_file}')
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m yc_scraper.merge', description='Merge crawl shards')
+    parser.add_argument('shards', nargs='+', help='JSON-lines shards')
+    parser.add_argument('--output', default='yc_companies.xlsx')
+    parser.add_argument('--parquet', default=None, help='also write a Parquet file')
+    args = parser.parse_args(argv)
+
+    items = list(read_shards(args.shards))
+    unique = dedupe(items)
+    print(f'Merging {len(args.shards)} shards: {len(items)} items, {len(unique)} unique companies')
+    write_excel(unique, args.output)
+    if args.parquet:
+        write_parquet(unique, args.parquet)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,9 +4,35 @@
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
 from scrapy import signals
+from scrapy.downloadermiddlewares.retry import get_retry_request
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest, NotConfigured
 from scrapy.http import HtmlResponse
-from playwright.async_api import async_playwright
+from scrapy.utils.misc import load_object
+from yc_scraper.atomic import atomic_write
+from yc_scraper.browser_memory import BrowserMemoryGovernor
+from yc_scraper.browser_server import CHROMIUM_ARGS, DEFAULT_STATE_FILE, USER_AGENT
+from yc_scraper.browser_server import read_state as read_server_state
+from twisted.internet.defer import CancelledError as DeferCancelledError
+from twisted.internet.defer import Deferred
+from twisted.internet.defer import TimeoutError as DeferTimeoutError
+from twisted.internet.error import (
+    ConnectError,
+    ConnectionDone,
+    ConnectionLost,
+    ConnectionRefusedError,
+    DNSLookupError,
+    TCPTimedOutError,
+    TimeoutError,
+)
+from twisted.python.failure import Failure
+from twisted.web.client import ResponseFailed
+from email.utils import parsedate_to_datetime
+from datetime import datetime
 import asyncio
+import contextlib
+import json
+import os
+import threading
 import time
 
 
@@ -26,6 +52,11 @@ class YcScraperSpiderMiddleware:
         for i in result:
             yield i
 
+    async def process_spider_output_async(self, response, result, spider):
+        # Async callbacks (parse_company_detail_pooled) keep streaming instead of being downgraded
+        async for i in result:
+            yield i
+
     def process_spider_exception(self, response, exception):
         pass
 
@@ -59,36 +90,427 @@ class YcScraperDownloaderMiddleware:
         spider.logger.info('Spider opened: %s' % spider.name)
 
 
+class AdaptiveConcurrencyMiddleware:
+    """AIMD concurrency control per download slot (one slot per host/IP).
+
+    Every slot starts at ADAPTIVE_CONCURRENCY_START and grows by one request per
+    round trip while latency stays under the target. 429/5xx responses, download
+    errors and slow responses cut the window by ADAPTIVE_CONCURRENCY_DECREASE_FACTOR,
+    and a Retry-After header pauses the slot for the advertised time.
+    """
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.max_concurrency = settings.getint('ADAPTIVE_CONCURRENCY_MAX', 128)
+        self.min_concurrency = max(1, settings.getint('ADAPTIVE_CONCURRENCY_MIN', 1))
+        self.start_concurrency = min(self.max_concurrency, settings.getint('ADAPTIVE_CONCURRENCY_START', 8))
+        self.target_latency = settings.getfloat('ADAPTIVE_CONCURRENCY_TARGET_LATENCY', 1.0)
+        self.decrease_factor = settings.getfloat('ADAPTIVE_CONCURRENCY_DECREASE_FACTOR', 0.5)
+        self.max_retry_after = settings.getfloat('ADAPTIVE_CONCURRENCY_MAX_RETRY_AFTER', 60)
+        self.backoff_codes = set(int(code) for code in settings.getlist(
+            'ADAPTIVE_CONCURRENCY_BACKOFF_CODES', [429, 500, 502, 503, 504]))
+        self.base_delay = settings.getfloat('DOWNLOAD_DELAY')
+        self.debug = settings.getbool('ADAPTIVE_CONCURRENCY_DEBUG')
+        self.windows = {}  # slot key -> {'window', 'last_decrease', 'paused_until'}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('ADAPTIVE_CONCURRENCY_ENABLED'):
+            raise NotConfigured
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.request_reached_downloader, signal=signals.request_reached_downloader)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def _get_slot(self, request):
+        key = request.meta.get('download_slot')
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _state(self, key):
+        state = self.windows.get(key)
+        if state is None:
+            state = {'window': float(self.start_concurrency), 'last_decrease': 0.0, 'paused_until': 0.0}
+            self.windows[key] = state
+        return state
+
+    def request_reached_downloader(self, request, spider):
+        """Apply the current window - slots are created (and garbage collected) by the downloader"""
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return
+        slot.concurrency = int(self._state(key)['window'])
+
+    def process_response(self, request, response, spider):
+        key, slot = self._get_slot(request)
+        if slot is None:
+            return response
+
+        retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+        if retry_after:
+            self._pause(key, slot, retry_after)
+
+        latency = request.meta.get('download_latency') or 0.0
+        if response.status in self.backoff_codes:
+            self.stats.inc_value(f'adaptive_concurrency/backoff/{response.status}')
+            self._decrease(key, slot, latency)
+        elif latency > self.target_latency:
+            self.stats.inc_value('adaptive_concurrency/backoff/latency')
+            self._decrease(key, slot, latency)
+        else:
+            self._increase(key, slot)
+        return response
+
+    def process_exception(self, request, exception, spider):
+        key, slot = self._get_slot(request)
+        if slot is not None:
+            self.stats.inc_value('adaptive_concurrency/backoff/exception')
+            self._decrease(key, slot, self.target_latency)
+        return None
+
+    def _increase(self, key, slot):
+        state = self._state(key)
+        now = time.monotonic()
+        if state['paused_until'] and now >= state['paused_until']:
+            # Retry-After pause is over - back to the normal delay
+            state['paused_until'] = 0.0
+            slot.delay = self.base_delay
+        # Additive increase: +1/window per response == +1 per full round trip
+        old = int(state['window'])
+        state['window'] = min(float(self.max_concurrency), state['window'] + 1.0 / state['window'])
+        if int(state['window']) != old:
+            self.stats.inc_value('adaptive_concurrency/increases')
+        self._apply(key, slot, state)
+
+    def _decrease(self, key, slot, latency):
+        state = self._state(key)
+        now = time.monotonic()
+        # Responses already in flight carry the same congestion signal - cut once per round trip
+        if now - state['last_decrease'] < max(latency, self.target_latency):
+            return
+        state['last_decrease'] = now
+        state['window'] = max(float(self.min_concurrency), state['window'] * self.decrease_factor)
+        self.stats.inc_value('adaptive_concurrency/decreases')
+        self._apply(key, slot, state)
+
+    def _pause(self, key, slot, retry_after):
+        state = self._state(key)
+        retry_after = min(retry_after, self.max_retry_after)
+        state['paused_until'] = time.monotonic() + retry_after
+        # Slot delay spaces out requests, so only one probe goes out per Retry-After period
+        slot.delay = max(slot.delay, retry_after)
+        self.stats.inc_value('adaptive_concurrency/retry_after_pauses')
+
+    def _apply(self, key, slot, state):
+        window = int(state['window'])
+        slot.concurrency = window
+        self.stats.set_value(f'adaptive_concurrency/window/{key}', window)
+        self.stats.max_value('adaptive_concurrency/window_max', window)
+        self.stats.min_value('adaptive_concurrency/window_min', window)
+        if self.debug:
+            self.crawler.spider.logger.info(
+                f'AIMD slot {key}: window={window} delay={slot.delay:.2f} transferring={len(slot.transferring)}')
+
+    @staticmethod
+    def _parse_retry_after(value):
+        """Retry-After is either delta-seconds or an HTTP date"""
+        if not value:
+            return 0.0
+        value = value.decode('latin-1').strip() if isinstance(value, bytes) else str(value).strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, retry_at.timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+
+    def spider_closed(self, spider):
+        for key, state in self.windows.items():
+            spider.logger.info(f'Adaptive concurrency for {key}: final window {int(state["window"])}')
+
+
+class FailureQueueMiddleware:
+    """Failure-aware retries - replaces Scrapy's RetryMiddleware.
+
+    Retried requests get a lower priority and a longer download timeout. Requests
+    that run out of retries are parked and re-driven once the main queue drains;
+    anything that still fails is written to FAILURE_QUEUE_FILE so a follow-up
+    ``scrapy crawl yc_companies -a retry_file=failed_urls.jsonl`` can pick it up.
+    """
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.max_retry_times = settings.getint('FAILURE_RETRY_TIMES', 2)
+        self.priority_adjust = settings.getint('FAILURE_RETRY_PRIORITY_ADJUST', -10)
+        self.timeout_factor = settings.getfloat('FAILURE_RETRY_TIMEOUT_FACTOR', 2.0)
+        self.max_timeout = settings.getfloat('FAILURE_RETRY_MAX_TIMEOUT', 30)
+        self.redrive = settings.getbool('FAILURE_REDRIVE_ENABLED', True)
+        self.failure_file = settings.get('FAILURE_QUEUE_FILE', 'failed_urls.jsonl')
+        self.retry_http_codes = set(int(code) for code in settings.getlist('RETRY_HTTP_CODES'))
+        self.exceptions_to_retry = tuple(
+            load_object(exc) if isinstance(exc, str) else exc for exc in settings.getlist('RETRY_EXCEPTIONS'))
+        self.parked = []  # Out of retries - re-driven when the spider goes idle
+        self.permanent = []  # Failed again after re-drive - persisted at close
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler)
+        crawler.signals.connect(middleware.spider_idle, signal=signals.spider_idle)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    @staticmethod
+    def failure_class(exception=None, status=None):
+        """Bucket a download failure for stats: timeout, dns, connect, connection_lost, http_429, http_5xx..."""
+        if status is not None:
+            if status == 429:
+                return 'http_429'
+            if 500 <= status < 600:
+                return 'http_5xx'
+            return f'http_{status}'
+        if isinstance(exception, (TimeoutError, TCPTimedOutError, DeferTimeoutError)):
+            return 'timeout'
+        if isinstance(exception, DNSLookupError):
+            return 'dns'
+        if isinstance(exception, (ConnectionRefusedError, ConnectError)):
+            return 'connect'
+        if isinstance(exception, (ConnectionDone, ConnectionLost, ResponseFailed)):
+            return 'connection_lost'
+        return type(exception).__name__.lower()
+
+    def process_response(self, request, response, spider):
+        if request.meta.get('dont_retry') or response.status not in self.retry_http_codes:
+            return response
+        failure = self.failure_class(status=response.status)
+        self.stats.inc_value(f'failure_queue/class/{failure}')
+        result = self._retry(request, failure, spider)
+        if result is None:
+            return response  # Permanent failure - let HttpErrorMiddleware deal with the response
+        return result
+
+    def process_exception(self, request, exception, spider):
+        if request.meta.get('dont_retry') or not isinstance(exception, self.exceptions_to_retry):
+            return None
+        failure = self.failure_class(exception=exception)
+        self.stats.inc_value(f'failure_queue/class/{failure}')
+        return self._retry(request, failure, spider)
+
+    def _retry(self, request, failure, spider):
+        """Return a retry request, park the request (IgnoreRequest) or None for permanent failures"""
+        retry_request = get_retry_request(
+            request,
+            spider=spider,
+            reason=failure,
+            max_retry_times=self.max_retry_times,
+            priority_adjust=self.priority_adjust,
+        )
+        if retry_request is not None:
+            timeout = request.meta.get('download_timeout') or self.crawler.settings.getfloat('DOWNLOAD_TIMEOUT')
+            retry_request.meta['download_timeout'] = min(self.max_timeout, timeout * self.timeout_factor)
+            self.stats.inc_value('failure_queue/retried')
+            return retry_request
+
+        if self.redrive and not request.meta.get('failure_redrive'):
+            self.parked.append((request, failure))
+            self.stats.inc_value('failure_queue/parked')
+            raise IgnoreRequest(f'Parked for end-of-crawl re-drive ({failure}): {request.url}')
+
+        self.permanent.append((request, failure))
+        self.stats.inc_value('failure_queue/permanent')
+        self.stats.inc_value(f'failure_queue/permanent/{failure}')
+        return None
+
+    def spider_idle(self, spider):
+        """Main queue drained - give parked requests one more round"""
+        if not self.parked:
+            return
+        parked, self.parked = self.parked, []
+        spider.logger.info(f'Re-driving {len(parked)} failed requests at end of crawl')
+        for request, failure in parked:
+            meta = dict(request.meta)
+            meta['failure_redrive'] = True
+            meta.pop('retry_times', None)
+            self.crawler.engine.crawl(request.replace(meta=meta, dont_filter=True))
+            self.stats.inc_value('failure_queue/redriven')
+        raise DontCloseSpider
+
+    def spider_closed(self, spider):
+        """Persist permanent failures for a follow-up -a retry_file= run"""
+        # Anything still parked never got its re-drive (e.g. the crawl was stopped)
+        failures = self.permanent + self.parked
+        if not failures:
+            if getattr(spider, 'retry_file', None) == self.failure_file and os.path.exists(self.failure_file):
+                os.remove(self.failure_file)  # Everything from the retry file succeeded
+            return
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                for request, failure in failures:
+                    f.write(json.dumps({
+                        'url': request.url,
+                        'reason': failure,
+                        'callback': getattr(request.callback, '__name__', None) or 'parse',
+                        'batch_from_card': request.meta.get('batch_from_card'),
+                        'failed_at': datetime.now().isoformat(timespec='seconds'),
+                    }) + '\n')
+
+        try:
+            # The retry file may be the one this run was started from - never leave it half-written
+            atomic_write(self.failure_file, write, sidecar=False)
+            spider.logger.warning(f'{len(failures)} requests failed permanently - saved to {self.failure_file} '
+                                  f'(re-run with -a retry_file={self.failure_file})')
+        except OSError as e:
+            spider.logger.error(f'Could not write {self.failure_file}: {e}')
+
+
+# Installed in the listing page: batches newly added company cards ([href, card text])
+# to the __ycListingLinks binding, so the spider can schedule them mid-scroll
+STREAM_LINKS_JS = """
+() => {
+    const seen = new Set();
+    let pending = [];
+    let timer = null;
+    const collect = root => {
+        const anchors = root.matches && root.matches('a[href*="/companies/"]') ? [root] : [];
+        if (root.querySelectorAll) anchors.push(...root.querySelectorAll('a[href*="/companies/"]'));
+        for (const a of anchors) {
+            const href = a.getAttribute('href') || '';
+            if (!href.includes('companies?') && !seen.has(href)) {
+                seen.add(href);
+                pending.push([href, (a.innerText || '').slice(0, 300)]);
+            }
+        }
+    };
+    const flush = () => {
+        timer = null;
+        if (pending.length) {
+            const batch = pending;
+            pending = [];
+            window.__ycListingLinks(batch);
+        }
+    };
+    collect(document.body);
+    flush();
+    new MutationObserver(records => {
+        for (const record of records) {
+            record.addedNodes.forEach(node => { if (node.nodeType === 1) collect(node); });
+        }
+        if (pending.length && !timer) timer = setTimeout(flush, 100);
+    }).observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+# One [slug, name, batch label] per company card, read straight from the DOM - a few
+# hundred KB for the whole directory instead of the multi-MB serialized page
+LISTING_CARDS_JS = r"""
+() => {
+    const batchPattern = /\b(?:(?:Winter|Summer|Spring|Fall)\s+20\d\d|(?:SP|W|S|F)\d\d)\b/i;
+    const bySlug = new Map();
+    document.querySelectorAll('a[href*="/companies/"]').forEach(a => {
+        const match = (a.getAttribute('href') || '').match(/\/companies\/([^\/?#]+)\/?(?:[?#]|$)/);
+        if (!match) return;
+        const slug = decodeURIComponent(match[1]).toLowerCase();
+        if (slug.length < 2 || /\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json)$/.test(slug)) return;
+        const text = a.innerText || '';
+        const batch = (text.match(batchPattern) || [''])[0];
+        const known = bySlug.get(slug);
+        // Related links ("Jobs", "Founders") come without a batch - the card itself wins
+        if (known && (known[2] || !batch)) return;
+        const nameNode = a.querySelector('[class*="coName"], .name');
+        const name = ((nameNode && nameNode.innerText) || text.split('\n')[0] || '').trim().slice(0, 200);
+        bySlug.set(slug, [slug, name, batch]);
+    });
+    return Array.from(bySlug.values());
+}
+"""
+
+
 class PlaywrightMiddleware:
     """Middleware to handle JavaScript-rendered pages using Playwright Async API - FAST!"""
 
-    def __init__(self):
+    def __init__(self, settings=None, stats=None):
         self.playwright = None
         self.browser = None
         self.context = None
         self._initialized = False
         self._loop = None
+        self._loop_thread = None
+        self._init_lock = None
+        self.stats = stats
+        # Optional shared browser started with `python -m yc_scraper.browser_server start`
+        self.use_server = bool(settings and settings.getbool('PLAYWRIGHT_BROWSER_SERVER'))
+        self.server_endpoint = settings.get('PLAYWRIGHT_CDP_ENDPOINT') if settings else None
+        self.server_state_file = settings.get('PLAYWRIGHT_SERVER_STATE_FILE', DEFAULT_STATE_FILE) if settings else DEFAULT_STATE_FILE
+        self._connected_to_server = False
+        self._server_context_owned = False  # The server had no context, so this crawl made one
+        # Hand company links to the spider while the listing is still scrolling
+        self.stream_links = settings.getbool('PLAYWRIGHT_STREAM_LINKS', True) if settings else True
+        # Delta runs (-a delta=1): stop scrolling once this many already-known companies are rendered
+        self.delta_stop_after_known = settings.getint('DELTA_STOP_AFTER_KNOWN', 20) if settings else 20
+        # 'cards' hands the spider [slug, name, batch] tuples; 'html' serializes the whole page like before
+        self.listing_extraction = settings.get('PLAYWRIGHT_LISTING_EXTRACTION', 'cards') if settings else 'cards'
+        self.debug_html = settings.getbool('PLAYWRIGHT_DEBUG_HTML') if settings else False
+        # Detail pages the spider re-queued with meta render='playwright' (DETAIL_RENDER_FALLBACK)
+        self.detail_render_concurrency = settings.getint('DETAIL_RENDER_CONCURRENCY', 4) if settings else 4
+        self.detail_render_timeout = settings.getfloat('DETAIL_RENDER_TIMEOUT', 8) if settings else 8
+        self.detail_render_wait = settings.getfloat('DETAIL_RENDER_WAIT', 2) if settings else 2
+        self._detail_semaphore = None
+        self._init_failed = False
+        self._detail_pages = []  # Idle pages, reused by the next detail render
+        self._page_renders = {}  # page -> renders it has done, for recycling
+        # Recycles pages/contexts and caps concurrent renders by memory (browser_memory.py)
+        self.memory = None
+        if settings and settings.getbool('PLAYWRIGHT_MEMORY_GOVERNOR', True):
+            self.memory = BrowserMemoryGovernor.from_settings(settings, stats)
+        self.memory_sample_scrolls = settings.getint('PLAYWRIGHT_MEMORY_SAMPLE_SCROLLS', 25) if settings else 25
 
     @classmethod
     def from_crawler(cls, crawler):
-        middleware = cls()
+        middleware = cls(crawler.settings, crawler.stats)
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
         crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
         return middleware
+
+    def spider_opened(self, spider):
+        if self.memory is not None and not self.memory.samples_browser:
+            message = ('PLAYWRIGHT_MEMORY_GOVERNOR is on but psutil is not installed - browser RSS is not sampled, '
+                       'so the context is never recycled and PLAYWRIGHT_MEMORY_BUDGET_MB is not enforced '
+                       '(pip install psutil)')
+            print(f'⚠️ {message}')
+            spider.logger.warning(message)
     
     def _get_event_loop(self):
-        """Get or create event loop for async operations"""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-            return loop
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop
+        """Playwright's asyncio loop, running on its own thread so renders never block the reactor"""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name='playwright-loop', daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    def _run_in_loop(self, coro):
+        """Schedule coro on the Playwright loop - the Deferred fires on the reactor thread with its result"""
+        from twisted.internet import reactor
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_event_loop())
+        deferred = Deferred()
+
+        def done(future):
+            if future.cancelled():
+                reactor.callFromThread(deferred.errback, Failure(DeferCancelledError()))
+            elif future.exception() is not None:
+                reactor.callFromThread(deferred.errback, Failure(future.exception()))
+            else:
+                reactor.callFromThread(deferred.callback, future.result())
+
+        future.add_done_callback(done)
+        return deferred
     
-    def _initialize_playwright(self):
+    async def _initialize_playwright(self):
         """Initialize Playwright using async API - lazy initialization"""
         if self._initialized:
             return True
@@ -96,11 +518,8 @@ class PlaywrightMiddleware:
         try:
             print("Initializing Playwright (async)...")
             
-            # Get event loop
-            self._loop = self._get_event_loop()
-            
             # Run async initialization
-            result = self._loop.run_until_complete(self._async_init_playwright())
+            result = await self._async_init_playwright()
             
             if result:
                 self._initialized = True
@@ -117,33 +536,70 @@ class PlaywrightMiddleware:
     async def _async_init_playwright(self):
         """Async initialization of Playwright"""
         try:
+            # Imported on first listing render - runs that never render a page skip it entirely
+            from playwright.async_api import async_playwright
+
+            started = time.time()
             self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--disable-images',
-                    '--disable-plugins',
-                    '--disable-extensions',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                ]
-            )
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                java_script_enabled=True,
-            )
+            if self.use_server and await self._async_connect_server():
+                self._record_stat('playwright/browser_mode', 'server')
+            else:
+                self.browser = await self.playwright.chromium.launch(
+                    headless=True,
+                    args=CHROMIUM_ARGS,
+                )
+                self.context = await self._new_context()
+                self._record_stat('playwright/browser_mode', 'local')
+            self._record_stat('playwright/init_seconds', round(time.time() - started, 3))
             return True
         except Exception as e:
             print(f"❌ Error in async Playwright init: {e}")
             return False
 
+    async def _new_context(self):
+        return await self.browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent=USER_AGENT,
+            java_script_enabled=True,
+        )
+
+    async def _async_connect_server(self):
+        """Attach to the shared browser - its default context keeps the persistent HTTP cache"""
+        endpoint = self.server_endpoint
+        if not endpoint:
+            state = read_server_state(self.server_state_file)
+            endpoint = state['endpoint'] if state else None
+        if not endpoint:
+            print(f"⚠️ PLAYWRIGHT_BROWSER_SERVER is on but no server found ({self.server_state_file}) - launching a local browser")
+            return False
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(endpoint)
+        except Exception as e:
+            print(f"⚠️ Could not connect to browser server at {endpoint}: {e} - launching a local browser")
+            return False
+        if self.browser.contexts:
+            self.context = self.browser.contexts[0]
+        else:
+            self.context = await self.browser.new_context(user_agent=USER_AGENT)
+            self._server_context_owned = True
+        self._connected_to_server = True
+        if self.memory is not None:
+            state = read_server_state(self.server_state_file)
+            if state and state.get('pid'):
+                self.memory.root_pid = state['pid']  # Chromium is the server's, not a child of this process
+        print(f"✅ Connected to browser server at {endpoint}")
+        return True
+
+    def _record_stat(self, key, value):
+        if self.stats is not None:
+            self.stats.set_value(key, value)
+
     def process_request(self, request, spider):
         """Process request with Playwright for JavaScript pages"""
+        if request.meta.get('render') == 'playwright':
+            # A detail page whose static HTML came back incomplete - see DETAIL_RENDER_FALLBACK
+            return self._run_in_loop(self._async_render_detail(request, spider))
+        
         # ONLY use Playwright for the MAIN companies listing page (NOT individual company pages)
         is_main_listing = (
             request.url == 'https://www.ycombinator.com/companies' or 
@@ -155,41 +611,85 @@ class PlaywrightMiddleware:
         is_company_page = '/companies/' in request.url and request.url != 'https://www.ycombinator.com/companies' and not request.url.endswith('/companies')
         
         if is_main_listing and not is_company_page and 'ycombinator.com' in request.url:
-            # Lazy initialize Playwright only when needed
-            if not self._initialized:
-                if not self._initialize_playwright():
+            # The render runs on the Playwright loop thread; the reactor keeps downloading the
+            # detail pages streamed to the spider while the listing is still scrolling
+            return self._run_in_loop(self._async_render(request, spider))
+        
+        # For individual company pages, let Scrapy handle them normally
+        return None
+
+    async def _ensure_browser(self, spider):
+        """Lazy initialize Playwright only when needed - False if there is no browser to render with"""
+        if self._init_failed:
+            return False  # Detail renders would each retry the launch - once is enough
+        if not self._initialized:
+            # Listings of a sharded crawl render concurrently now - only the first one launches the browser
+            self._init_lock = self._init_lock or asyncio.Lock()
+            async with self._init_lock:
+                initialized = self._initialized or (not self._init_failed and await self._initialize_playwright())
+            if not initialized:
+                if not self._init_failed:
                     spider.logger.error('Playwright failed to initialize - JavaScript pages may not load')
-                    return None
+                self._init_failed = True
+                return False
+        return self.context is not None
+
+    async def _async_render(self, request, spider):
+        """Render one listing page - None lets Scrapy download it without a browser"""
+        if not await self._ensure_browser(spider):
+            return None
+        
+        spider.logger.info(f'Processing listing page {request.url} with Playwright (FAST)')
+        try:
+            print(f'Loading URL with Playwright: {request.url}')
             
-            if not self.context:
-                return None
+            handler = getattr(spider, 'listing_links_found', None)
+
+            def stream_to_spider(links):
+                # Called on the loop thread - the spider schedules the requests on the reactor thread
+                from twisted.internet import reactor
+                reactor.callFromThread(handler, request, links)
+
+            on_links = stream_to_spider if self.stream_links and handler is not None else None
+
+            async with self._render_slot():
+                body, cards = await self._async_process_page(
+                    request.url, spider, request.meta.get('delta_known_slugs'), on_links,
+                    request.meta.get('max_scroll_seconds'))
+            await self._maybe_recycle_context(spider)
             
-            spider.logger.info(f'Processing listing page {request.url} with Playwright (FAST)')
-            try:
-                print(f'Loading URL with Playwright: {request.url}')
-                
-                # Run async page processing
-                self._loop = self._loop or self._get_event_loop()
-                body = self._loop.run_until_complete(self._async_process_page(request.url, spider))
-                
-                if body:
-                    return HtmlResponse(url=request.url, body=body.encode('utf-8'), encoding='utf-8', request=request)
-                else:
-                    return None
-            except Exception as e:
-                spider.logger.error(f'Error processing request with Playwright: {e}')
-                import traceback
-                traceback.print_exc()
+            if cards:
+                # parse() reads the cards from meta - the body is only the page HTML in debug mode
+                request.meta['listing_cards'] = cards
+                return HtmlResponse(url=request.url, body=body or b'', encoding='utf-8', request=request)
+            if body:
+                return HtmlResponse(url=request.url, body=body, encoding='utf-8', request=request)
+            else:
                 return None
-        
-        # For individual company pages, let Scrapy handle them normally
-        return None
+        except Exception as e:
+            spider.logger.error(f'Error processing request with Playwright: {e}')
+            import traceback
+            traceback.print_exc()
+            return None
     
-    async def _async_process_page(self, url, spider):
-        """Async page processing with Playwright"""
+    async def _async_process_page(self, url, spider, known_slugs=None, on_links=None, max_scroll_seconds=None):
+        """Async page processing with Playwright - known_slugs (delta runs) ends the scroll early,
+        on_links receives [href, card text] pairs as company cards appear, max_scroll_seconds
+        (time-budgeted crawls, budget.py) caps the scroll.
+
+        Returns (body, cards): cards are [slug, name, batch label] lists (PLAYWRIGHT_LISTING_EXTRACTION
+        = 'cards'), body the serialized page - only in 'html' mode, debug mode, or when no card was found.
+        """
+        page = None
         try:
             # Create a new page for this request
+            render_started = time.time()
             page = await self.context.new_page()
+            if self._connected_to_server:
+                # The shared profile's default context ignores per-context viewport options
+                await page.set_viewport_size({'width': 1920, 'height': 1080})
+            if on_links is not None:
+                await page.expose_binding('__ycListingLinks', lambda source, links: on_links(links))
             
             # Navigate - try multiple wait strategies with fallback
             try:
@@ -201,6 +701,13 @@ class PlaywrightMiddleware:
                 except:
                     pass  # Continue anyway
             
+            if on_links is not None:
+                try:
+                    # Report every company card as React adds it - details download while we scroll
+                    await page.evaluate(STREAM_LINKS_JS)
+                except Exception as e:
+                    spider.logger.warning(f'Could not stream listing links - they arrive with the full page: {e}')
+            
             # Wait for React app to load and companies to start appearing
             print("Waiting for companies to load...")
             await page.wait_for_timeout(3000)  # 3 seconds for React to initialize
@@ -226,6 +733,10 @@ class PlaywrightMiddleware:
             except:
                 print("⚠️ Companies may not have loaded yet, continuing anyway...")
             
+            if known_slugs:
+                # The listing is newest first - once known companies show up, the rest are known too
+                await page.evaluate("slugs => { window.__ycKnown = new Set(slugs); }", list(known_slugs))
+            
             # Now scroll aggressively to load ALL companies
             print("Scrolling to load ALL companies...")
             scroll_attempts = 0
@@ -234,8 +745,15 @@ class PlaywrightMiddleware:
             last_company_count = 0
             start_time = time.time()
             max_time = 60  # 60 seconds to load all companies (balance between speed and coverage)
+            if max_scroll_seconds is not None and max_scroll_seconds < max_time:
+                max_time = max_scroll_seconds
+                print(f'Time budget: scrolling for at most {max_time:.0f}s')
             
             while (time.time() - start_time) < max_time:
+                if self.memory is not None and scroll_attempts and scroll_attempts % self.memory_sample_scrolls == 0:
+                    if not await self._listing_memory_ok(page, spider):
+                        break
+                
                 # Scroll to bottom
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
                 await page.wait_for_timeout(20)  # 20ms - need time for content to load
@@ -254,6 +772,25 @@ class PlaywrightMiddleware:
                                 }).length
                         """)
                         
+                        if known_slugs:
+                            known_count = await page.evaluate("""
+                                () => {
+                                    const seen = new Set();
+                                    document.querySelectorAll('a[href*="/companies/"]').forEach(a => {
+                                        const m = (a.getAttribute('href') || '').match(/\\/companies\\/([^\\/?#]+)/);
+                                        const slug = m && decodeURIComponent(m[1]).toLowerCase();
+                                        if (slug && window.__ycKnown.has(slug)) seen.add(slug);
+                                    });
+                                    return seen.size;
+                                }
+                            """)
+                            if known_count >= min(self.delta_stop_after_known, len(known_slugs)):
+                                print(f'✅ Delta: reached {known_count} known companies - stopping scroll')
+                                spider.logger.info(f'Delta: stopped scrolling after {current_company_count} companies ({known_count} known)')
+                                if self.stats is not None:
+                                    self.stats.inc_value('delta/scroll_stopped_early')
+                                break
+                        
                         # Show progress
                         if current_company_count and current_company_count > last_company_count:
                             if current_company_count % 100 == 0:
@@ -297,97 +834,191 @@ class PlaywrightMiddleware:
             
             print('✅ Playwright: Finished scrolling - page loaded')
             
-            # Try to find companies via JavaScript BEFORE getting page content
-            company_links_js = []
-            try:
-                # Use JavaScript to find all company links in the DOM
-                company_links_js = await page.evaluate("""
-                    () => {
-                        const links = [];
-                        // Find all links with /companies/ in href
-                        document.querySelectorAll('a[href*="/companies/"]').forEach(a => {
-                            const href = a.getAttribute('href') || '';
-                            // Exclude query params, images, and other files
-                            if (href.includes('/companies/') && 
-                                !href.includes('companies?') && 
-                                !href.match(/\\.(png|jpg|jpeg|gif|svg|webp|ico|css|js|json)$/i) &&
-                                !href.endsWith('.png') &&
-                                href.split('/companies/')[1] && 
-                                href.split('/companies/')[1].length > 0) {
-                                links.push(href);
-                            }
-                        });
-                        return [...new Set(links)]; // Remove duplicates
-                    }
-                """)
-                if company_links_js:
-                    spider.logger.info(f'✅ Found {len(company_links_js)} company links via JavaScript DOM query')
-                    print(f'✅ Found {len(company_links_js)} company links via JavaScript DOM query')
-                    for link in company_links_js[:5]:
-                        spider.logger.info(f'  - {link}')
-                        print(f'  - {link}')
-            except Exception as e:
-                spider.logger.warning(f'Could not query company links via JS: {e}')
+            cards = None
+            if self.listing_extraction == 'cards':
+                try:
+                    # One evaluate for every card on the page, instead of serializing the DOM
+                    cards = await page.evaluate(LISTING_CARDS_JS)
+                    print(f'✅ Extracted {len(cards)} company cards in the browser')
+                    if self.stats is not None:
+                        self.stats.set_value('playwright/listing_cards', len(cards))
+                        self.stats.inc_value('playwright/listing_transfer_bytes', len(json.dumps(cards)))
+                except Exception as e:
+                    spider.logger.warning(f'Could not extract company cards - falling back to the page HTML: {e}')
             
-            # Get page content
-            body = await page.content()
+            body = None
+            if not cards or self.debug_html:
+                if self.listing_extraction == 'cards' and not cards and self.stats is not None:
+                    self.stats.inc_value('playwright/html_fallbacks')  # Card markup changed? parse() scans the HTML
+                # Get page content - encoded once, and the str dropped right away: the bytes are
+                # the only copy of the (multi-MB) page from here to the spider
+                body = (await page.content()).encode('utf-8')
+                if self.stats is not None and not cards:
+                    self.stats.inc_value('playwright/listing_transfer_bytes', len(body))
             await page.close()
+            self._record_stat('playwright/render_seconds', round(time.time() - render_started, 3))
+            
+            if body is None:
+                return None, cards
             
-            # Save HTML for debugging if no companies found
-            if not company_links_js and len(body) > 1000:
+            # Save HTML for debugging if no companies found (or always, with PLAYWRIGHT_DEBUG_HTML)
+            if (not cards or self.debug_html) and len(body) > 1000:
                 try:
                     debug_file = 'debug_page_source.html'
-                    with open(debug_file, 'w', encoding='utf-8') as f:
+                    with open(debug_file, 'wb') as f:
                         f.write(body)
                     spider.logger.info(f'💾 Saved page HTML to {debug_file} for debugging')
                     print(f'💾 Saved page HTML to {debug_file} for debugging')
                 except:
                     pass
             
-            # Check if page has content
+            # Check if page has content (the spider's parse() scans the links - no second scan here)
             if len(body) < 1000:
-                spider.logger.warning(f'Page source is very short ({len(body)} chars) - may not have loaded')
-            else:
-                import re
-                # Find company links but exclude image files
-                all_links = re.findall(r'/companies/[^"\'<>?\s]+', body)
-                # Filter out image files and other non-company URLs
-                excluded_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json']
-                company_links = [link for link in all_links if not any(link.lower().endswith(ext) for ext in excluded_extensions)]
-                company_link_count = len(company_links)
-                
-                spider.logger.info(f'Found {company_link_count} company links in page source (filtered from {len(all_links)} total)')
-                print(f'Found {company_link_count} company links in page source (filtered from {len(all_links)} total)')
-                
-                # If we found links via JS but not in HTML, log it
-                if company_links_js and not company_links:
-                    spider.logger.warning('⚠️ Found companies via JavaScript but not in HTML - page might use dynamic loading')
-                    print('⚠️ Found companies via JavaScript but not in HTML - page might use dynamic loading')
+                spider.logger.warning(f'Page source is very short ({len(body)} bytes) - may not have loaded')
             
-            return body
+            return body, cards
         except Exception as e:
             spider.logger.error(f'Error in async page processing: {e}')
             import traceback
             traceback.print_exc()
+            if page is not None and not page.is_closed():
+                try:
+                    await page.close()  # A shared browser server would keep it open across crawls
+                except Exception:
+                    pass
+            return None, None
+
+    async def _listing_memory_ok(self, page, spider):
+        """False once the listing's JS heap stays over the page limit after a forced GC - the scroll stops there"""
+        sample = await self.memory.page_metrics(self.context, page)
+        if not self.memory.page_over_limit(sample):
+            return True
+        await self.memory.collect_garbage(self.context, page)
+        sample = await self.memory.page_metrics(self.context, page)
+        if not self.memory.page_over_limit(sample):
+            return True
+        self.memory.count('scroll_stopped')
+        message = (f'Listing page heap at {sample["js_heap_mb"]:.0f} MB ({sample["nodes"]} DOM nodes) - '
+                   f'stopping the scroll (PLAYWRIGHT_MEMORY_PAGE_LIMIT_MB)')
+        print(f'⚠️ {message}')
+        spider.logger.warning(message)
+        return False
+
+    async def _async_render_detail(self, request, spider):
+        """Render one detail page on a pooled page with a tight time budget - None falls back to a static fetch"""
+        if not await self._ensure_browser(spider):
             return None
+        self._detail_semaphore = self._detail_semaphore or asyncio.Semaphore(self.detail_render_concurrency)
+        async with self._detail_semaphore, self._render_slot():
+            started = time.time()
+            page = self._detail_pages.pop() if self._detail_pages else None
+            try:
+                if page is None:
+                    page = await self.context.new_page()
+                    # Founders are in the markup - images, fonts and media only cost time
+                    await page.route('**/*', lambda route: route.abort()
+                                     if route.request.resource_type in ('image', 'font', 'media') else route.continue_())
+                await page.goto(request.url, wait_until='domcontentloaded', timeout=self.detail_render_timeout * 1000)
+                try:
+                    await page.wait_for_selector('a[href*="linkedin.com/in/"]', timeout=self.detail_render_wait * 1000)
+                except Exception:
+                    pass  # No founder links after the wait - parse whatever rendered
+                body = (await page.content()).encode('utf-8')
+            except Exception as e:
+                spider.logger.warning(f'Detail render failed for {request.url} - fetching it statically: {e}')
+                if self.stats is not None:
+                    self.stats.inc_value('detail/render_failures')
+                if page is not None:
+                    self._page_renders.pop(page, None)
+                    await page.close()
+                return None
+            await self._release_detail_page(page)
+            elapsed = time.time() - started
+            if self.stats is not None:
+                self.stats.inc_value('detail/render_seconds_total', elapsed)
+                self.stats.max_value('detail/render_seconds_max', round(elapsed, 3))
+        await self._maybe_recycle_context(spider)
+        return HtmlResponse(url=request.url, body=body, encoding='utf-8', request=request, flags=['rendered'])
+
+    def _render_slot(self):
+        """A render slot from the memory governor - no limit beyond the semaphores without one"""
+        if self.memory is None:
+            return contextlib.nullcontext()
+        return self.memory.render_slot()
+
+    async def _release_detail_page(self, page):
+        """Back to the pool - unless it has rendered too often or its heap has grown past the limit"""
+        renders = self._page_renders.get(page, 0) + 1
+        self._page_renders[page] = renders
+        if self.memory is not None:
+            sample = None
+            if renders % self.memory.page_sample_renders == 0:
+                sample = await self.memory.page_metrics(self.context, page)
+            if self.memory.should_recycle_page(renders, sample):
+                self._page_renders.pop(page, None)
+                await page.close()
+                return
+        self._detail_pages.append(page)
+
+    async def _maybe_recycle_context(self, spider):
+        """Fresh browser context once Chromium is over PLAYWRIGHT_MEMORY_BROWSER_LIMIT_MB"""
+        if self.memory is None or self.memory.recycling or not self.memory.browser_over_limit():
+            return
+        if self._connected_to_server:
+            # The shared context holds the browser server's cache - closing idle pages is all we do
+            self.memory.count('context_recycle_skipped')
+            await self._close_detail_pages()
+            return
+        async with self.memory.exclusive():
+            rss_before = self.memory.browser_rss_mb
+            await self._close_detail_pages()
+            old_context, self.context = self.context, await self._new_context()
+            await old_context.close()
+            rss_after = self.memory.sample_browser(force=True)
+        self.memory.count('contexts_recycled')
+        message = f'Browser memory {rss_before:.0f} MB - recycled the browser context'
+        if rss_after is not None:
+            message += f' ({rss_after:.0f} MB after)'
+        print(f'♻️ {message}')
+        spider.logger.info(message)
+
+    async def _close_detail_pages(self):
+        while self._detail_pages:
+            page = self._detail_pages.pop()
+            self._page_renders.pop(page, None)
+            try:
+                await page.close()
+            except Exception:
+                pass  # Already gone with its context
 
     def spider_closed(self, spider):
         """Clean up Playwright resources"""
         try:
             if self._initialized and self._loop:
                 # Clean up async resources
-                self._loop.run_until_complete(self._async_cleanup())
+                asyncio.run_coroutine_threadsafe(self._async_cleanup(), self._loop).result(timeout=30)
             print("✅ Playwright browser closed successfully")
         except Exception as e:
             spider.logger.error(f'Error closing Playwright: {e}')
+        finally:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join(timeout=5)
     
     async def _async_cleanup(self):
         """Async cleanup of Playwright resources"""
         try:
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
+            # A shared browser server (and its profile/cache) outlives the crawl - close what
+            # this crawl opened in it, then only disconnect
+            if self._connected_to_server:
+                await self._close_detail_pages()
+                if self._server_context_owned and self.context:
+                    await self.context.close()
+            else:
+                if self.context:
+                    await self.context.close()
+                if self.browser:
+                    await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
         except Exception as e:
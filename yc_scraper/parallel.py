@@ -0,0 +1,54 @@
+"""Process pool for CPU-heavy detail-page parsing.
+
+The reactor thread only ships raw response bytes to the workers and gets plain
+dicts back (see extraction.extract_from_body), so downloads keep flowing while
+lxml selectors and the founder regexes run on the other cores.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from twisted.internet.defer import Deferred
+
+from yc_scraper.extraction import extract_from_body
+
+
+class DetailParserPool:
+    """Wraps a ProcessPoolExecutor and hands results back to Twisted as Deferreds"""
+
+    def __init__(self, workers):
+        self.workers = workers
+        # spawn, not fork: forking a process that runs a reactor and threads is unsafe
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        self.pending = 0
+
+    def submit(self, url, body, encoding=None, batch_from_card=None, batches=None):
+        """Parse a detail page in a worker - the Deferred fires on the reactor thread with the result dict"""
+        # Imported here: the pool is created before Scrapy installs TWISTED_REACTOR
+        from twisted.internet import reactor
+
+        deferred = Deferred()
+        self.pending += 1
+        future = self.executor.submit(extract_from_body, url, body, encoding, batch_from_card, batches)
+
+        def done(future):
+            # Runs on the executor's management thread - hop back to the reactor
+            try:
+                result = future.result()
+            except Exception as e:
+                reactor.callFromThread(self._fire, deferred, e, failed=True)
+            else:
+                reactor.callFromThread(self._fire, deferred, result)
+
+        future.add_done_callback(done)
+        return deferred
+
+    def _fire(self, deferred, result, failed=False):
+        self.pending -= 1
+        if failed:
+            deferred.errback(result)
+        else:
+            deferred.callback(result)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -3,28 +3,52 @@
 # Don't forget to add your pipeline to the ITEM_PIPELINES setting
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
-import pandas as pd
+# openpyxl is imported where the file is written - it is heavy and every
+# `scrapy list`/`scrapy crawl` would otherwise pay for it at startup
 from itemadapter import ItemAdapter
-from openpyxl import load_workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from openpyxl.utils import get_column_letter
+from scrapy.exceptions import NotConfigured
+
+from yc_scraper.atomic import atomic_write
+from yc_scraper.items import Founder
+import collections
+import queue
 import re
 import os
-import shutil
-import tempfile
-import gc
+import threading
+import time
 
 
 class ExcelExportPipeline:
     """Pipeline to export items to Excel format with incremental updates"""
 
-    def __init__(self):
+    # (item_dict key, column header) in sheet order
+    COLUMNS = [
+        ('company_name', 'Company Name'),
+        ('company_website', 'Company Website'),
+        ('founders_name', "Founder's Name"),
+        ('founders_linkedin', 'Founders LinkedIn'),
+        ('founders_twitter', 'Founders Twitter'),
+    ]
+
+    def __init__(self, output_file='yc_companies.xlsx', stats=None, keep_snapshots=0, background=False, queue_size=2):
         self.items = []
         self.original_urls = []  # Store original URLs for hyperlinks
-        self.output_file = 'yc_companies.xlsx'
+        self.output_file = output_file
+        self.stats = stats
+        self.keep_snapshots = keep_snapshots  # Previous good workbooks kept in .export_snapshots/
+        self.flush_seconds = []  # Duration of each workbook write, for the close report
+        # Background writer: flushes run off the reactor thread; a full queue holds items back (backpressure)
+        self.background = background
+        self.flush_queue = queue.Queue(maxsize=queue_size) if background else None
+        self.writer = None
+        self.waiting_flushes = []  # (job, Deferred) held back until the writer frees a queue slot
+        self.writer_reports = collections.deque()  # (func, args) from the writer thread, run on the reactor
+        self.enabled = True
+        self.exported_keys = set()  # Canonical company keys already in self.items
         self.write_every = 200  # Write every 200 items - less disk I/O = faster
         self.last_write_count = 0
-        self.skip_formatting_during_scrape = True  # Skip formatting during scrape, format once at end
+        # Longest value per column so far - widths are known before each write, no second pass
+        self.column_widths = [len(header) for _, header in self.COLUMNS]
         
         # Check if Excel file is writable
         if os.path.exists(self.output_file):
@@ -42,10 +66,41 @@ class ExcelExportPipeline:
         
         print("ExcelExportPipeline: Will write every item for real-time updates")
 
+    @classmethod
+    def from_crawler(cls, crawler):
+        output_file = crawler.settings.get('EXCEL_OUTPUT_FILE', 'yc_companies.xlsx')
+        if not output_file:
+            raise NotConfigured('EXCEL_OUTPUT_FILE is empty')  # e.g. launcher shards export with -O instead
+        return cls(output_file=output_file, stats=crawler.stats,
+                   keep_snapshots=crawler.settings.getint('EXPORT_KEEP_SNAPSHOTS', 0),
+                   background=crawler.settings.getbool('EXPORT_BACKGROUND_WRITER', True),
+                   queue_size=crawler.settings.getint('EXPORT_QUEUE_SIZE', 2))
+
+    def open_spider(self, spider):
+        # Distributed roles don't write the workbook - `python -m yc_scraper.frontier merge` does
+        if getattr(spider, 'role', None):
+            self.enabled = False
+        if getattr(spider, 'delta', False):
+            # A delta run only has the new companies - don't replace the full workbook with them
+            stem, ext = os.path.splitext(self.output_file)
+            self.output_file = f'{stem}.new{ext}'
+            print(f'Delta mode: new companies go to {self.output_file}')
+
     def process_item(self, item, spider):
+        if not self.enabled:
+            return item
         try:
             adapter = ItemAdapter(item)
             
+            # One row per company - e.g. the same company reached through a redirect
+            company_key = adapter.get('company_slug')
+            if company_key:
+                if company_key in self.exported_keys:
+                    if self.stats is not None:
+                        self.stats.inc_value('dedup/duplicate_items_dropped')
+                    return item
+                self.exported_keys.add(company_key)
+            
             # Clean and format each field
             company_name = adapter.get('company_name', '').strip()
             
@@ -53,38 +108,38 @@ class ExcelExportPipeline:
             company_website_raw = adapter.get('company_website', '').strip()
             company_website = self._format_website(company_website_raw)
             
-            # Clean founder names - remove any URLs, keep only text
-            founders_name_raw = adapter.get('founders_name', '').strip()
-            founders_name = self._clean_founder_names(founders_name_raw)
-            
-            # Format LinkedIn links to short format
-            founders_linkedin_raw = adapter.get('founders_linkedin', '').strip()
-            founders_linkedin = self._format_linkedin(founders_linkedin_raw)
-            
-            # Format Twitter links to short format
-            founders_twitter_raw = adapter.get('founders_twitter', '').strip()
-            founders_twitter = self._format_twitter(founders_twitter_raw)
+            # Founder records (dicts when read back from feeds/the frontier)
+            founders = [Founder.coerce(f) for f in adapter.get('founders') or []]
             
             item_dict = {
                 'company_name': company_name,
                 'company_website': company_website,
-                'founders_name': founders_name,
-                'founders_linkedin': founders_linkedin,
-                'founders_twitter': founders_twitter
+                'founders_name': ', '.join(f.name for f in founders if f.name),
+                # Short format: linkedin.com/in/username and @username
+                'founders_linkedin': self._founder_column([self._format_single_linkedin(f.linkedin) for f in founders]),
+                'founders_twitter': self._founder_column([self._format_single_twitter(f.twitter) for f in founders]),
             }
             self.items.append(item_dict)
+            for idx, (key, _) in enumerate(self.COLUMNS):
+                if len(item_dict[key]) > self.column_widths[idx]:
+                    self.column_widths[idx] = len(item_dict[key])
             
-            # Store original URLs for hyperlink creation
+            # Store original URLs for hyperlink creation (first founder's profile)
             self.original_urls.append({
                 'company_website': company_website_raw,
-                'founders_linkedin': founders_linkedin_raw,
-                'founders_twitter': founders_twitter_raw
+                'founders_linkedin': next((f.linkedin for f in founders if f.linkedin), ''),
+                'founders_twitter': next((f.twitter for f in founders if f.twitter), '')
             })
             
             # Incremental write - update Excel every N items
             if len(self.items) - self.last_write_count >= self.write_every:
-                self._write_excel_incremental(spider)
                 self.last_write_count = len(self.items)
+                if self.background:
+                    pending = self._enqueue_flush(spider)
+                    if pending is not None:
+                        return pending.addCallback(lambda _: item)
+                else:
+                    self._write_excel_incremental(spider)
             
             return item
         except Exception as e:
@@ -94,86 +149,219 @@ class ExcelExportPipeline:
             spider.logger.error(f'Error in process_item: {e}')
             return item  # Return item anyway to continue
 
-    def _write_excel_incremental(self, spider):
-        """Write current items to Excel file incrementally"""
-        if not self.items:
+    def _snapshot(self):
+        """What a flush writes - rows are never modified after append, so shallow copies are enough"""
+        return list(self.items), list(self.original_urls), list(self.column_widths)
+
+    def _enqueue_flush(self, spider):
+        """Hand a snapshot to the writer thread; returns a Deferred if the queue is full"""
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._writer_loop, args=(spider,), name='excel-writer', daemon=True)
+            self.writer.start()
+        job = (time.perf_counter(), self._snapshot())
+        if self.stats is not None:
+            self.stats.max_value('export/queue_depth_max', self.flush_queue.qsize() + len(self.waiting_flushes) + 1)
+        if not self.waiting_flushes:
+            try:
+                self.flush_queue.put_nowait(job)
+                return None
+            except queue.Full:
+                pass
+        # Writer fell behind - this item waits until the writer takes a snapshot off the
+        # queue, and Scrapy stops feeding new responses once enough items are waiting
+        # (SCRAPER_SLOT_MAX_ACTIVE_SIZE). No thread blocks meanwhile.
+        from twisted.internet.defer import Deferred
+        if self.stats is not None:
+            self.stats.inc_value('export/backpressure_waits')
+        waiting = Deferred()
+        self.waiting_flushes.append((job, waiting))
+        return waiting
+
+    def _flush_slot_freed(self):
+        """Reactor thread: move held-back snapshots into the queue and release their items"""
+        while self.waiting_flushes:
+            job, waiting = self.waiting_flushes[0]
+            try:
+                self.flush_queue.put_nowait(job)
+            except queue.Full:
+                return
+            self.waiting_flushes.pop(0)
+            waiting.callback(None)
+
+    def _writer_loop(self, spider):
+        """Writer thread: one workbook write per queued snapshot until the None sentinel.
+        Stats and spider.logger belong to the reactor thread - reports are handed over to it."""
+        from twisted.internet import reactor
+        while True:
+            job = self.flush_queue.get()
+            if job is None:
+                return
+            reactor.callFromThread(self._flush_slot_freed)
+            enqueued_at, snapshot = job
+            self._write_excel_incremental(spider, snapshot, report=self._report_from_writer)
+            if self.stats is not None:
+                # Queue wait + write: how stale the file on disk can get
+                self._report_from_writer(self.stats.max_value, 'export/flush_latency_max',
+                                         time.perf_counter() - enqueued_at)
+
+    def _report_from_writer(self, func, *args):
+        from twisted.internet import reactor
+        self.writer_reports.append((func, args))
+        reactor.callFromThread(self._run_writer_reports)
+
+    def _run_writer_reports(self):
+        """Reactor thread - also called by close_spider, which blocks the reactor while the writer drains"""
+        while self.writer_reports:
+            func, args = self.writer_reports.popleft()
+            func(*args)
+
+    def _write_excel_incremental(self, spider, snapshot=None, report=None):
+        """Write current items to Excel file incrementally - report(func, *args) runs stats and log calls
+        (handed to the reactor on the writer thread)"""
+        report = report or (lambda func, *args: func(*args))
+        items, original_urls, column_widths = snapshot or self._snapshot()
+        if not items:
             print("PIPELINE: No items to write")
             return
         
         try:
-            # Create DataFrame with proper column names
-            df = pd.DataFrame(self.items)
-            
-            # Rename columns to user-friendly names
-            column_mapping = {
-                'company_name': 'Company Name',
-                'company_website': 'Company Website',
-                'founders_name': "Founder's Name",
-                'founders_linkedin': 'Founders LinkedIn',
-                'founders_twitter': 'Founders Twitter'
-            }
-            
-            df = df.rename(columns=column_mapping)
-            
-            # Ensure columns are in the correct order
-            column_order = [
-                'Company Name',
-                'Company Website',
-                "Founder's Name",
-                'Founders LinkedIn',
-                'Founders Twitter'
-            ]
-            
-            # Reorder columns (only include columns that exist)
-            df = df[[col for col in column_order if col in df.columns]]
-            
-            # Write to Excel (will overwrite existing file)
-            try:
-                df.to_excel(self.output_file, index=False, engine='openpyxl')
-                print(f'Saved {len(self.items)} companies to {self.output_file}')
-            except PermissionError as pe:
-                error_msg = f"Cannot write Excel file - it may be open in Excel! Close {self.output_file} and try again. Error: {pe}"
-                print(f"PIPELINE ERROR: {error_msg}")
-                spider.logger.error(error_msg)
-            except Exception as e:
-                error_msg = f'Error writing Excel: {e}'
-                print(f"PIPELINE ERROR: {error_msg}")
-                spider.logger.error(error_msg)
-                import traceback
-                traceback.print_exc()
-            
-            # Skip formatting during scraping for maximum speed
-            # Formatting will be done once at the end
-            
-            spider.logger.info(f'Progress: Saved {len(self.items)} companies to {self.output_file}')
-            print(f'SUCCESS: Saved {len(self.items)} companies to {self.output_file}')
+            # Temp file + fsync + rename - a crash mid-write never truncates the live workbook
+            written, seconds, size = atomic_write(
+                self.output_file, lambda path: self._write_workbook(path, items, original_urls, column_widths),
+                keep_snapshots=self.keep_snapshots)
+            self.flush_seconds.append(seconds)  # list.append is thread-safe; close_spider reads it after join()
+            report(self._record_flush, seconds, size, written != os.path.abspath(self.output_file))
+            print(f'Saved {len(items)} companies to {written} in {seconds:.2f}s')
+            if written != os.path.abspath(self.output_file):
+                warning = (f"{self.output_file} is locked (open in Excel?) - saved to {written} instead. "
+                           f"Close it and the next write replaces it.")
+                print(f"WARNING: {warning}")
+                report(spider.logger.warning, warning)
+                return
+        except PermissionError as pe:
+            error_msg = f"Cannot write Excel file - it may be open in Excel! Close {self.output_file} and try again. Error: {pe}"
+            print(f"PIPELINE ERROR: {error_msg}")
+            report(spider.logger.error, error_msg)
+            return
         except Exception as e:
-            error_msg = f'Error writing Excel incrementally: {e}'
-            spider.logger.error(error_msg)
-            print(f'PIPELINE ERROR: {error_msg}')
+            error_msg = f'Error writing Excel: {e}'
+            print(f"PIPELINE ERROR: {error_msg}")
+            report(spider.logger.error, error_msg)
             import traceback
             traceback.print_exc()
-            # Don't raise - continue scraping even if Excel write fails
-    
+            return  # Don't raise - continue scraping even if Excel write fails
+        
+        report(spider.logger.info, f'Progress: Saved {len(items)} companies to {self.output_file}')
+        print(f'SUCCESS: Saved {len(items)} companies to {self.output_file}')
+
+    def _record_flush(self, seconds, size, sidecar=False):
+        """Cost of each workbook write - it grows with the row count, so watch the max"""
+        if self.stats is None:
+            return
+        self.stats.inc_value('export/flush_count')
+        self.stats.inc_value('export/flush_seconds_total', seconds)
+        self.stats.max_value('export/flush_seconds_max', seconds)
+        self.stats.set_value('export/last_flush_seconds', round(seconds, 3))
+        self.stats.set_value('export/last_flush_bytes', size)
+        if sidecar:
+            self.stats.inc_value('export/sidecar_writes')
+
     def close_spider(self, spider):
         """Final write when spider closes"""
+        if not self.enabled:
+            return
         if not self.items:
             spider.logger.warning('No items to export')
             return
+        started = time.perf_counter()
         
         # Final write with all items (in case there are any remaining)
+        if self.writer is not None:
+            # Queued flushes are older than the final write - skip them, then let the writer drain
+            for _, waiting in self.waiting_flushes:
+                waiting.callback(None)
+            self.waiting_flushes = []
+            while True:
+                try:
+                    self.flush_queue.get_nowait()
+                except queue.Empty:
+                    break
+            self.flush_queue.put(None)
+            self.writer.join()
+            self._run_writer_reports()
         self._write_excel_incremental(spider)
         
-        # Format Excel file once at the end (better than formatting during scraping)
-        print(f'Formatting Excel file...')
-        try:
-            self._format_excel_file(self.output_file)
-            print(f'Excel file formatted successfully')
-        except Exception as e:
-            print(f'Warning: Excel formatting skipped due to error: {e}')
-            spider.logger.warning(f'Excel formatting skipped: {e}')
-        
         spider.logger.info(f'✅ Final export complete: {len(self.items)} companies saved to {self.output_file}')
+        if self.stats is not None:
+            # Time-budgeted crawls (budget.py) report this as the export stage
+            self.stats.set_value('export/close_seconds', round(time.perf_counter() - started, 3))
+        if self.flush_seconds:
+            report = (f'Export cost: {len(self.flush_seconds)} writes, {sum(self.flush_seconds):.2f}s total, '
+                      f'{max(self.flush_seconds):.2f}s max, {self.flush_seconds[-1]:.2f}s last')
+            print(report)
+            spider.logger.info(report)
+    
+    def _write_workbook(self, filename, items, original_urls, column_widths):
+        """Write and format the sheet in one pass: header style, hyperlinks and column widths"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill
+        from openpyxl.utils import get_column_letter
+
+        # Write-only mode streams rows instead of building the whole sheet in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        
+        # Widths, header height and freeze panes have to be set before the first row
+        for idx, width in enumerate(column_widths, start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = min(width + 2, 50)
+        ws.row_dimensions[1].height = 20
+        ws.freeze_panes = 'A2'
+        
+        # Format header row
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=11)
+        header_alignment = Alignment(horizontal='center', vertical='center')
+        link_font = Font(color="0000FF", underline="single")
+        
+        header = []
+        for _, title in self.COLUMNS:
+            cell = WriteOnlyCell(ws, value=title)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+            header.append(cell)
+        ws.append(header)
+        
+        for item_dict, urls in zip(items, original_urls):
+            row = []
+            for key, _ in self.COLUMNS:
+                value = item_dict[key] or None
+                url = self._hyperlink(key, value, urls) if value else None
+                if url:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.hyperlink = url
+                    cell.font = link_font
+                    row.append(cell)
+                else:
+                    row.append(value)
+            ws.append(row)
+        
+        wb.save(filename)
+    
+    def _hyperlink(self, key, value, original_urls):
+        """Link target for a cell, from the URLs the short display value was made from"""
+        if key == 'company_website' and 'www.' in value:
+            # Create hyperlink from www.example.com to https://www.example.com
+            original_url = original_urls.get('company_website', '')
+            if original_url and 'http' in original_url.lower():
+                return original_url
+            return 'https://' + value if not value.startswith('http') else value
+        if key in ('founders_linkedin', 'founders_twitter'):
+            original_url = original_urls.get(key, '')
+            if original_url and 'http' in original_url.lower():
+                return original_url
+        return None
     
     def _format_website(self, url):
         """Format website URL to short format: www.example.com, exclude unwanted domains"""
@@ -216,37 +404,11 @@ class ExcelExportPipeline:
         
         return url
     
-    def _clean_founder_names(self, names_text):
-        """Clean founder names - remove URLs, keep only text names"""
-        if not names_text:
+    def _founder_column(self, values):
+        """One entry per founder, in the same order as the names - '-' marks a founder without that profile"""
+        if not any(values):
             return ''
-        
-        # Remove any URLs that might be mixed in
-        # Remove patterns like http://, https://, linkedin.com, twitter.com, etc.
-        cleaned = re.sub(r'https?://[^\s,]+', '', names_text)
-        cleaned = re.sub(r'linkedin\.com/[^\s,]+', '', cleaned)
-        cleaned = re.sub(r'twitter\.com/[^\s,]+', '', cleaned)
-        cleaned = re.sub(r'x\.com/[^\s,]+', '', cleaned)
-        
-        # Remove multiple spaces and clean up
-        cleaned = re.sub(r'\s+', ' ', cleaned)
-        cleaned = re.sub(r',\s*,', ',', cleaned)  # Remove double commas
-        cleaned = cleaned.strip(' ,')
-        
-        return cleaned
-    
-    def _format_linkedin(self, linkedin_text):
-        """Format LinkedIn URLs to short format: linkedin.com/in/username"""
-        if not linkedin_text:
-            return ''
-        
-        # Handle multiple LinkedIn URLs separated by commas
-        if ',' in linkedin_text:
-            urls = [u.strip() for u in linkedin_text.split(',')]
-            formatted = [self._format_single_linkedin(url) for url in urls if url]
-            return ', '.join([f for f in formatted if f])
-        
-        return self._format_single_linkedin(linkedin_text)
+        return ', '.join(value or '-' for value in values)
     
     def _format_single_linkedin(self, url):
         """Format a single LinkedIn URL"""
@@ -263,25 +425,6 @@ class ExcelExportPipeline:
         
         return url
     
-    def _format_twitter(self, twitter_text):
-        """Format Twitter URLs to short format: @username, filter out @ycombinator"""
-        if not twitter_text:
-            return ''
-        
-        # Handle multiple Twitter URLs separated by commas
-        if ',' in twitter_text:
-            urls = [u.strip() for u in twitter_text.split(',')]
-            formatted = [self._format_single_twitter(url) for url in urls if url]
-            # Filter out @ycombinator
-            filtered = [f for f in formatted if f and 'ycombinator' not in f.lower()]
-            return ', '.join(filtered) if filtered else ''
-        
-        result = self._format_single_twitter(twitter_text)
-        # Filter out @ycombinator
-        if result and 'ycombinator' in result.lower():
-            return ''
-        return result
-    
     def _format_single_twitter(self, url):
         """Format a single Twitter URL"""
         if not url:
@@ -294,104 +437,24 @@ class ExcelExportPipeline:
                 username = match.group(1)
                 # Remove @ if present
                 username = username.lstrip('@')
+                if 'ycombinator' in username.lower():
+                    return ''  # Filter out @ycombinator
                 return f"@{username}"
         except:
             pass
         
         return url
-    
-    def _format_excel_file(self, filename):
-        """Format the Excel file with headers, hyperlinks, and column widths"""
-        try:
-            # Skip formatting if file doesn't exist or is locked
-            import os
-            if not os.path.exists(filename):
-                return
-            wb = load_workbook(filename)
-            ws = wb.active
-            
-            # Format header row
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            link_font = Font(color="0000FF", underline="single")
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            # Store original URLs for hyperlinks (from items list)
-            # Process each row and add hyperlinks where appropriate
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_row=ws.max_row), start=2):
-                item_idx = row_idx - 2  # Adjust for 0-based index and header row
-                if item_idx < len(self.original_urls):
-                    original_urls = self.original_urls[item_idx]
-                    
-                    for col_idx, cell in enumerate(row, start=1):
-                        if cell.value:
-                            cell_value = str(cell.value).strip()
-                            
-                            # Get column header to determine link type
-                            header_cell = ws.cell(row=1, column=col_idx)
-                            column_name = str(header_cell.value).strip() if header_cell.value else ''
-                            
-                            # Add hyperlinks to clickable fields
-                            if column_name == 'Company Website' and cell_value and 'www.' in cell_value:
-                                # Create hyperlink from www.example.com to https://www.example.com
-                                original_url = original_urls.get('company_website', '')
-                                if original_url and 'http' in original_url.lower():
-                                    url = original_url.split(',')[0].strip()
-                                    cell.hyperlink = url
-                                    cell.font = link_font
-                                elif cell_value and 'www.' in cell_value:
-                                    url = 'https://' + cell_value if not cell_value.startswith('http') else cell_value
-                                    cell.hyperlink = url
-                                    cell.font = link_font
-                            
-                            elif column_name == 'Founders LinkedIn' and cell_value:
-                                # Extract full URL from original data
-                                original_linkedin = original_urls.get('founders_linkedin', '')
-                                if original_linkedin and 'http' in original_linkedin.lower():
-                                    # Use first URL if multiple
-                                    url = original_linkedin.split(',')[0].strip()
-                                    cell.hyperlink = url
-                                    cell.font = link_font
-                            
-                            elif column_name == 'Founders Twitter' and cell_value:
-                                # Extract full URL from original data
-                                original_twitter = original_urls.get('founders_twitter', '')
-                                if original_twitter and 'http' in original_twitter.lower():
-                                    # Use first URL if multiple
-                                    url = original_twitter.split(',')[0].strip()
-                                    cell.hyperlink = url
-                                    cell.font = link_font
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                
-                for cell in column:
-                    try:
-                        # Get cell value for width calculation
-                        cell_value = str(cell.value) if cell.value else ''
-                        if len(cell_value) > max_length:
-                            max_length = len(cell_value)
-                    except:
-                        pass
-                
-                # Set column width (with some padding, max 50)
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Set row height for header
-            ws.row_dimensions[1].height = 20
-            
-            # Freeze header row
-            ws.freeze_panes = 'A2'
-            
-            wb.save(filename)
-        except Exception as e:
-            # If formatting fails, the file still exists with data
-            pass
 
+
+class FrontierItemPipeline:
+    """Distributed workers: store items in the shared frontier for the merge step"""
+
+    def process_item(self, item, spider):
+        frontier = getattr(spider, 'frontier', None)
+        if frontier is None or getattr(spider, 'role', None) != 'worker':
+            return item
+        adapter = ItemAdapter(item)
+        key = adapter.get('company_slug')
+        frontier.add_item(key, adapter.asdict())
+        frontier.ack(key)  # Only now - a worker dying before this leaves the lease to expire and be retried
+        return item
@@ -0,0 +1,96 @@
+"""Which company pages to fetch first.
+
+BatchPriorityPolicy gives every detail request a priority from what its listing
+card said, so a crawl cut short (time budget, Ctrl-C) has exported the most
+valuable companies:
+
+- confidence band: the card named a target batch (or the listing was filtered to
+  one) > the card only showed a target year > the card showed no batch at all
+- batch recency within the band: Winter 2026 before Summer 2024
+- host latency: requests for a host that answers slower than
+  ADAPTIVE_CONCURRENCY_TARGET_LATENCY drop a few places within their band
+
+Retries go below every fresh request (FAILURE_RETRY_PRIORITY_ADJUST), and parked
+failures are re-driven after the queue drains. The policy also records how long
+the crawl took to export its first N items (time_to_<N>_items_seconds, next to
+the spider's time_to_first_item_seconds).
+"""
+
+import re
+import time
+from urllib.parse import urlsplit
+
+from scrapy import signals
+from scrapy.utils.httpobj import urlparse_cached
+
+from yc_scraper.extraction import TARGET_BATCHES, normalize_batch
+
+CONFIRMED, LIKELY, UNKNOWN = 300, 200, 100  # Bands are 100 apart - recency and latency stay inside them
+RECENCY_STEP = 10  # Per batch, newest first
+MAX_LATENCY_PENALTY = 9
+
+
+class BatchPriorityPolicy:
+    """Detail request priorities from card batch, recency and host latency, plus time-to-N-items stats"""
+
+    def __init__(self, crawler=None, target_latency=1.5, milestones=(), enabled=True):
+        self.crawler = crawler  # Stats are read off it later - the spider is built before crawler.stats
+        self.target_latency = target_latency
+        self.milestones = sorted(set(milestones))
+        self.enabled = enabled
+        self.latency = {}  # host -> moving average of download latency (seconds)
+        self.started = time.perf_counter()
+        self.items = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        policy = cls(
+            crawler,
+            target_latency=settings.getfloat('ADAPTIVE_CONCURRENCY_TARGET_LATENCY', 1.5),
+            milestones=[int(n) for n in settings.getlist('PRIORITY_ITEM_MILESTONES', [10, 100, 1000])],
+            enabled=settings.getbool('BATCH_PRIORITY_ENABLED', True),
+        )
+        crawler.signals.connect(policy.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(policy.response_received, signal=signals.response_received)
+        crawler.signals.connect(policy.item_scraped, signal=signals.item_scraped)
+        return policy
+
+    def priority(self, url, batch_from_card):
+        """Priority for a detail request - batch_from_card is the card's target batch text or None"""
+        if not self.enabled:
+            return 1 if batch_from_card else 0  # Previous behaviour: card showed a target batch or not
+        batch = normalize_batch(batch_from_card)
+        if batch in TARGET_BATCHES:
+            priority = CONFIRMED + (len(TARGET_BATCHES) - TARGET_BATCHES.index(batch)) * RECENCY_STEP
+        elif batch_from_card:
+            # Only a year - rank it with that year's oldest target batch
+            year = re.search(r'20\d\d', batch_from_card)
+            ranks = [len(TARGET_BATCHES) - i for i, name in enumerate(TARGET_BATCHES) if year and name.endswith(year.group(0))]
+            priority = LIKELY + min(ranks, default=0) * RECENCY_STEP
+        else:
+            priority = UNKNOWN
+        return priority - self._latency_penalty(url)
+
+    def _latency_penalty(self, url):
+        latency = self.latency.get(urlsplit(url).hostname)
+        if not latency or latency <= self.target_latency:
+            return 0
+        return min(MAX_LATENCY_PENALTY, int(latency / self.target_latency))
+
+    def spider_opened(self, spider):
+        self.started = time.perf_counter()
+
+    def response_received(self, response, request, spider):
+        latency = request.meta.get('download_latency')
+        if latency is None:
+            return
+        host = urlparse_cached(request).hostname
+        previous = self.latency.get(host)
+        self.latency[host] = latency if previous is None else 0.8 * previous + 0.2 * latency
+
+    def item_scraped(self, item, response, spider):
+        self.items += 1
+        if self.items in self.milestones:
+            self.crawler.stats.set_value(f'time_to_{self.items}_items_seconds', round(time.perf_counter() - self.started, 2))
+
@@ -11,6 +11,7 @@ BOT_NAME = 'yc_scraper'
 
 SPIDER_MODULES = ['yc_scraper.spiders']
 NEWSPIDER_MODULE = 'yc_scraper.spiders'
+COMMANDS_MODULE = 'yc_scraper.commands'  # scrapy reparse
 
 # Obey robots.txt rules
 ROBOTSTXT_OBEY = False
@@ -22,13 +23,117 @@ DOWNLOAD_DELAY = 0  # No delay for maximum speed
 RANDOMIZE_DOWNLOAD_DELAY = 0
 
 # The download delay setting will honor only one of:
-CONCURRENT_REQUESTS_PER_DOMAIN = 500  # ULTRA HIGH concurrency - MAXIMUM SPEED
-CONCURRENT_REQUESTS_PER_IP = 500
+# Per-host values are only the starting ceiling - AdaptiveConcurrencyMiddleware
+# sizes the real window per host from latency and 429/5xx responses
+CONCURRENT_REQUESTS_PER_DOMAIN = 128
+CONCURRENT_REQUESTS_PER_IP = 128
 CONCURRENT_REQUESTS = 500  # Global concurrent requests limit - ULTRA FAST
 
+# Adaptive (AIMD) per-host concurrency - see AdaptiveConcurrencyMiddleware
+ADAPTIVE_CONCURRENCY_ENABLED = True
+ADAPTIVE_CONCURRENCY_START = 16  # Initial window per host
+ADAPTIVE_CONCURRENCY_MIN = 1
+ADAPTIVE_CONCURRENCY_MAX = 128  # Never go above this many requests per host
+ADAPTIVE_CONCURRENCY_TARGET_LATENCY = 1.5  # Seconds - slower responses shrink the window
+ADAPTIVE_CONCURRENCY_DECREASE_FACTOR = 0.5  # Multiplicative decrease on 429/5xx/timeouts
+ADAPTIVE_CONCURRENCY_MAX_RETRY_AFTER = 60  # Cap on Retry-After pauses (seconds)
+ADAPTIVE_CONCURRENCY_BACKOFF_CODES = [429, 500, 502, 503, 504]
+ADAPTIVE_CONCURRENCY_DEBUG = False  # Log every window change
+
+# HTTP/2 for the YC host (yc_scraper/http2.py) - a few multiplexed connections instead of one per request
+DOWNLOAD_HANDLERS = {
+    'http': 'yc_scraper.http2.RoutingDownloadHandler',
+    'https': 'yc_scraper.http2.RoutingDownloadHandler',
+}
+HTTP2_ENABLED = True  # Needs `pip install h2` - falls back to HTTP/1.1 without it
+HTTP2_HOSTS = ['www.ycombinator.com', 'ycombinator.com']  # Everything else stays on HTTP/1.1
+HTTP2_CONNECTIONS_PER_HOST = 2
+
 # Add timeout to prevent hanging
 DOWNLOAD_TIMEOUT = 5  # 5 second timeout - ULTRA FAST failure = faster scraping
 
+# Failure-aware retries (FailureQueueMiddleware replaces Scrapy's RetryMiddleware)
+FAILURE_RETRY_TIMES = 2  # Immediate retries per request
+FAILURE_RETRY_PRIORITY_ADJUST = -1000  # Retries go behind every fresh request, whatever its priority band
+FAILURE_RETRY_TIMEOUT_FACTOR = 2.0  # Each retry gets a longer DOWNLOAD_TIMEOUT...
+FAILURE_RETRY_MAX_TIMEOUT = 30  # ...up to this many seconds
+FAILURE_REDRIVE_ENABLED = True  # Re-drive exhausted requests once the main queue drains
+FAILURE_QUEUE_FILE = 'failed_urls.jsonl'  # Permanent failures - re-run with -a retry_file=failed_urls.jsonl
+
+# Reuse a long-lived local Chromium (python -m yc_scraper.browser_server start) instead of
+# cold-starting one per crawl - its persistent profile keeps the HTTP cache of JS bundles
+PLAYWRIGHT_BROWSER_SERVER = False
+PLAYWRIGHT_CDP_ENDPOINT = None  # Defaults to the endpoint recorded in the state file
+PLAYWRIGHT_SERVER_STATE_FILE = '.browser_server.json'
+PLAYWRIGHT_STREAM_LINKS = True  # Schedule company pages as cards appear, while the listing still scrolls
+PLAYWRIGHT_LISTING_EXTRACTION = 'cards'  # [slug, name, batch] per card from the DOM - 'html' ships the whole page to parse()
+PLAYWRIGHT_DEBUG_HTML = False  # Also serialize the page and save it to debug_page_source.html
+
+# Browser memory governor (yc_scraper/browser_memory.py) - browser RSS needs psutil (in requirements.txt)
+PLAYWRIGHT_MEMORY_GOVERNOR = True
+PLAYWRIGHT_MEMORY_PAGE_LIMIT_MB = 512  # JS heap of one page - the listing scroll stops, a pooled page is closed
+PLAYWRIGHT_MEMORY_PAGE_MAX_RENDERS = 50  # Detail renders before a pooled page is replaced
+PLAYWRIGHT_MEMORY_BROWSER_LIMIT_MB = 2048  # Chromium RSS before the browser context is recycled
+PLAYWRIGHT_MEMORY_BUDGET_MB = 3072  # Renders wait while Chromium has no room for another...
+PLAYWRIGHT_MEMORY_RENDER_COST_MB = 200  # ...of about this size
+PLAYWRIGHT_MEMORY_SAMPLE_SCROLLS = 25  # Listing scrolls between heap samples
+
+# Hybrid detail parsing: a static page without batch or founders is re-queued once through Playwright
+DETAIL_RENDER_FALLBACK = True
+DETAIL_RENDER_CONCURRENCY = 4  # Pooled browser pages for detail renders
+DETAIL_RENDER_TIMEOUT = 8  # Seconds for the page to load before falling back to the static HTML
+DETAIL_RENDER_WAIT = 2  # Seconds to wait for founder links after load
+
+# Detail request priorities (yc_scraper/scheduling.py): confirmed target batch > target year only > no batch,
+# newest batch first within a band, slow hosts a few places lower
+BATCH_PRIORITY_ENABLED = True  # False = previous 1/0 priority
+PRIORITY_ITEM_MILESTONES = [10, 100, 1000]  # time_to_<N>_items_seconds stats
+
+# Time-budgeted crawls (-a time_budget=600) - see yc_scraper/budget.py
+TIME_BUDGET = 0  # Seconds for the whole run, 0 = open-ended; -a time_budget= overrides
+TIME_BUDGET_LISTING_SHARE = 0.25  # Share of the budget the listing may scroll for
+TIME_BUDGET_EXPORT_RESERVE = 30  # Minimum seconds kept for in-flight downloads and the final workbook write
+TIME_BUDGET_SHED_AT = 0.2  # Share of the fetch window left when low-priority requests start being shed
+
+# Stop detail downloads at an off-target batch marker (early_abort.py) - HTTP/1.1 and HTTP/2
+EARLY_ABORT_ENABLED = True
+EARLY_ABORT_SCAN_BYTES = 262144  # Decompressed bytes scanned for the marker before giving up
+
+# Parse detail pages in a process pool so the reactor thread keeps downloading
+DETAIL_PARSE_WORKERS = 0  # 0 = parse on the reactor thread, N = N worker processes
+
+# Distributed crawl (-a role=coordinator / -a role=worker) - see yc_scraper/frontier.py
+FRONTIER_BACKEND = 'yc_scraper.frontier.SQLiteFrontier'
+FRONTIER_URI = 'frontier.sqlite3'  # Path for SQLiteFrontier - put it on a shared volume for several machines
+FRONTIER_LEASE_BATCH = 64  # Companies a worker leases at a time
+FRONTIER_LEASE_SECONDS = 300  # Leases of a dead worker are handed out again after this
+FRONTIER_MAX_ATTEMPTS = 3  # Worker failures before a company is marked failed
+
+EXCEL_OUTPUT_FILE = 'yc_companies.xlsx'  # Empty disables the Excel pipeline (launcher shards use -O feeds)
+EXPORT_KEEP_SNAPSHOTS = 3  # Previous good workbooks kept in .export_snapshots/ (0 = none)
+EXPORT_BACKGROUND_WRITER = True  # Write the workbook on a separate thread - the reactor keeps crawling during flushes
+EXPORT_QUEUE_SIZE = 2  # Pending flushes before items wait for the writer (backpressure)
+
+# Delta runs (-a delta=1): companies already in the snapshot of a listing are not fetched again
+LISTING_SNAPSHOT_FILE = 'listing_snapshots.json'  # Company keys per listing filter, updated by every finished crawl
+DELTA_STOP_AFTER_KNOWN = 20  # Known companies rendered before the listing scroll stops
+
+# Sitemap discovery (-a discovery=sitemap) - no browser, see yc_scraper/sitemap.py
+SITEMAP_URL = 'https://www.ycombinator.com/sitemap.xml'  # -a sitemap_url= overrides; with -a start_url= it is <host>/sitemap.xml
+
+# Page archive for `scrapy reparse` (archive.py) - empty disables
+ARCHIVE_FILE = ''  # e.g. 'pages.archive' - every fetched page, compressed, plus pages.archive.idx
+ARCHIVE_COMPRESSION = 'gzip'  # 'zstd' is faster and smaller but needs `pip install zstandard`
+
+# Dedup by canonical company key (dedup.py) instead of exact URL
+DUPEFILTER_CLASS = 'yc_scraper.dedup.CompanyDupeFilter'
+DEDUP_SEEN_SET = 'exact'  # 'bloom' = fixed-memory Bloom filter for very large crawls
+DEDUP_BLOOM_CAPACITY = 1000000  # Expected number of requests
+DEDUP_BLOOM_ERROR_RATE = 0.001  # Share of new companies wrongly skipped as seen
+
+# Pending requests on disk when JOBDIR is set (-s JOBDIR=crawls/yc) - compact records, see yc_scraper/squeues.py
+SCHEDULER_DISK_QUEUE = 'yc_scraper.squeues.CompactLifoDiskQueue'
+
 # Disable cookies (enabled by default)
 COOKIES_ENABLED = True
 
@@ -51,19 +156,29 @@ SPIDER_MIDDLEWARES = {
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
+    # Before Playwright, so listing renders get the scroll time the budget leaves (no-op without a budget)
+    'yc_scraper.budget.TimeBudgetMiddleware': 540,
     'yc_scraper.middlewares.YcScraperDownloaderMiddleware': 543,
     'yc_scraper.middlewares.PlaywrightMiddleware': 544,
+    # Sees rendered listings from Playwright, and only final responses - retries are decided at 550
+    'yc_scraper.archive.ArchiveMiddleware': 545,
+    'scrapy.downloadermiddlewares.retry.RetryMiddleware': None,
+    'yc_scraper.middlewares.FailureQueueMiddleware': 550,
+    # Closer to the downloader than RetryMiddleware (550) so it sees raw 429/5xx responses
+    'yc_scraper.middlewares.AdaptiveConcurrencyMiddleware': 560,
 }
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
 EXTENSIONS = {
     'scrapy.extensions.telnet.TelnetConsole': None,
+    'yc_scraper.early_abort.EarlyAbortExtension': 500,
 }
 
 # Configure item pipelines
 # See https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 ITEM_PIPELINES = {
+    'yc_scraper.pipelines.FrontierItemPipeline': 200,  # No-op unless -a role=worker
     'yc_scraper.pipelines.ExcelExportPipeline': 300,
 }
 
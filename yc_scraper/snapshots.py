@@ -0,0 +1,72 @@
+"""Company slugs seen on each listing, for cheap -a delta=1 runs.
+
+Every finished crawl records the canonical company keys (dedup.py) it found on
+each listing filter - the plain directory or ``?batch=Winter 2026`` - in
+LISTING_SNAPSHOT_FILE. A delta run stops scrolling the newest-first listing
+once it reaches companies it already knows and only schedules the new ones:
+
+    scrapy crawl yc_companies -a delta=1
+"""
+
+import json
+import os
+from datetime import datetime
+from urllib.parse import parse_qsl, urlparse
+
+from yc_scraper.atomic import atomic_write
+
+
+def listing_filter_key(url):
+    """'batch=Winter 2026' for a filtered listing, 'all' for the plain directory"""
+    query = sorted(parse_qsl(urlparse(url).query))
+    return '&'.join(f'{name}={value}' for name, value in query) or 'all'
+
+
+class ListingSnapshots:
+    """Known company keys per listing filter, loaded from and saved to one JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.filters = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.filters = json.load(f).get('filters', {})
+            except (OSError, ValueError) as e:
+                print(f'WARNING: Could not read listing snapshot {path} ({e}) - treating every company as new')
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get('LISTING_SNAPSHOT_FILE', 'listing_snapshots.json'))
+
+    def has(self, filter_key):
+        return filter_key in self.filters
+
+    def known(self, filter_key):
+        return set(self.filters.get(filter_key, {}).get('slugs', ()))
+
+    def record(self, filter_key, slugs):
+        """Add this run's keys - a delta run only sees the top of the listing, so never drop old ones"""
+        known = self.known(filter_key)
+        new = set(slugs) - known
+        self.filters[filter_key] = {
+            'slugs': sorted(known | new),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        return new
+
+    def merge(self, other):
+        """Fold in another run's snapshot (a launcher shard's) - slugs are unioned, the newest update wins"""
+        for filter_key, entry in other.filters.items():
+            mine = self.filters.get(filter_key, {})
+            self.filters[filter_key] = {
+                'slugs': sorted(set(mine.get('slugs', ())) | set(entry.get('slugs', ()))),
+                'updated_at': max(mine.get('updated_at', ''), entry.get('updated_at', '')),
+            }
+
+    def save(self):
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'filters': self.filters}, f)
+
+        atomic_write(self.path, write, sidecar=False)
@@ -1,9 +1,27 @@
 import scrapy
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider, IgnoreRequest
+from lxml import etree
+from yc_scraper.dedup import canonical_company_key, canonical_company_url
+from yc_scraper.extraction import (
+    TARGET_BATCHES, extract_batch_year, extract_company_detail, is_target_batch, is_valid_name, iter_company_hrefs,
+    normalize_batch,
+)
 from yc_scraper.items import YcCompanyItem
+from yc_scraper.scheduling import BatchPriorityPolicy
+from yc_scraper.sitemap import is_company_url, iter_sitemap
+from yc_scraper.snapshots import ListingSnapshots, listing_filter_key
 import re
 import os
 from datetime import datetime
 import io
+import json
+import socket
+import time
+from urllib.parse import quote, urljoin, urlparse
+
+# Meta the first fetch left on a request - a re-queued render must not report it as its own
+FETCH_META = ('download_slot', 'download_latency', 'early_abort_batch')
 
 
 class YcCompaniesSpider(scrapy.Spider):
@@ -21,12 +39,171 @@ class YcCompaniesSpider(scrapy.Spider):
         self.skipped_count = 0
         # Skip debug logging for speed - only log errors
         self.enable_debug = False  # Disable debug logging for maximum speed
+        # Optional listing URL override, e.g. a local stub: -a start_url=http://127.0.0.1:8000/companies
+        start_url = kwargs.get('start_url')
+        if start_url:
+            self.start_urls = [start_url]
+            self.allowed_domains = self.allowed_domains + [urlparse(start_url).hostname]
+        # Distributed mode: -a role=coordinator discovers companies, -a role=worker parses them (see frontier.py)
+        self.role = kwargs.get('role')
+        if self.role not in (None, 'coordinator', 'worker'):
+            raise ValueError(f"Unknown role {self.role!r} - use 'coordinator' or 'worker'")
+        self.frontier = None
+        # Sharded crawl: -a batches="Winter 2026,F25" crawls exactly those batches (see launcher.py)
+        self.batches = None
+        if kwargs.get('batches'):
+            self.batches = frozenset(normalize_batch(b) for b in kwargs['batches'].split(','))
+            unknown = self.batches - set(TARGET_BATCHES)
+            if unknown:
+                raise ValueError(f"Unknown batches {kwargs['batches']!r} - choose from {', '.join(TARGET_BATCHES)}")
+        # Delta run: -a delta=1 only schedules companies missing from the last listing snapshot (snapshots.py)
+        self.delta = str(kwargs.get('delta', '')).lower() in ('1', 'true', 'yes')
+        self.discovered = {}  # listing filter key -> company keys found on it this run
+        self._known_cache = {}
+        self.streamed_keys = set()  # Company keys the listing render already streamed (listing_links_found)
+        self.opened_at = time.perf_counter()
+        # Discovery source: -a discovery=sitemap reads the sitemap over plain HTTP instead of rendering the listing
+        self.discovery = kwargs.get('discovery') or 'listing'
+        if self.discovery not in ('listing', 'sitemap'):
+            raise ValueError(f"Unknown discovery {self.discovery!r} - use 'listing' or 'sitemap'")
+        self.sitemap_url = kwargs.get('sitemap_url')
+        if not self.sitemap_url and start_url:
+            self.sitemap_url = urljoin(start_url, '/sitemap.xml')
+        if self.sitemap_url:
+            self.allowed_domains = self.allowed_domains + [urlparse(self.sitemap_url).hostname]
     
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
         spider = super(YcCompaniesSpider, cls).from_crawler(crawler, *args, **kwargs)
+        # Optional process pool for detail parsing - 0 keeps it on the reactor thread
+        spider.detail_pool = None
+        workers = crawler.settings.getint('DETAIL_PARSE_WORKERS', 0)
+        if workers > 0:
+            from yc_scraper.parallel import DetailParserPool
+            spider.detail_pool = DetailParserPool(workers)
+            print(f'Parsing detail pages in {workers} worker processes')
+        if spider.role:
+            from yc_scraper.frontier import open_frontier
+            spider.frontier = open_frontier(crawler.settings)
+            spider.worker_id = f'{socket.gethostname()}-{os.getpid()}'
+            spider.lease_batch = crawler.settings.getint('FRONTIER_LEASE_BATCH', 64)
+            spider.lease_seconds = crawler.settings.getint('FRONTIER_LEASE_SECONDS', 300)
+            if spider.role == 'worker':
+                crawler.signals.connect(spider.frontier_idle, signal=signals.spider_idle)
+            print(f"Distributed mode: {spider.role} {spider.worker_id}, frontier {crawler.settings.get('FRONTIER_URI')}")
+        spider.snapshots = ListingSnapshots.from_settings(crawler.settings)
+        # Hybrid detail parsing: incomplete static pages are re-queued through Playwright once
+        spider.render_fallback = crawler.settings.getbool('DETAIL_RENDER_FALLBACK', True)
+        # Newest confirmed target batches first, cards without a batch last (scheduling.py)
+        spider.priority_policy = BatchPriorityPolicy.from_crawler(crawler)
+        crawler.signals.connect(spider.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(spider.item_scraped, signal=signals.item_scraped)
+        if spider.discovery == 'sitemap':
+            spider.sitemap_url = spider.sitemap_url or crawler.settings.get('SITEMAP_URL')
+            print(f'Sitemap discovery: {spider.sitemap_url}')
+        if spider.delta:
+            print(f"Delta mode: only companies not in {spider.snapshots.path} are scheduled")
         return spider
+
+    @property
+    def detail_callback(self):
+        """Callback for company detail requests - pooled when DETAIL_PARSE_WORKERS > 0"""
+        if getattr(self, 'detail_pool', None):
+            return self.parse_company_detail_pooled
+        return self.parse_company_detail
     
+    def start_requests(self):
+        """Normal crawl starts from the listing; -a retry_file= re-fetches URLs that failed last time"""
+        if self.role == 'worker':
+            yield from self._lease_requests()
+            return
+
+        retry_file = getattr(self, 'retry_file', None)
+        if not retry_file and self.discovery == 'sitemap':
+            # The sitemap has no batch filter - shards fetch every company and filter on the detail page
+            yield scrapy.Request(self.sitemap_url, callback=self.parse_sitemap, meta={'discovery': True}, dont_filter=True)
+            return
+        if not retry_file and self.batches:
+            # The directory filters its listing by ?batch=, so each shard only renders its own companies
+            for url in self.start_urls:
+                for batch in sorted(self.batches):
+                    separator = '&' if '?' in url else '?'
+                    listing_url = f'{url}{separator}batch={quote(batch)}'
+                    yield scrapy.Request(listing_url, meta={'listing_batch': batch, **self._listing_meta(listing_url)},
+                                         dont_filter=True)
+            return
+        if not retry_file:
+            for url in self.start_urls:
+                yield scrapy.Request(url, meta=self._listing_meta(url), dont_filter=True)
+            return
+
+        records = []
+        with open(retry_file, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+        print(f'Retrying {len(records)} failed URLs from {retry_file}...')
+        self.logger.info(f'Loaded {len(records)} failed URLs from {retry_file}')
+
+        for record in records:
+            name = record.get('callback') or 'parse_company_detail'
+            if name.startswith('parse_company_detail'):
+                # A pooled run records parse_company_detail_pooled - this run may have no pool
+                callback = self.detail_callback
+            else:
+                callback = getattr(self, name, self.detail_callback)
+            yield scrapy.Request(
+                record['url'],
+                callback=callback,
+                meta={'batch_from_card': record.get('batch_from_card')},
+                dont_filter=True,
+            )
+
+    def _listing_meta(self, url):
+        """Listing requests are discovery (a time budget never sheds them early); delta runs
+        also tell the listing renderer which companies it can stop scrolling at"""
+        filter_key = listing_filter_key(url)
+        if not self.delta or not self.snapshots.has(filter_key):
+            return {'discovery': True}
+        return {'discovery': True, 'delta_known_slugs': self.snapshots.known(filter_key)}
+
+    def _lease_requests(self):
+        """Worker: lease the next batch of company URLs from the frontier"""
+        entries = self.frontier.lease(self.worker_id, self.lease_batch, self.lease_seconds)
+        if entries:
+            print(f'Leased {len(entries)} companies from the frontier')
+        for entry in entries:
+            yield scrapy.Request(
+                entry['url'],
+                callback=self.detail_callback,
+                errback=self.frontier_errback,
+                meta={'batch_from_card': entry['batch_hint'], 'frontier_key': entry['key']},
+                dont_filter=True,  # The frontier already deduplicated across nodes
+                priority=entry['priority'],
+            )
+
+    def frontier_idle(self, spider):
+        """Worker: refill from the frontier when the local queue drains; close once the frontier is drained"""
+        requests = list(self._lease_requests())
+        for request in requests:
+            self.crawler.engine.crawl(request)
+        if requests or not self.frontier.is_drained():
+            # Nothing leasable yet means the coordinator is still discovering or other
+            # workers hold leases (which expire if they died) - poll again on the next idle
+            raise DontCloseSpider
+
+    def frontier_errback(self, failure):
+        """Worker: hand a failed company back to the frontier for another node to try"""
+        if failure.check(IgnoreRequest):
+            return  # Parked by FailureQueueMiddleware - it re-drives the request itself
+        self.frontier.fail(failure.request.meta['frontier_key'], repr(failure.value))
+
+    def _frontier_done(self, response):
+        """Worker: a company that produced no item is still finished"""
+        if self.frontier is not None and response.meta.get('frontier_key'):
+            self.frontier.ack(response.meta['frontier_key'])
+
     def _write_debug(self, message):
         """Helper method to write to debug log - disabled for speed"""
         if not getattr(self, 'enable_debug', False):
@@ -35,72 +212,47 @@ class YcCompaniesSpider(scrapy.Spider):
     
     def closed(self, reason):
         """Called when spider closes"""
+        if getattr(self, 'detail_pool', None):
+            self.detail_pool.close()
+        if getattr(self, 'frontier', None) is not None:
+            if self.role == 'coordinator' and reason == 'finished':
+                self.frontier.mark_discovery_done()
+                print(f'Discovery done - {self.frontier.counts()} in the frontier')
+            self.frontier.close()
+        stats = self.crawler.stats
+        rendered = stats.get_value('detail/rendered', 0)
+        parsed = rendered + stats.get_value('detail/static', 0)
+        if parsed:
+            # The rendered path costs a browser page per company - it should stay the exception
+            stats.set_value('detail/rendered_ratio', round(rendered / parsed, 4))
+            if stats.get_value('detail/render_requeued'):
+                print(f"Detail pages: {parsed - rendered} static, {rendered} rendered "
+                      f"({stats.get_value('detail/render_requeued')} re-queued as incomplete)")
+        if self.discovered and reason == 'finished':
+            # Only complete runs - an interrupted one may not have fetched what it discovered
+            for filter_key, slugs in self.discovered.items():
+                new = self.snapshots.record(filter_key, slugs)
+                print(f'Listing snapshot [{filter_key}]: {len(slugs)} companies seen, {len(new)} new')
+            try:
+                self.snapshots.save()
+            except OSError as e:
+                self.logger.error(f'Could not save listing snapshot {self.snapshots.path}: {e}')
         print(f"\n=== Scraping Complete ===")
         print(f"Processed: {getattr(self, 'processed_count', 0)} companies (Target batches: Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024)")
         print(f"Skipped: {getattr(self, 'skipped_count', 0)} companies (not in target batches)")
 
     def _is_valid_name(self, text, existing_names):
         """Validate if extracted text is a plausible founder name"""
-        if not text or not isinstance(text, str):
-            return False
-        text = text.strip()
-        if len(text) < 2 or len(text) > 80:
-            return False
-        
-        # Exclude common non-name words
-        exclude_words = ['founder', 'founders', 'active founders', 'co-founder', 'co-founders',
-                        'linkedin', 'twitter', 'http', 'https', 'www', 'ycombinator',
-                        'based', 'located', 'company', 'website', 'email', 'contact',
-                        'click', 'here', 'more', 'read', 'view', 'profile',
-                        'tl;dr', 'our ask', 'our story', 'why we', 'problem', 'solution',
-                        'the knowledge', 'we are working']
-        text_lower = text.lower()
-        if any(word in text_lower for word in exclude_words):
-            return False
-        if 'http' in text_lower or text_lower.startswith('www.') or '@' in text:
-            return False
-        if text in existing_names:
-            return False
-        
-        words = text.split()
-        word_count = len(words)
-        # Allow single word names if they're at least 4 chars (some people have single names)
-        if word_count < 1 or word_count > 5:
-            return False
-        if word_count == 1 and len(words[0]) < 3:
-            return False
-        
-        # Must have at least one capital letter (proper name)
-        has_capital = any(any(c.isupper() for c in word) for word in words)
-        if not has_capital:
-            return False
-        
-        # First word should start with capital
-        if words and not words[0][0].isupper():
-            return False
-        
-        # Filter out names that are clearly IDs or usernames (all lowercase with numbers)
-        if word_count == 1 and words[0].islower() and any(c.isdigit() for c in words[0]):
-            # Single lowercase word with numbers is likely a username, not a name
-            if len([c for c in words[0] if c.isdigit()]) >= 2:
-                return False
-        
-        # Exclude common words that aren't names
-        common_words = ['the', 'and', 'or', 'but', 'for', 'with', 'from', 'about']
-        if all(word.lower() in common_words for word in words):
-            return False
-        
-        # Must contain at least one letter
-        if not any(c.isalpha() for c in text):
-            return False
-        
-        return True
+        return is_valid_name(text, existing_names)
 
     def _extract_batch_from_listing_card(self, element):
         """Try to extract batch/year info from a company card - Target batches only"""
         # Get minimal text for speed
-        card_text = ' '.join(element.css('::text').getall())
-        card_text = ' '.join(card_text.split())  # Normalize whitespace
+        return self._batch_from_card_text(' '.join(element.css('::text').getall()))
+
+    def _batch_from_card_text(self, card_text):
+        """Batch from a card's text - the target batch, 'SKIP' for another batch, None if unknown"""
+        card_text = ' '.join((card_text or '').split())  # Normalize whitespace
         
         # Check for target batch patterns: Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024
         batch_patterns = [
@@ -126,9 +278,17 @@ class YcCompaniesSpider(scrapy.Spider):
         self.logger.info(f'Parsing page: {response.url}')
         print(f'Parsing companies listing page...')
         
+        cards = response.meta.get('listing_cards')
+        if cards:
+            yield from self._parse_listing_cards(response, cards)
+            return
+        
         # Try multiple selector strategies - the page structure may vary
+        # seen_urls holds canonical company keys (dedup.py), so relative/absolute,
+        # http/https, trailing-slash and query-string variants count once
         all_companies = []
         seen_urls = set()
+        link_variants = set()  # Distinct company URLs as Scrapy's URL fingerprint would see them
         
         # Strategy 1: CSS selector - FAST
         company_links = response.css('a[href*="/companies/"]')
@@ -136,12 +296,12 @@ class YcCompaniesSpider(scrapy.Spider):
         for element in company_links:
             href = element.css('::attr(href)').get() or ''
             if href and '/companies/' in href and 'companies?' not in href:
-                parts = href.split('/companies/')
-                if len(parts) > 1:
-                    company_slug = parts[-1].split('?')[0].split('#')[0].strip()
-                    if company_slug and company_slug not in seen_urls and company_slug != 'companies':
-                        seen_urls.add(company_slug)
-                        all_companies.append(element)
+                company_slug = canonical_company_key(response.urljoin(href))
+                if company_slug:
+                    link_variants.add(response.urljoin(href).split('#')[0])
+                if company_slug and company_slug not in seen_urls:
+                    seen_urls.add(company_slug)
+                    all_companies.append(element)
         
         # Strategy 2: XPath fallback if CSS didn't work
         if not all_companies:
@@ -149,44 +309,38 @@ class YcCompaniesSpider(scrapy.Spider):
             for element in xpath_links:
                 href = element.xpath('./@href').get() or ''
                 if href:
-                    parts = href.split('/companies/')
-                    if len(parts) > 1:
-                        company_slug = parts[-1].split('?')[0].split('#')[0].strip()
-                        if company_slug and company_slug not in seen_urls and company_slug != 'companies':
-                            seen_urls.add(company_slug)
-                            all_companies.append(element)
+                    company_slug = canonical_company_key(response.urljoin(href))
+                    if company_slug:
+                        link_variants.add(response.urljoin(href).split('#')[0])
+                    if company_slug and company_slug not in seen_urls:
+                        seen_urls.add(company_slug)
+                        all_companies.append(element)
         
         # Strategy 3: Regex fallback - extract from HTML directly (ALWAYS use this - most reliable)
-        html_text = response.text
-        # Find all /companies/ URLs in the HTML - more comprehensive pattern
-        company_urls = re.findall(r'["\']([^"\']*\/companies\/[^"\'\?\s&<>]+)', html_text)
-        # Also try without quotes
-        company_urls2 = re.findall(r'href=["\']?([^"\'\s<>]*\/companies\/[^"\'\?\s&<>]+)', html_text, re.IGNORECASE)
-        company_urls.extend(company_urls2)
-        
-        for url in company_urls:
-            if 'companies?' not in url and '/companies/' in url:
-                # Filter out image files and other non-company URLs
-                excluded_extensions = ['.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.ico', '.css', '.js', '.json']
-                if any(url.lower().endswith(ext) for ext in excluded_extensions):
-                    continue
-                
-                parts = url.split('/companies/')
-                if len(parts) > 1:
-                    company_slug = parts[-1].split('?')[0].split('#')[0].strip()
-                    # Filter out invalid slugs (images, files, etc.)
-                    if company_slug and company_slug not in seen_urls and company_slug != 'companies' and len(company_slug) > 1:
-                        # Exclude if it looks like a file (has extension)
-                        if '.' in company_slug and any(company_slug.lower().endswith(ext) for ext in excluded_extensions):
-                            continue
-                        seen_urls.add(company_slug)
-                        # Create a mock element dict for consistency
-                        full_url = response.urljoin(url if url.startswith('http') else f'/companies/{company_slug}')
-                        all_companies.append({'href': url, 'url': full_url})
+        # One pass over the raw bytes - a fully scrolled listing is several MB
+        for url in iter_company_hrefs(response.body, response.encoding):
+            if '/companies/' in url:
+                # canonical_company_key also rejects image files and other non-company URLs
+                full_url = response.urljoin(url)
+                company_slug = canonical_company_key(full_url)
+                if company_slug:
+                    link_variants.add(full_url.split('#')[0])
+                if company_slug and company_slug not in seen_urls:
+                    seen_urls.add(company_slug)
+                    # Create a mock element dict for consistency
+                    all_companies.append({'href': url, 'url': full_url})
+        
+        # Variant URLs of the same company that would each have been fetched without canonical keys
+        self.crawler.stats.inc_value('dedup/duplicate_requests_avoided', len(link_variants) - len(seen_urls))
+        
+        filter_key = listing_filter_key(response.url)
+        self.discovered.setdefault(filter_key, set()).update(seen_urls)
+        known = self._known(filter_key)
+        if self.delta and not self.snapshots.has(filter_key):
+            print(f'Delta mode: no snapshot for [{filter_key}] yet - scheduling everything')
         
         print(f'✅ Found {len(all_companies)} total company links - filtering to target batches (Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024)...')
         
-        processed_urls = set()
         company_count = 0
         filtered_count = 0
         
@@ -200,432 +354,278 @@ class YcCompaniesSpider(scrapy.Spider):
             if not company_link:
                 continue
             
-            if not company_link.startswith('http'):
-                company_link = response.urljoin(company_link)
-                
-            if '/companies/' in company_link and company_link not in processed_urls:
-                # Extract batch from card - FAST filter (skip for dict elements)
-                batch_from_card = None
-                if not isinstance(element, dict):
-                    batch_from_card = self._extract_batch_from_listing_card(element)
-                
-                # STRICT 2024-2026 ONLY FILTERING: Skip if not 2024-2026
-                if batch_from_card == 'SKIP':
-                    filtered_count += 1
+            company_link = canonical_company_url(response.urljoin(company_link))
+            if not company_link:
+                continue
+            
+            company_key = canonical_company_key(company_link)
+            if company_key in self.streamed_keys:
+                continue  # Already handled while the listing was still scrolling
+            
+            if known and company_key in known:
+                self.crawler.stats.inc_value('delta/known_skipped')  # Fetched by an earlier run
+                continue
+            
+            # Extract batch from card - FAST filter (skip for dict elements)
+            batch_from_card = None
+            if not isinstance(element, dict):
+                batch_from_card = self._extract_batch_from_listing_card(element)
+            
+            scheduled, request = self._company_request(company_link, batch_from_card, response.meta)
+            if not scheduled:
+                filtered_count += 1
+                continue
+            
+            company_count += 1
+            if company_count % 50 == 0:
+                print(f'Queued {company_count} companies for processing (filtered {filtered_count} not 2024-2026)...')
+            if request is not None:
+                yield request
+        
+        if self.delta:
+            self.crawler.stats.inc_value('delta/new_companies', company_count)
+        print(f'Total: {company_count} companies queued, {filtered_count} filtered out on listing page')
+
+    def _parse_listing_cards(self, response, cards):
+        """[slug, name, batch label] cards extracted in the browser (PLAYWRIGHT_LISTING_EXTRACTION = 'cards')"""
+        filter_key = listing_filter_key(response.url)
+        if self.delta and not self.snapshots.has(filter_key):
+            print(f'Delta mode: no snapshot for [{filter_key}] yet - scheduling everything')
+        print(f'✅ Found {len(cards)} company cards - filtering to target batches (Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024)...')
+        company_count, requests = self._schedule_listing_links(
+            response.url, response.meta, ((f'/companies/{slug}', batch, name) for slug, name, batch in cards))
+        yield from requests
+        print(f'Total: {company_count} companies queued from {len(cards)} cards')
+
+    def _company_request(self, company_link, batch_from_card, listing_meta, company_name=None):
+        """Card-level batch filter and scheduling, shared by parse() and streamed listing links.
+
+        Returns (scheduled, request) - scheduled is False if the card rules the company
+        out; request is None if a coordinator pushed it to the frontier instead.
+        """
+        # STRICT 2024-2026 ONLY FILTERING: Skip if not 2024-2026
+        if batch_from_card == 'SKIP':
+            return False, None
+        
+        # Skip if we determined it's not 2024-2026
+        if batch_from_card and not self._is_target_batch(batch_from_card):
+            return False, None
+        
+        if self.batches:
+            card_batch = normalize_batch(batch_from_card)
+            if card_batch and card_batch not in self.batches:
+                return False, None
+            if not card_batch and listing_meta.get('listing_batch'):
+                batch_from_card = listing_meta['listing_batch'].upper()
+        
+        # If we have batch info and it's 2024+, proceed
+        # If no batch info, we'll check on detail page
+        priority = self.priority_policy.priority(company_link, batch_from_card)
+        if self.role == 'coordinator':
+            # Workers fetch it - the frontier key is the shared dedup set across nodes
+            if not self.frontier.push(canonical_company_key(company_link), company_link, batch_from_card, priority):
+                self.crawler.stats.inc_value('dedup/duplicate_requests_avoided')
+            return True, None
+
+        # Only what the detail callback needs - the item is built there, so queued requests stay small
+        meta = {'batch_from_card': batch_from_card}
+        if company_name:
+            meta['card_name'] = company_name  # From the listing card - used only if the detail page has no name
+        return True, scrapy.Request(
+            company_link,
+            callback=self.detail_callback,
+            meta=meta,
+            dont_filter=False,
+            priority=priority
+        )
+
+    def parse_sitemap(self, response):
+        """Sitemap index or urlset (plain or gzipped): follow nested sitemaps, schedule company URLs like parse()"""
+        stats = self.crawler.stats
+        filter_key = listing_filter_key(self.start_urls[0])  # Every company, like the unfiltered listing
+        known = self._known(filter_key)
+        discovered = self.discovered.setdefault(filter_key, set())
+        company_count = 0
+        filtered_count = 0
+        try:
+            for kind, loc in iter_sitemap(response.body):
+                if kind == 'sitemap':
+                    stats.inc_value('sitemap/nested')
+                    yield scrapy.Request(response.urljoin(loc), callback=self.parse_sitemap, meta={'discovery': True},
+                                         dont_filter=True)
                     continue
-                
-                # Skip if we determined it's not 2024-2026
-                if batch_from_card and batch_from_card != 'SKIP' and not self._is_target_batch(batch_from_card):
+                if not is_company_url(loc):
+                    continue
+                company_link = canonical_company_url(response.urljoin(loc))
+                company_key = canonical_company_key(company_link) if company_link else None
+                if not company_key or company_key in discovered:
+                    continue
+                discovered.add(company_key)
+                stats.inc_value('sitemap/companies')
+                if company_key in known:
+                    stats.inc_value('delta/known_skipped')
+                    continue
+                # No card text in a sitemap - the batch is checked on the detail page
+                scheduled, request = self._company_request(company_link, None, response.meta)
+                if not scheduled:
                     filtered_count += 1
                     continue
-                
-                # If we have batch info and it's 2024+, proceed
-                # If no batch info, we'll check on detail page
-                full_url = response.urljoin(company_link)
-                processed_urls.add(company_link)
-                
                 company_count += 1
-                if company_count % 50 == 0:
-                    print(f'Queued {company_count} companies for processing (filtered {filtered_count} not 2024-2026)...')
-                
-                item = YcCompanyItem()
-                yield scrapy.Request(
-                    full_url,
-                    callback=self.parse_company_detail,
-                    meta={'item': item, 'batch_from_card': batch_from_card},
-                    dont_filter=False,
-                    priority=1 if batch_from_card and batch_from_card != 'SKIP' and self._is_target_batch(batch_from_card) else 0
-                )
-        
-        print(f'Total: {company_count} companies queued, {filtered_count} filtered out on listing page')
+                if request is not None:
+                    yield request
+        except (etree.XMLSyntaxError, OSError, EOFError) as e:
+            # Truncated or corrupt sitemap (OSError/EOFError from gzip) - keep what was scheduled so far
+            self.logger.error(f'Could not parse sitemap {response.url}: {e}')
+            stats.inc_value('sitemap/errors')
+        stats.inc_value('sitemap/fetched')
+        if self.delta:
+            stats.inc_value('delta/new_companies', company_count)
+        print(f'Sitemap {response.url}: {company_count} companies queued, {filtered_count} filtered out')
+
+    def listing_links_found(self, listing_request, links):
+        """PlaywrightMiddleware streams [href, card text] pairs while the listing scrolls - schedule them now"""
+        stats = self.crawler.stats
+        scheduled_count, requests = self._schedule_listing_links(
+            listing_request.url, listing_request.meta, ((href, card_text, None) for href, card_text in links))
+        for request in requests:
+            self.crawler.engine.crawl(request)
+        if scheduled_count:
+            if not stats.get_value('listing/streamed_companies'):
+                stats.set_value('listing/first_company_seconds', round(time.perf_counter() - self.opened_at, 2))
+            stats.inc_value('listing/streamed_companies', scheduled_count)
+
+    def _schedule_listing_links(self, listing_url, listing_meta, links):
+        """(href, card text, company name) triples -> (scheduled count, requests), after the dedup,
+        delta and card batch filters. Marks the companies handled, so parse() skips them later."""
+        filter_key = listing_filter_key(listing_url)
+        known = self._known(filter_key)
+        discovered = self.discovered.setdefault(filter_key, set())
+        scheduled_count = 0
+        requests = []
+        for href, card_text, company_name in links:
+            company_link = canonical_company_url(urljoin(listing_url, href))
+            company_key = canonical_company_key(company_link) if company_link else None
+            if not company_key or company_key in self.streamed_keys:
+                continue
+            self.streamed_keys.add(company_key)
+            discovered.add(company_key)
+            if company_key in known:
+                self.crawler.stats.inc_value('delta/known_skipped')
+                continue
+            scheduled, request = self._company_request(
+                company_link, self._batch_from_card_text(card_text), listing_meta, company_name)
+            if not scheduled:
+                continue
+            scheduled_count += 1
+            if request is not None:
+                requests.append(request)
+        if scheduled_count and self.delta:
+            self.crawler.stats.inc_value('delta/new_companies', scheduled_count)
+        return scheduled_count, requests
+
+    def _known(self, filter_key):
+        """Snapshot keys of a listing in delta runs (empty otherwise), built once per filter"""
+        if not self.delta:
+            return set()
+        if filter_key not in self._known_cache:
+            self._known_cache[filter_key] = self.snapshots.known(filter_key)
+        return self._known_cache[filter_key]
+
+    def spider_opened(self, spider):
+        self.opened_at = time.perf_counter()
+
+    def item_scraped(self, item, response, spider):
+        """time_to_first_item_seconds - how long discovery keeps the pipelines waiting"""
+        if self.crawler.stats.get_value('time_to_first_item_seconds') is None:
+            self.crawler.stats.set_value('time_to_first_item_seconds', round(time.perf_counter() - self.opened_at, 2))
 
     def _extract_batch_year(self, response):
         """Extract the batch/year information from the company page - COMPREHENSIVE"""
-        # Check page text - look for target batch patterns
-        page_text = response.text[:100000]  # Check more text for better detection
-        
-        # Target batch patterns - comprehensive matching
-        target_patterns = [
-            r'(Winter|Fall|Summer|Spring)\s+20(24|25|26)',  # Full names: Winter 2026, Fall 2025, etc.
-            r'(W|F|S|SP)(24|25|26)',  # Batch codes: W26, F25, S25, W25, F24, S24
-            r'20(24|25|26)',  # Years: 2024, 2025, 2026
-        ]
-        
-        for pattern in target_patterns:
-            matches = re.findall(pattern, page_text, re.IGNORECASE)
-            if matches:
-                # Get the full match, not just groups
-                full_match = re.search(pattern, page_text, re.IGNORECASE)
-                if full_match:
-                    batch = full_match.group(0)
-                    if self._is_target_batch(batch):
-                        return batch.upper()
-        
-        # Try CSS selectors for batch information
-        batch_selectors = [
-            '[class*="batch"]::text',
-            '[data-batch]::attr(data-batch)',
-            '[class*="Batch"]::text',
-            '[class*="BATCH"]::text',
-            'span::text',  # Sometimes batch is in a span
-            'div::text',   # Sometimes batch is in a div
-        ]
-        
-        for selector in batch_selectors:
-            try:
-                batch_elements = response.css(selector).getall()
-                for elem in batch_elements:
-                    if elem:
-                        elem_text = elem.strip().upper()
-                        # Check if this text contains a target batch
-                        if self._is_target_batch(elem_text):
-                            return elem_text
-                        # Also check if it contains batch patterns
-                        for pattern in target_patterns:
-                            match = re.search(pattern, elem_text, re.IGNORECASE)
-                            if match:
-                                batch = match.group(0)
-                                if self._is_target_batch(batch):
-                                    return batch.upper()
-            except:
-                continue
-        
-        return ''
+        return extract_batch_year(response)
     
     def _is_target_batch(self, batch_text):
         """Check if the batch matches target batches: Winter 2026, Fall 2025, Summer 2025, Spring 2025, Winter 2025, Fall 2024, Summer 2024"""
-        if not batch_text:
-            return False  # STRICT: If we can't determine, skip it
-        
-        batch_text = batch_text.upper().strip()
-        
-        # Target batches to scrape - check for any match
-        # Winter 2026
-        if re.search(r'WINTER\s*2026|W26', batch_text):
-            return True
-        
-        # Fall 2025, Summer 2025, Spring 2025, Winter 2025
-        if re.search(r'(FALL|SUMMER|SPRING|WINTER)\s*2025', batch_text):
-            return True
-        if re.search(r'(F|S|SP|W)25', batch_text):  # F25, S25, SP25, W25
-            return True
-        
-        # Fall 2024, Summer 2024
-        if re.search(r'(FALL|SUMMER)\s*2024', batch_text):
-            return True
-        if re.search(r'(F|S)24', batch_text):  # F24, S24
-            return True
-        
-        # Also check for standalone years if they appear with season context elsewhere
-        # But be more lenient - if it's 2024, 2025, or 2026, check surrounding context
-        if re.search(r'\b20(24|25|26)\b', batch_text):
-            # If we see a year, check if there's any season indicator nearby
-            # This is a fallback for cases where batch format is different
-            if any(season in batch_text for season in ['FALL', 'SUMMER', 'SPRING', 'WINTER', 'F', 'S', 'W', 'SP']):
-                year_match = re.search(r'20(24|25|26)', batch_text)
-                if year_match:
-                    year = int(year_match.group(0))
-                    # Only accept if it's 2024, 2025, or 2026
-                    if year in [2024, 2025, 2026]:
-                        return True
-        
-        # Everything else is excluded
-        return False
+        return is_target_batch(batch_text)
 
     def parse_company_detail(self, response):
         """Parse individual company detail page - FAST with 2024+ filtering"""
-        item = response.meta.get('item', YcCompanyItem())
-        batch_from_card = response.meta.get('batch_from_card')
-        
-        # EARLY FILTERING: Check batch before processing - FAST
-        # If we already know it's pre-2024 from listing, skip immediately
-        if batch_from_card == 'PRE_2024':
-            self.skipped_count += 1
+        item = self._new_item(response)
+        if self._early_aborted(response):
+            yield from self._item_from_detail(response, item, {'status': 'off_target', 'batch': response.meta['early_abort_batch']})
             return
-        
-        # Extract batch from page quickly and filter
-        batch_text = self._extract_batch_year(response)
-        
-        # FILTERING: Only target batches - skip everything else
-        if not batch_text:
-            # No batch found - skip it (STRICT)
+        started = time.perf_counter()
+        # No card name here - the page's own name wins, as in the pooled path (_item_from_detail)
+        data = extract_company_detail(response, response.meta.get('batch_from_card'), batches=self.batches)
+        # Average full-parse cost - EarlyAbortExtension reports the time its skipped pages saved
+        self.crawler.stats.inc_value('detail/parse_seconds_total', time.perf_counter() - started)
+        self.crawler.stats.inc_value('detail/parse_count')
+        yield from self._item_from_detail(response, item, data)
+
+    def _new_item(self, response):
+        """Item for a detail page, pre-filled with the listing card's name as a fallback for the page's own"""
+        item = YcCompanyItem()
+        if response.meta.get('card_name'):
+            item['company_name'] = response.meta['card_name']
+        return item
+
+    def _early_aborted(self, response):
+        """EarlyAbortExtension stopped the download at an off-target batch marker (early_abort.py)"""
+        return 'download_stopped' in response.flags and bool(response.meta.get('early_abort_batch'))
+
+    async def parse_company_detail_pooled(self, response):
+        """Same as parse_company_detail, but the extraction runs in the DETAIL_PARSE_WORKERS process pool"""
+        item = self._new_item(response)
+        if self._early_aborted(response):
+            for result in self._item_from_detail(response, item, {'status': 'off_target', 'batch': response.meta['early_abort_batch']}):
+                yield result
+            return
+        data = await self.detail_pool.submit(
+            response.url, response.body, response.encoding, response.meta.get('batch_from_card'), self.batches)
+        for result in self._item_from_detail(response, item, data):
+            yield result
+
+    def _item_from_detail(self, response, item, data):
+        """Turn an extract_company_detail() result into an item and keep the counters"""
+        status = data['status']
+        stats = self.crawler.stats
+        stats.inc_value('detail/rendered' if 'rendered' in response.flags else 'detail/static')
+        # Neither a target batch nor any founder link - the static HTML may simply lack what JS adds.
+        # (no_batch also covers off-target companies, but their pages still list founders)
+        if status == 'no_batch':
+            incomplete = b'linkedin.com/in/' not in response.body
+        else:
+            incomplete = status == 'ok' and not data.get('founders')
+        if incomplete and not response.meta.get('render'):
+            stats.inc_value('detail/static_incomplete')
+            if getattr(self, 'render_fallback', False):
+                stats.inc_value('detail/render_requeued')
+                request = response.request.replace(dont_filter=True)
+                for key in FETCH_META:
+                    request.meta.pop(key, None)
+                request.meta['render'] = 'playwright'  # Once - a failed render comes back as a static page
+                yield request
+                return
+        if status != 'ok':
+            self._frontier_done(response)
             self.skipped_count += 1
-            if self.skipped_count % 10 == 0:
+            if status == 'no_batch' and self.skipped_count % 10 == 0:
                 print(f'Skipped {self.skipped_count} companies (no batch found)...')
+            elif status == 'off_target' and self.skipped_count % 10 == 0:
+                print(f'Skipped {self.skipped_count} companies (batch: {data["batch"]}, not in target batches)...')
             return
         
-        # Check if batch is one of our target batches
-        if not self._is_target_batch(batch_text):
-            self.skipped_count += 1
-            if self.skipped_count % 10 == 0:
-                print(f'Skipped {self.skipped_count} companies (batch: {batch_text}, not in target batches)...')
-            return  # Skip everything that's not in target batches
-        
         # Log successful match for debugging
         if self.processed_count % 10 == 0:
-            print(f'✅ Processing company from batch: {batch_text}')
+            print(f'✅ Processing company from batch: {data["batch"]}')
         
         self.processed_count += 1
         
-        # Extract company name if not already set
-        if not item.get('company_name'):
-            company_name = (
-                response.css('h1::text, h2::text, [class*="company-name"]::text, [class*="CompanyName"]::text').get() or
-                response.css('title::text').get()
-            )
-            if company_name:
-                item['company_name'] = company_name.strip().replace(' | Y Combinator', '').strip()
-        
-        company_name = item.get('company_name', 'Unknown')
-        
-        # Extract company website - look for the actual company website link
-        # Exclude YC, social media, and other common non-company links
-        excluded_domains = [
-            'ycombinator.com', 'linkedin.com', 'twitter.com', 'x.com', 
-            'startupschool.org', 'bookface-static.ycombinator.com',
-            'bookface-images.s3', 'facebook.com', 'instagram.com',
-            'youtube.com', 'google.com', 'maps.googleapis.com'
-        ]
-        
-        company_website = ''
-        
-        # Try to find website link near company name/section
-        # Look for links that are clearly the company's main website
-        website_selectors = [
-            'a[href^="http"]:not([href*="ycombinator"]):not([href*="linkedin"]):not([href*="twitter"]):not([href*="x.com"]):not([href*="startupschool"]):not([href*="bookface"]):not([href*="facebook"]):not([href*="instagram"]):not([href*="youtube"]):not([href*="maps"])::attr(href)',
-            '[data-website]::attr(data-website)',
-            '.website a::attr(href)',
-            'a.website::attr(href)',
-            'a[href*="http"]:not([href*="ycombinator"]):not([href*="linkedin"]):not([href*="twitter"]):not([href*="x.com"]):not([href*="startupschool"]):not([href*="bookface"])::attr(href)'
-        ]
-        
-        for selector in website_selectors:
-            links = response.css(selector).getall()
-            for link in links:
-                if link and link.startswith('http'):
-                    # Check if it's not in excluded domains
-                    is_excluded = any(domain in link.lower() for domain in excluded_domains)
-                    if not is_excluded:
-                        company_website = link
-                        break
-            if company_website:
-                break
-        
-        item['company_website'] = company_website.strip() if company_website else ''
-        
-        # Extract founder information - PRIMARY METHOD: Extract from LinkedIn URL slugs
-        founders_names = []
-        founders_linkedin = []
-        founders_twitter = []
-        
-        # Get all unique LinkedIn links
-        linkedin_urls = response.css('a[href*="linkedin.com/in/"]::attr(href)').getall()
-        linkedin_urls = [url for url in linkedin_urls if url and 'ycombinator.com' not in url]
-        
-        # Remove duplicates while preserving order
-        seen_urls = set()
-        unique_linkedin_urls = []
-        for url in linkedin_urls:
-            # Normalize URL (remove query params, trailing slash)
-            normalized = url.split('?')[0].rstrip('/')
-            if normalized not in seen_urls:
-                seen_urls.add(normalized)
-                unique_linkedin_urls.append(normalized)
-        
-        # Removed debug logging for speed
-        
-        # PRIMARY METHOD: Extract names from LinkedIn URL slugs
-        # LinkedIn URLs like "linkedin.com/in/emre-kaplaner-7b3a3b15b/" contain the name in the slug
-        for linkedin_url in unique_linkedin_urls:
-            # Extract username from LinkedIn URL: linkedin.com/in/username or linkedin.com/in/username-ID
-            match = re.search(r'linkedin\.com/in/([^/?]+)', linkedin_url, re.IGNORECASE)
-            if match:
-                slug = match.group(1)
-                # Remove ID suffix - LinkedIn IDs are often alphanumeric strings at the end
-                # Pattern: name-name-XXXXXXXX where X is alphanumeric (usually 8+ chars)
-                
-                slug_parts = slug.split('-')
-                name_parts = []
-                
-                # Work forwards and stop when we hit an ID-like part
-                for part in slug_parts:
-                    # Check if this part looks like an ID:
-                    # - All digits and longer than 6 chars
-                    # - Alphanumeric mix with numbers and length >= 8
-                    # - Contains mostly numbers (like "30574a1b0")
-                    is_id = False
-                    
-                    # More aggressive ID detection
-                    if part.isdigit() and len(part) > 6:
-                        is_id = True
-                    elif len(part) >= 8:
-                        # Long alphanumeric strings are likely IDs
-                        has_digits = any(c.isdigit() for c in part)
-                        has_letters = any(c.isalpha() for c in part)
-                        
-                        if has_digits and has_letters:
-                            # Alphanumeric ID pattern (mix of letters and numbers)
-                            digit_count = sum(1 for c in part if c.isdigit())
-                            # If more than 30% digits, likely an ID
-                            if digit_count / len(part) > 0.3:
-                                is_id = True
-                            # Also check if it looks like a hash (9+ chars with digits and letters)
-                            elif len(part) >= 9 and digit_count >= 3:
-                                is_id = True
-                        elif has_digits and len(part) >= 7:
-                            # Mostly numeric
-                            is_id = True
-                    elif len(part) >= 6 and part.isalnum() and any(c.isdigit() for c in part):
-                        # Shorter alphanumeric with numbers might be ID
-                        digit_count = sum(1 for c in part if c.isdigit())
-                        if part[0].isdigit() or (digit_count / len(part) > 0.4):
-                            is_id = True
-                    
-                    # Additional check: if part is all lowercase and has numbers, likely an ID
-                    if not is_id and part.islower() and any(c.isdigit() for c in part) and len(part) >= 7:
-                        digit_count = sum(1 for c in part if c.isdigit())
-                        if digit_count >= 3:  # At least 3 digits in a lowercase+number mix is suspicious
-                            is_id = True
-                    
-                    if is_id:
-                        # Found an ID, stop collecting (everything before this is the name)
-                        break
-                    else:
-                        name_parts.append(part)
-                
-                # Filter out very short single-character parts unless it's a middle initial
-                if len(name_parts) > 1:
-                    # Remove single char parts unless they're in the middle (likely initials)
-                    filtered_parts = []
-                    for idx, part in enumerate(name_parts):
-                        if len(part) == 1 and idx > 0 and idx < len(name_parts) - 1:
-                            # Middle initial - keep it
-                            filtered_parts.append(part)
-                        elif len(part) > 1:
-                            filtered_parts.append(part)
-                        elif len(name_parts) <= 2:
-                            # Very short name, keep all parts
-                            filtered_parts.append(part)
-                    name_parts = filtered_parts if filtered_parts else name_parts
-                
-                # Need at least 2 parts for a full name, but accept single if it looks like a name
-                if len(name_parts) >= 2:
-                    name = ' '.join(part.capitalize() for part in name_parts)
-                    name = name.strip()  # Clean any extra spaces
-                elif len(name_parts) == 1 and len(name_parts[0]) >= 4:
-                    # Single word but long enough - might be a valid single name
-                    name = name_parts[0].capitalize()
-                else:
-                    name = None
-                
-                # Validate and clean the name
-                if name:
-                    original_name = name
-                    # ONLY remove trailing numbers from the LAST word (e.g., "Jha37" -> "Jha")
-                    # Don't touch multi-word names - they're likely correct
-                    words = name.split()
-                    if len(words) == 1 and any(c.isdigit() for c in words[0]):
-                        # Single word with digits - remove trailing digits
-                        name = re.sub(r'(\w+)\d{2,}$', r'\1', name)
-                    name = name.strip()
-                    
-                    if self._is_valid_name(name, founders_names):
-                        founders_names.append(name)
-                        founders_linkedin.append(linkedin_url)
-                        
-                        # Find associated Twitter link near this LinkedIn link
-                        slug_first_part = slug.split('-')[0]
-                        link_elems = response.css(f'a[href*="linkedin.com/in/"]')
-                        for elem in link_elems:
-                            href = elem.css('::attr(href)').get() or ''
-                            if slug_first_part in href or slug.split('-')[0] in href:
-                                container = elem.xpath('./ancestor::div[position()<=4][1] | ./ancestor::section[position()<=3][1]')
-                                if container:
-                                    twitter = container[0].css('a[href*="twitter.com/"], a[href*="x.com/"]::attr(href)').get()
-                                    if twitter and 'ycombinator' not in twitter.lower() and twitter not in founders_twitter:
-                                        founders_twitter.append(twitter)
-                                    break
-        
-        # FALLBACK: If we have LinkedIn links but fewer names, try HTML extraction for missing ones
-        if len(founders_linkedin) > len(founders_names):
-            # Try to find headings near LinkedIn links that we haven't extracted names for
-            for linkedin_url in unique_linkedin_urls:
-                if linkedin_url in founders_linkedin:
-                    # Already have a name for this URL
-                    continue
-                    
-                    # Find the LinkedIn link element
-                slug_match = re.search(r'linkedin\.com/in/([^/?]+)', linkedin_url, re.IGNORECASE)
-                if not slug_match:
-                    continue
-                slug_first_part = slug_match.group(1).split('-')[0]
-                
-                link_elems = response.css(f'a[href*="linkedin.com/in/"]')
-                for elem in link_elems:
-                    href = elem.css('::attr(href)').get() or ''
-                    if slug_first_part in href:
-                        # Get parent container
-                        container = elem.xpath('./ancestor::div[position()<=5][1] | ./ancestor::section[position()<=3][1] | ./ancestor::article[1]')
-                        if container:
-                            container_elem = container[0]
-                            # Look for heading in this container (skip section titles)
-                            headings = container_elem.xpath('.//h1 | .//h2 | .//h3 | .//h4 | .//h5')
-                            for heading in headings[:3]:
-                                heading_text = heading.xpath('.//text()').get()
-                                if heading_text:
-                                    heading_text = heading_text.strip()
-                                    # Skip section titles
-                                    skip_phrases = ['tl;dr', 'our ask', 'our story', 'why we', 'problem:', 'solution:', 
-                                                   'the knowledge', 'we are working', 'founders', 'active founders']
-                                    if any(skip in heading_text.lower() for skip in skip_phrases):
-                                        continue
-                                    if self._is_valid_name(heading_text, founders_names):
-                                        founders_names.append(heading_text)
-                                        founders_linkedin.append(linkedin_url)
-                                        
-                                        # Get Twitter if available
-                                        twitter = container_elem.css('a[href*="twitter.com/"], a[href*="x.com/"]::attr(href)').get()
-                                        if twitter and 'ycombinator' not in twitter.lower() and twitter not in founders_twitter:
-                                            founders_twitter.append(twitter)
-                                        break
-                        break
-        
-        # Ensure lists are aligned - pad with empty strings if needed
-        # But only align if we have at least one item in any list
-        max_len = max(len(founders_names), len(founders_linkedin), len(founders_twitter))
-        if max_len > 0:
-            while len(founders_names) < max_len:
-                founders_names.append('')
-            while len(founders_linkedin) < max_len:
-                founders_linkedin.append('')
-            while len(founders_twitter) < max_len:
-                founders_twitter.append('')
-        
-        # Final cleanup - remove @ycombinator from Twitter if somehow included
-        founders_twitter = [t for t in founders_twitter if t and 'ycombinator' not in t.lower()]
-        
-        # Final cleanup of founder names - REMOVED aggressive cleanup that was truncating valid names
-        # Only remove trailing digits from single words (e.g., "Jha37" -> "Jha")
-        cleaned_names = []
-        for name in founders_names:
-            if not name:
-                continue
-            cleaned = name.strip()
-            # Only remove trailing digits from single-word names with digits
-            words = cleaned.split()
-            if len(words) == 1 and any(c.isdigit() for c in words[0]):
-                # Single word with digits - remove trailing 2+ digits
-                cleaned = re.sub(r'(\w+)\d{2,}$', r'\1', cleaned).strip()
-            
-            if cleaned and cleaned not in cleaned_names:
-                cleaned_names.append(cleaned)
-        
-        founders_names = cleaned_names
-        
-        # Set item fields
-        item['founders_name'] = ', '.join(set(founders_names)) if founders_names else ''
-        item['founders_linkedin'] = ', '.join(set(founders_linkedin)) if founders_linkedin else ''
-        item['founders_twitter'] = ', '.join(set(founders_twitter)) if founders_twitter else ''
+        if data.get('company_name'):
+            item['company_name'] = data['company_name']
+        item['company_website'] = data.get('company_website', '')
+        item['founders'] = data.get('founders', [])
+        item['batch'] = normalize_batch(data['batch']) or data['batch']
+        item['company_slug'] = response.meta.get('frontier_key') or canonical_company_key(response.url)
         
         # Print progress every 50 companies
         if self.processed_count % 50 == 0:
@@ -644,7 +644,8 @@ class YcCompaniesSpider(scrapy.Spider):
                     self.logger.warning(f'Company name not found for {response.url}, using URL slug: {item["company_name"]}')
                     yield item
                 else:
+                    self._frontier_done(response)
                     self.logger.warning(f'No company name found for {response.url}')
             except:
+                self._frontier_done(response)
                 self.logger.warning(f'No company name found for {response.url}')
-
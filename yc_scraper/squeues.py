@@ -0,0 +1,109 @@
+"""Compact on-disk scheduler queues for full-directory crawls.
+
+With JOBDIR set (``-s JOBDIR=crawls/yc``) Scrapy keeps pending requests on disk
+instead of in memory, one queue per priority. Its pickle queues store every
+request as a full ``Request.to_dict()``: headers, cookies, flags, callback names
+and the whole meta dict. A queued company page only needs its URL, the batch
+hint and name from the listing card, its depth and the Referer header
+RefererMiddleware added - the item is built in parse_company_detail.
+CompactLifoDiskQueue / CompactFifoDiskQueue store exactly that as a small
+marshal record, and pickle any other request as before. The
+scheduler/disk_records/* stats count both kinds:
+
+    SCHEDULER_DISK_QUEUE = 'yc_scraper.squeues.CompactLifoDiskQueue'
+"""
+
+import marshal
+import pickle
+from pathlib import Path
+
+from queuelib import queue
+from scrapy import Request
+from scrapy.utils.request import request_from_dict
+
+# Everything a detail request carries while it waits in the queue
+COMPACT_META = frozenset({'batch_from_card', 'card_name', 'depth'})
+COMPACT, PICKLED = b'C', b'P'
+
+
+def _referer_only(headers):
+    """No headers, or just the one Referer the spider middlewares add to every detail request"""
+    return not headers or (list(headers) == [b'Referer'] and len(headers.getlist(b'Referer')) == 1)
+
+
+def _is_compact(request, spider):
+    """A plain detail GET whose state fits a compact record"""
+    callback = getattr(request.callback, '__name__', None)
+    return (
+        callback is not None and callback.startswith('parse_company_detail')
+        and getattr(spider, callback, None) == request.callback
+        and request.method == 'GET' and not request.body and _referer_only(request.headers) and not request.cookies
+        and request.errback is None and not request.flags and not request.cb_kwargs
+        and request.encoding == 'utf-8' and COMPACT_META.issuperset(request.meta)
+    )
+
+
+def serialize_request(request, spider):
+    if _is_compact(request, spider):
+        meta = request.meta
+        return COMPACT + marshal.dumps((
+            request.url, request.callback.__name__, meta.get('batch_from_card'), meta.get('card_name'),
+            meta.get('depth'), request.priority, request.dont_filter, request.headers.get(b'Referer'),
+        ))
+    try:
+        return PICKLED + pickle.dumps(request.to_dict(spider=spider), protocol=4)
+    # Both pickle.PicklingError and AttributeError can be raised by pickle.dumps
+    # TypeError is raised from parsel.Selector
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise ValueError(str(e)) from e  # The scheduler keeps such requests in memory
+
+
+def deserialize_request(data, spider):
+    if data[:1] == PICKLED:
+        return request_from_dict(pickle.loads(data[1:]), spider=spider)
+    record = marshal.loads(data[1:])
+    url, callback, batch_from_card, card_name, depth, priority, dont_filter = record[:7]
+    referer = record[7] if len(record) > 7 else None  # Records from before Referer was kept have 7 fields
+    meta = {'batch_from_card': batch_from_card}
+    if card_name:
+        meta['card_name'] = card_name
+    if depth is not None:
+        meta['depth'] = depth
+    headers = {b'Referer': referer} if referer else None
+    return Request(url, callback=getattr(spider, callback), meta=meta, headers=headers, priority=priority,
+                   dont_filter=dont_filter)
+
+
+def _compact_queue(queue_class):
+    class CompactRequestQueue(queue_class):
+        def __init__(self, crawler, key):
+            self.spider = crawler.spider
+            self.stats = crawler.stats
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            super().__init__(key)
+
+        @classmethod
+        def from_crawler(cls, crawler, key, *args, **kwargs):
+            return cls(crawler, key)
+
+        def push(self, request):
+            data = serialize_request(request, self.spider)
+            super().push(data)
+            if self.stats is not None:
+                self.stats.inc_value(f"scheduler/disk_records/{'compact' if data[:1] == COMPACT else 'pickled'}")
+
+        def pop(self):
+            data = super().pop()
+            if data:
+                return deserialize_request(data, self.spider)
+
+        def peek(self):
+            data = super().peek()
+            if data:
+                return deserialize_request(data, self.spider)
+
+    return CompactRequestQueue
+
+
+CompactFifoDiskQueue = _compact_queue(queue.FifoDiskQueue)
+CompactLifoDiskQueue = _compact_queue(queue.LifoDiskQueue)